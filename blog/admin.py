@@ -1,5 +1,6 @@
 from django.contrib import admin
 
+from utils.admin_autocomplete import PrefixAutocompleteMixin
 from .forms import BlogAdminForm
 from .models import Blog, Category, RootCategory
 
@@ -12,18 +13,21 @@ class CategoryInline(admin.TabularInline):
 
 
 @admin.register(RootCategory)
-class RootCategoryAdmin(admin.ModelAdmin):
+class RootCategoryAdmin(PrefixAutocompleteMixin, admin.ModelAdmin):
     list_display = ("name", "slug", "created_at")
     search_fields = ("name", "slug")
+    autocomplete_search_fields = ("^name", "^slug")
     prepopulated_fields = {"slug": ("name",)}
     inlines = (CategoryInline,)
 
 
 @admin.register(Category)
-class CategoryAdmin(admin.ModelAdmin):
+class CategoryAdmin(PrefixAutocompleteMixin, admin.ModelAdmin):
     list_display = ("name", "slug", "root_category", "created_at")
     list_filter = ("root_category",)
     search_fields = ("name", "slug", "root_category__name")
+    autocomplete_search_fields = ("^name", "^slug")
+    autocomplete_fields = ("root_category",)
     prepopulated_fields = {"slug": ("name",)}
 
 
@@ -34,5 +38,4 @@ class BlogAdmin(admin.ModelAdmin):
     list_filter = ("is_published", "categories", "categories__root_category")
     search_fields = ("title", "slug", "categories__name", "categories__root_category__name")
     prepopulated_fields = {"slug": ("title",)}
-    raw_id_fields = ("author",)
-    filter_horizontal = ("categories",)
+    autocomplete_fields = ("author", "categories")
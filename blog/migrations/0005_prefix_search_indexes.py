@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-19 18:37
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0004_blog_image'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='category',
+            index=models.Index(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('name'), name='text_pattern_ops'), name='blog_category_name_prefix'),
+        ),
+        migrations.AddIndex(
+            model_name='category',
+            index=models.Index(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('slug'), name='text_pattern_ops'), name='blog_category_slug_prefix'),
+        ),
+        migrations.AddIndex(
+            model_name='rootcategory',
+            index=models.Index(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('name'), name='text_pattern_ops'), name='blog_rootcat_name_prefix'),
+        ),
+        migrations.AddIndex(
+            model_name='rootcategory',
+            index=models.Index(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('slug'), name='text_pattern_ops'), name='blog_rootcat_slug_prefix'),
+        ),
+    ]
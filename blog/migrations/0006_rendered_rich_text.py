@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-19 18:39
+
+from django.db import migrations, models
+
+from common.richtext import backfill_rendered_rich_text
+
+
+def render_existing_rich_text(apps, schema_editor):
+    # Readers switch to the rendered columns, so fill them for existing rows.
+    backfill_rendered_rich_text(apps.get_model("blog", "Blog"), ["body"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0005_prefix_search_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blog',
+            name='body_html',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='blog',
+            name='body_text',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='blog',
+            name='body_word_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(render_existing_rich_text, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-19 18:49
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0006_rendered_rich_text'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='blog',
+            name='blog_blog_slug_d925e3_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='blog',
+            name='blog_blog_is_publ_073841_idx',
+        ),
+        migrations.AddIndex(
+            model_name='blog',
+            index=models.Index(condition=models.Q(('is_published', True)), fields=['-published_at', '-created_at'], name='blog_published_idx'),
+        ),
+    ]
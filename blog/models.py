@@ -1,7 +1,9 @@
 from django.conf import settings
+from django.contrib.postgres.indexes import OpClass
 from django.db import models
+from django.db.models.functions import Upper
 
-from common.models import AuditableModel
+from common.models import AuditableModel, RichTextModel
 
 
 class RootCategory(AuditableModel):
@@ -11,6 +13,16 @@ class RootCategory(AuditableModel):
     class Meta:
         ordering = ["name"]
         verbose_name_plural = "root categories"
+        indexes = [
+            models.Index(
+                OpClass(Upper("name"), name="text_pattern_ops"),
+                name="blog_rootcat_name_prefix",
+            ),
+            models.Index(
+                OpClass(Upper("slug"), name="text_pattern_ops"),
+                name="blog_rootcat_slug_prefix",
+            ),
+        ]
 
     def __str__(self) -> str:
         return self.name
@@ -30,12 +42,22 @@ class Category(AuditableModel):
     class Meta:
         ordering = ["name"]
         verbose_name_plural = "categories"
+        indexes = [
+            models.Index(
+                OpClass(Upper("name"), name="text_pattern_ops"),
+                name="blog_category_name_prefix",
+            ),
+            models.Index(
+                OpClass(Upper("slug"), name="text_pattern_ops"),
+                name="blog_category_slug_prefix",
+            ),
+        ]
 
     def __str__(self) -> str:
         return self.name
 
 
-class Blog(AuditableModel):
+class Blog(RichTextModel, AuditableModel):
     title = models.CharField(max_length=200)
     slug = models.SlugField(max_length=220, unique=True)
     image = models.ImageField(upload_to="blogs/images/", null=True, blank=True)
@@ -46,6 +68,9 @@ class Blog(AuditableModel):
     )
     excerpt = models.TextField(blank=True)
     body = models.TextField(blank=True, default="")
+    body_html = models.TextField(blank=True, default="", editable=False)
+    body_text = models.TextField(blank=True, default="", editable=False)
+    body_word_count = models.PositiveIntegerField(default=0, editable=False)
     author = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.SET_NULL,
@@ -56,11 +81,16 @@ class Blog(AuditableModel):
     is_published = models.BooleanField(default=False)
     published_at = models.DateTimeField(null=True, blank=True)
 
+    rich_text_fields = ("body",)
+
     class Meta:
         ordering = ["-published_at", "-created_at"]
         indexes = [
-            models.Index(fields=["slug"]),
-            models.Index(fields=["is_published", "published_at"]),
+            models.Index(
+                fields=["-published_at", "-created_at"],
+                condition=models.Q(is_published=True),
+                name="blog_published_idx",
+            ),
         ]
 
     def __str__(self) -> str:
@@ -1,3 +1,4 @@
+from django.utils.text import Truncator
 from rest_framework import serializers
 
 from .models import Blog, Category, RootCategory
@@ -17,9 +18,13 @@ class RootCategorySerializer(serializers.ModelSerializer):
         fields = ("id", "name", "slug", "categories")
 
 
+EXCERPT_WORDS = 40
+
+
 class BlogListSerializer(serializers.ModelSerializer):
     categories = CategorySerializer(many=True, read_only=True)
     image = serializers.SerializerMethodField()
+    excerpt = serializers.SerializerMethodField()
 
     class Meta:
         model = Blog
@@ -38,6 +43,9 @@ class BlogListSerializer(serializers.ModelSerializer):
             return self._build_absolute_url(obj.image.url)
         return None
 
+    def get_excerpt(self, obj):
+        return obj.excerpt or Truncator(obj.body_text).words(EXCERPT_WORDS)
+
     def _build_absolute_url(self, path):
         request = self.context.get("request")
         if request and path:
@@ -48,6 +56,8 @@ class BlogListSerializer(serializers.ModelSerializer):
 class BlogDetailSerializer(serializers.ModelSerializer):
     categories = CategorySerializer(many=True, read_only=True)
     image = serializers.SerializerMethodField()
+    excerpt = serializers.SerializerMethodField()
+    body = serializers.CharField(source="body_html", read_only=True)
 
     class Meta:
         model = Blog
@@ -67,6 +77,9 @@ class BlogDetailSerializer(serializers.ModelSerializer):
             return self._build_absolute_url(obj.image.url)
         return None
 
+    def get_excerpt(self, obj):
+        return obj.excerpt or Truncator(obj.body_text).words(EXCERPT_WORDS)
+
     def _build_absolute_url(self, path):
         request = self.context.get("request")
         if request and path:
@@ -0,0 +1,28 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from common.cache import bump_namespace_on_commit
+
+from .models import Blog, Category, RootCategory
+
+CACHE_NAMESPACE = "blog"
+BLOG_MODELS = (RootCategory, Category, Blog)
+
+
+def invalidate_blog_cache(sender, **kwargs):
+    bump_namespace_on_commit(CACHE_NAMESPACE)
+
+
+for model in BLOG_MODELS:
+    post_save.connect(
+        invalidate_blog_cache, sender=model, dispatch_uid=f"blog-save-{model.__name__}"
+    )
+    post_delete.connect(
+        invalidate_blog_cache, sender=model, dispatch_uid=f"blog-delete-{model.__name__}"
+    )
+
+
+@receiver(m2m_changed, sender=Blog.categories.through)
+def invalidate_blog_cache_on_categories_change(sender, action, **kwargs):
+    if action.startswith("post_"):
+        bump_namespace_on_commit(CACHE_NAMESPACE)
@@ -1,5 +1,7 @@
 from rest_framework import generics, permissions
 
+from common.cache import CachedAPIViewMixin
+
 from .models import Blog, RootCategory
 from .serializers import (
     BlogDetailSerializer,
@@ -8,8 +10,9 @@ from .serializers import (
 )
 
 
-class BlogListAPIView(generics.ListAPIView):
+class BlogListAPIView(CachedAPIViewMixin, generics.ListAPIView):
     permission_classes = [permissions.AllowAny]
+    cache_namespace = "blog"
     serializer_class = BlogListSerializer
 
     def get_queryset(self):
@@ -17,6 +20,7 @@ class BlogListAPIView(generics.ListAPIView):
             Blog.objects.filter(is_published=True)
             .select_related("author")
             .prefetch_related("categories")
+            .defer("body", "body_html")
             .order_by("-published_at", "-created_at")
         )
         category_slug = self.request.query_params.get("category")
@@ -25,8 +29,9 @@ class BlogListAPIView(generics.ListAPIView):
         return queryset
 
 
-class BlogDetailAPIView(generics.RetrieveAPIView):
+class BlogDetailAPIView(CachedAPIViewMixin, generics.RetrieveAPIView):
     permission_classes = [permissions.AllowAny]
+    cache_namespace = "blog"
     serializer_class = BlogDetailSerializer
     lookup_field = "slug"
 
@@ -38,8 +43,9 @@ class BlogDetailAPIView(generics.RetrieveAPIView):
         )
 
 
-class RootCategoryListAPIView(generics.ListAPIView):
+class RootCategoryListAPIView(CachedAPIViewMixin, generics.ListAPIView):
     permission_classes = [permissions.AllowAny]
+    cache_namespace = "blog"
     serializer_class = RootCategorySerializer
 
     def get_queryset(self):
@@ -0,0 +1,16 @@
+from django.contrib import admin
+
+from .models import ChangeLogEntry
+
+
+@admin.register(ChangeLogEntry)
+class ChangeLogEntryAdmin(admin.ModelAdmin):
+    list_display = ("seq", "kind", "object_id", "deleted", "created_at")
+    list_filter = ("kind", "deleted")
+    search_fields = ("object_id",)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,33 @@
+from django.db import connection
+
+from .models import ChangeLogEntry
+
+BATCH_SIZE = 1000
+TABLE = ChangeLogEntry._meta.db_table
+
+# Concurrent writers of one object queue on its row instead of each
+# inserting their own entry.
+UPSERT_SQL = f"""
+    INSERT INTO {TABLE} (kind, object_id, deleted, txid, created_at)
+    SELECT %s, object_id, %s, pg_current_xact_id()::text::bigint, now()
+    FROM unnest(%s::bigint[]) AS object_id
+    ON CONFLICT (kind, object_id) DO UPDATE SET
+        seq = nextval(pg_get_serial_sequence('{TABLE}', 'seq')),
+        deleted = EXCLUDED.deleted,
+        txid = EXCLUDED.txid,
+        created_at = EXCLUDED.created_at
+"""
+
+
+def record_changes(kind, object_ids, deleted=False):
+    """
+    Move each object's entry to the end of the feed, creating it if needed.
+    Runs inside the caller's transaction, so a rolled back write leaves the
+    entry as it was.
+    """
+    # Sorted, so writers touching overlapping objects lock rows in one order.
+    object_ids = sorted(set(object_ids))
+    with connection.cursor() as cursor:
+        for start in range(0, len(object_ids), BATCH_SIZE):
+            batch = object_ids[start : start + BATCH_SIZE]
+            cursor.execute(UPSERT_SQL, [str(kind), deleted, batch])
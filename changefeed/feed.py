@@ -0,0 +1,98 @@
+from dataclasses import dataclass
+
+from django.db.models import BooleanField, Prefetch
+from django.db.models.expressions import RawSQL
+
+from blog.models import Blog
+from blog.serializers import BlogDetailSerializer
+from product.models import Category, Product, RootCategory
+from product.serializers import (
+    CategoryDetailSerializer,
+    ProductDetailSerializer,
+    RootCategorySerializer,
+)
+
+from .models import ChangeLogEntry
+
+START = (0, 0)
+# Every transaction below the snapshot's xmin has committed or rolled back.
+COMMITTED = RawSQL(
+    "txid < pg_snapshot_xmin(pg_current_snapshot())::text::bigint",
+    (),
+    output_field=BooleanField(),
+)
+
+
+@dataclass
+class FeedKind:
+    queryset: object
+    serializer_class: object
+
+
+def feed_kinds():
+    # Objects missing from these querysets (deleted, unpublished) are sent as deletions.
+    return {
+        ChangeLogEntry.Kind.PRODUCT: FeedKind(
+            Product.objects.prefetch_related(
+                Prefetch("categories", queryset=Category.objects.select_related("root_category")),
+                "gallery_images",
+                "faq_items",
+                "spec_items",
+            ),
+            ProductDetailSerializer,
+        ),
+        ChangeLogEntry.Kind.CATEGORY: FeedKind(Category.objects.all(), CategoryDetailSerializer),
+        ChangeLogEntry.Kind.ROOT_CATEGORY: FeedKind(
+            RootCategory.objects.all(), RootCategorySerializer
+        ),
+        ChangeLogEntry.Kind.BLOG: FeedKind(
+            Blog.objects.filter(is_published=True).prefetch_related("categories"),
+            BlogDetailSerializer,
+        ),
+    }
+
+
+def parse_cursor(raw):
+    """``(txid, seq)`` from a ``next_since`` value; ``0`` is the start of the feed."""
+    if raw in (None, "", "0"):
+        return START
+    txid, separator, seq = raw.partition(".")
+    if not (separator and txid.isdigit() and seq.isdigit()):
+        raise ValueError(f"Invalid cursor: {raw!r}")
+    return int(txid), int(seq)
+
+
+def format_cursor(position):
+    return "{}.{}".format(*position)
+
+
+def read_changes(position, limit, kinds=None):
+    """
+    Up to ``limit`` entries after ``position`` in ``(txid, seq)`` order and
+    whether more follow. Entries of transactions at or after the oldest one
+    still running are held back: that transaction may yet commit entries
+    that sort before them.
+    """
+    entries = ChangeLogEntry.objects.filter(
+        COMMITTED, RawSQL("(txid, seq) > (%s, %s)", position, output_field=BooleanField())
+    )
+    if kinds:
+        entries = entries.filter(kind__in=kinds)
+    entries = list(entries.order_by("txid", "seq")[: limit + 1])
+    return entries[:limit], len(entries) > limit
+
+
+def load_payloads(entries, context):
+    """``{(kind, object id): serialized object}`` for entries whose object still exists."""
+    wanted = {}
+    for entry in entries:
+        if not entry.deleted:
+            wanted.setdefault(entry.kind, set()).add(entry.object_id)
+    payloads = {}
+    kinds = feed_kinds()
+    for kind, object_ids in wanted.items():
+        feed_kind = kinds[kind]
+        objects = feed_kind.queryset.filter(pk__in=object_ids)
+        data = feed_kind.serializer_class(objects, many=True, context=context).data
+        payloads.update(((kind, item["id"]), item) for item in data)
+    return payloads
@@ -0,0 +1,59 @@
+# Generated by Django 5.2.18 on 2026-10-19 19:09
+
+import django.utils.timezone
+from django.db import migrations, models
+
+BACKFILL = (
+    ("product", "product", "Product", {}),
+    ("category", "product", "Category", {}),
+    ("root_category", "product", "RootCategory", {}),
+    ("blog", "blog", "Blog", {"is_published": True}),
+)
+
+
+def backfill_entries(apps, schema_editor):
+    # Every existing object gets an entry, so since=0 is a full sync.
+    ChangeLogEntry = apps.get_model("changefeed", "ChangeLogEntry")
+    for kind, app_label, model_name, filters in BACKFILL:
+        object_ids = (
+            apps.get_model(app_label, model_name)
+            .objects.filter(**filters)
+            .order_by("pk")
+            .values_list("pk", flat=True)
+            .iterator(chunk_size=5000)
+        )
+        ChangeLogEntry.objects.bulk_create(
+            (ChangeLogEntry(kind=kind, object_id=object_id) for object_id in object_ids),
+            batch_size=5000,
+        )
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('blog', '0007_drop_redundant_indexes'),
+        ('product', '0018_product_uploads'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChangeLogEntry',
+            fields=[
+                ('seq', models.BigAutoField(primary_key=True, serialize=False)),
+                ('kind', models.CharField(choices=[('product', 'Product'), ('category', 'Category'), ('root_category', 'Root category'), ('blog', 'Blog')], max_length=20)),
+                ('object_id', models.BigIntegerField()),
+                ('deleted', models.BooleanField(default=False)),
+                ('txid', models.BigIntegerField(default=0, editable=False, help_text='pg_current_xact_id() of the writing transaction.')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'verbose_name_plural': 'change log entries',
+                'ordering': ['txid', 'seq'],
+                'indexes': [models.Index(fields=['txid', 'seq'], name='changelog_position_idx'), models.Index(fields=['kind', 'txid', 'seq'], name='changelog_kind_position_idx')],
+                'constraints': [models.UniqueConstraint(fields=('kind', 'object_id'), name='changelog_object_uniq')],
+            },
+        ),
+        migrations.RunPython(backfill_entries, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,45 @@
+from django.db import models
+from django.utils import timezone
+
+
+class ChangeLogEntry(models.Model):
+    """
+    The latest change of one catalog object; entries of deleted objects stay
+    as tombstones. Each object keeps a single entry: recording a change moves
+    it to a new ``seq`` under the writing transaction's ``txid``.
+
+    The feed reads entries in ``(txid, seq)`` order and only up to the oldest
+    transaction still running, so an entry never appears behind a position
+    a client has already read past.
+    """
+
+    class Kind(models.TextChoices):
+        PRODUCT = "product", "Product"
+        CATEGORY = "category", "Category"
+        ROOT_CATEGORY = "root_category", "Root category"
+        BLOG = "blog", "Blog"
+
+    seq = models.BigAutoField(primary_key=True)
+    kind = models.CharField(max_length=20, choices=Kind.choices)
+    object_id = models.BigIntegerField()
+    deleted = models.BooleanField(default=False)
+    txid = models.BigIntegerField(
+        default=0, editable=False, help_text="pg_current_xact_id() of the writing transaction."
+    )
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ["txid", "seq"]
+        indexes = [
+            models.Index(fields=["txid", "seq"], name="changelog_position_idx"),
+            # ?kinds= reads some kinds in feed order.
+            models.Index(fields=["kind", "txid", "seq"], name="changelog_kind_position_idx"),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=["kind", "object_id"], name="changelog_object_uniq"),
+        ]
+        verbose_name_plural = "change log entries"
+
+    def __str__(self) -> str:
+        action = "deleted" if self.deleted else "changed"
+        return f"#{self.seq} {self.kind} {self.object_id} {action}"
@@ -0,0 +1,19 @@
+from rest_framework import serializers
+
+from .models import ChangeLogEntry
+
+
+class ChangeSerializer(serializers.ModelSerializer):
+    id = serializers.IntegerField(source="object_id")
+    action = serializers.SerializerMethodField()
+    data = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ChangeLogEntry
+        fields = ("seq", "kind", "id", "action", "data")
+
+    def get_action(self, obj):
+        return "upsert" if (obj.kind, obj.object_id) in self.context["payloads"] else "delete"
+
+    def get_data(self, obj):
+        return self.context["payloads"].get((obj.kind, obj.object_id))
@@ -0,0 +1,132 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from blog.models import Blog
+from blog.models import Category as BlogCategory
+from jobs.queue import enqueue_on_commit
+from product.counts import ProductCategory
+from product.denormalize import linked_product_ids
+from product.models import (
+    Category,
+    Product,
+    ProductFaqItem,
+    ProductGalleryImage,
+    ProductSpecItem,
+    RootCategory,
+)
+
+from .changes import record_changes
+from .models import ChangeLogEntry
+from .tasks import record_product_changes
+
+Kind = ChangeLogEntry.Kind
+FEED_MODELS = {
+    Product: Kind.PRODUCT,
+    Category: Kind.CATEGORY,
+    RootCategory: Kind.ROOT_CATEGORY,
+    Blog: Kind.BLOG,
+}
+PRODUCT_PART_MODELS = (ProductGalleryImage, ProductFaqItem, ProductSpecItem)
+
+
+def record_saved(sender, instance, raw, **kwargs):
+    if not raw:
+        record_changes(FEED_MODELS[sender], [instance.pk])
+
+
+def record_deleted(sender, instance, **kwargs):
+    record_changes(FEED_MODELS[sender], [instance.pk], deleted=True)
+
+
+def record_product_part(sender, instance, raw=False, **kwargs):
+    if not raw:
+        record_changes(Kind.PRODUCT, [instance.product_id])
+
+
+for model in FEED_MODELS:
+    uid = f"changefeed-{model._meta.label_lower}"
+    post_save.connect(record_saved, sender=model, dispatch_uid=f"{uid}-save")
+    post_delete.connect(record_deleted, sender=model, dispatch_uid=f"{uid}-delete")
+
+for model in PRODUCT_PART_MODELS:
+    uid = f"changefeed-{model._meta.label_lower}"
+    post_save.connect(record_product_part, sender=model, dispatch_uid=f"{uid}-save")
+    post_delete.connect(record_product_part, sender=model, dispatch_uid=f"{uid}-delete")
+
+
+@receiver(m2m_changed, sender=ProductCategory)
+def record_linked_products(sender, instance, action, reverse, pk_set, **kwargs):
+    # Both sides change: the product lists its categories and the category
+    # its product_count. Cleared links are read before they go.
+    if action == "pre_clear":
+        lookup = {"category_id": instance.pk} if reverse else {"product_id": instance.pk}
+        column = "product_id" if reverse else "category_id"
+        pk_set = set(ProductCategory.objects.filter(**lookup).values_list(column, flat=True))
+    elif action not in ("post_add", "post_remove"):
+        return
+    products, categories = ({instance.pk}, pk_set) if not reverse else (pk_set, {instance.pk})
+    record_changes(Kind.PRODUCT, products)
+    record_changes(Kind.CATEGORY, categories)
+
+
+@receiver(pre_delete, sender=Product)
+def record_deleted_product_categories(sender, instance, **kwargs):
+    # Their product_count drops.
+    record_changes(Kind.CATEGORY, instance.categories.values_list("pk", flat=True))
+
+
+@receiver(post_save, sender=Category)
+def record_category_products(sender, instance, raw, created, **kwargs):
+    if not raw and not created:
+        enqueue_on_commit(
+            record_product_changes,
+            {"category_id": instance.pk},
+            dedupe_key=f"changefeed-category-products:{instance.pk}",
+        )
+
+
+@receiver(post_save, sender=RootCategory)
+def record_root_category_products(sender, instance, raw, created, **kwargs):
+    if not raw and not created:
+        enqueue_on_commit(
+            record_product_changes,
+            {"root_category_id": instance.pk},
+            dedupe_key=f"changefeed-root-category-products:{instance.pk}",
+        )
+
+
+@receiver(pre_delete, sender=Category)
+def record_deleted_category_products(sender, instance, **kwargs):
+    product_ids = linked_product_ids(category_id=instance.pk)
+    if product_ids:
+        enqueue_on_commit(record_product_changes, {"product_ids": sorted(product_ids)})
+
+
+@receiver(pre_delete, sender=RootCategory)
+def record_deleted_root_category_products(sender, instance, **kwargs):
+    product_ids = linked_product_ids(category__root_category_id=instance.pk)
+    if product_ids:
+        enqueue_on_commit(record_product_changes, {"product_ids": sorted(product_ids)})
+
+
+@receiver(m2m_changed, sender=Blog.categories.through)
+def record_blog_categories_change(sender, instance, action, reverse, pk_set, **kwargs):
+    if not reverse:
+        if action.startswith("post_"):
+            record_changes(Kind.BLOG, [instance.pk])
+    elif action == "pre_clear":
+        record_changes(Kind.BLOG, instance.blogs.values_list("pk", flat=True))
+    elif action in ("post_add", "post_remove"):
+        record_changes(Kind.BLOG, pk_set)
+
+
+@receiver(post_save, sender=BlogCategory)
+def record_blog_category_blogs(sender, instance, raw, created, **kwargs):
+    # Blog payloads embed their categories' names and slugs.
+    if not raw and not created:
+        record_changes(Kind.BLOG, instance.blogs.values_list("pk", flat=True))
+
+
+@receiver(pre_delete, sender=BlogCategory)
+def record_deleted_blog_category_blogs(sender, instance, **kwargs):
+    record_changes(Kind.BLOG, instance.blogs.values_list("pk", flat=True))
@@ -0,0 +1,19 @@
+from jobs.registry import task
+from product.denormalize import linked_product_ids
+
+from .changes import record_changes
+from .models import ChangeLogEntry
+
+
+@task(priority=5)
+def record_product_changes(product_ids=(), category_id=None, root_category_id=None):
+    """
+    Move the products that embed a changed or deleted category to the end of
+    the feed: product payloads include their categories and root categories.
+    """
+    product_ids = set(product_ids)
+    if category_id is not None:
+        product_ids |= linked_product_ids(category_id=category_id)
+    if root_category_id is not None:
+        product_ids |= linked_product_ids(category__root_category_id=root_category_id)
+    record_changes(ChangeLogEntry.Kind.PRODUCT, product_ids)
@@ -0,0 +1,123 @@
+import threading
+
+from django.db import connection, transaction
+from django.test import TransactionTestCase
+from django.urls import reverse
+
+from .changes import record_changes
+from .feed import START, format_cursor, parse_cursor, read_changes
+from .models import ChangeLogEntry
+
+Kind = ChangeLogEntry.Kind
+
+
+class Writer(threading.Thread):
+    """Runs ``target`` on its own database connection; ``join()`` re-raises its error."""
+
+    def __init__(self, target):
+        super().__init__()
+        self.work = target
+        self.error = None
+
+    def run(self):
+        try:
+            self.work()
+        except Exception as exc:
+            self.error = exc
+        finally:
+            connection.close()
+
+    def join(self, timeout=None):
+        super().join(timeout)
+        if self.error is not None:
+            raise self.error
+
+
+def in_thread(target):
+    thread = Writer(target)
+    thread.start()
+    return thread
+
+
+def feed_ids(limit=10):
+    entries, _ = read_changes(START, limit)
+    return [entry.object_id for entry in entries]
+
+
+# Transactions must really commit: the feed only shows entries of committed ones.
+class ChangeFeedTests(TransactionTestCase):
+    def test_recording_moves_the_single_entry_of_an_object(self):
+        record_changes(Kind.PRODUCT, [3, 1, 2])
+        first = ChangeLogEntry.objects.get(kind=Kind.PRODUCT, object_id=1)
+        record_changes(Kind.PRODUCT, [1], deleted=True)
+        record_changes(Kind.CATEGORY, [1])
+
+        entry = ChangeLogEntry.objects.get(kind=Kind.PRODUCT, object_id=1)
+        self.assertEqual(ChangeLogEntry.objects.count(), 4)
+        self.assertTrue(entry.deleted)
+        self.assertGreater(entry.seq, first.seq)
+        self.assertGreater(entry.txid, first.txid)
+        # Product 1 moved behind 2 and 3; category 1 is a separate object.
+        self.assertEqual(feed_ids(), [2, 3, 1, 1])
+
+    def test_concurrent_writers_keep_one_entry_per_object(self):
+        barrier = threading.Barrier(4)
+
+        def write():
+            barrier.wait()
+            with transaction.atomic():
+                record_changes(Kind.PRODUCT, [1, 2, 3])
+
+        for thread in [in_thread(write) for _ in range(4)]:
+            thread.join()
+
+        self.assertEqual(ChangeLogEntry.objects.count(), 3)
+
+    def test_entries_behind_a_running_transaction_are_held_back(self):
+        written = threading.Event()
+        release = threading.Event()
+
+        def slow_writer():
+            with transaction.atomic():
+                record_changes(Kind.PRODUCT, [1])
+                written.set()
+                release.wait(10)
+
+        thread = in_thread(slow_writer)
+        self.assertTrue(written.wait(10))
+        try:
+            # Committed, but after a transaction that may still add entries before it.
+            record_changes(Kind.PRODUCT, [2])
+            self.assertEqual(feed_ids(), [])
+        finally:
+            release.set()
+            thread.join()
+
+        self.assertEqual(feed_ids(), [1, 2])
+
+    def test_pages_follow_the_cursor(self):
+        record_changes(Kind.PRODUCT, [1, 2])
+        record_changes(Kind.BLOG, [7], deleted=True)
+        url = reverse("changefeed:change-feed")
+
+        first = self.client.get(url, {"since": "0", "limit": 2}).json()
+        second = self.client.get(url, {"since": first["next_since"], "limit": 2}).json()
+        last = self.client.get(url, {"since": second["next_since"]}).json()
+
+        self.assertEqual([change["id"] for change in first["results"]], [1, 2])
+        self.assertTrue(first["has_more"])
+        [change] = second["results"]
+        self.assertEqual(
+            (change["kind"], change["id"], change["action"], change["data"]),
+            ("blog", 7, "delete", None),
+        )
+        self.assertFalse(second["has_more"])
+        self.assertEqual(
+            last, {"results": [], "next_since": second["next_since"], "has_more": False}
+        )
+
+    def test_cursor_round_trip(self):
+        self.assertEqual(parse_cursor("0"), START)
+        self.assertEqual(parse_cursor(format_cursor((12, 34))), (12, 34))
+        with self.assertRaises(ValueError):
+            parse_cursor("12")
@@ -0,0 +1,9 @@
+from django.urls import path
+
+from .views import ChangeFeedAPIView
+
+app_name = "changefeed"
+
+urlpatterns = [
+    path("", ChangeFeedAPIView.as_view(), name="change-feed"),
+]
@@ -0,0 +1,64 @@
+from django.conf import settings
+from rest_framework import generics, permissions
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from .feed import format_cursor, load_payloads, parse_cursor, read_changes
+from .models import ChangeLogEntry
+from .serializers import ChangeSerializer
+
+
+class ChangeFeedAPIView(generics.GenericAPIView):
+    """
+    Catalog changes after the ``?since=`` cursor (0 for a full sync), oldest first.
+    Each object appears once, with its current data or as a deletion. Pass
+    ``next_since`` back as ``since``; while ``has_more`` is true the next
+    page is ready.
+    """
+
+    permission_classes = [permissions.AllowAny]
+    serializer_class = ChangeSerializer
+
+    def get(self, request, *args, **kwargs):
+        try:
+            position = parse_cursor(request.query_params.get("since"))
+        except ValueError:
+            raise ValidationError({"since": ["Pass 0 or a next_since value."]})
+        limit = min(
+            self.get_int_param("limit", settings.CHANGEFEED_PAGE_SIZE),
+            settings.CHANGEFEED_MAX_PAGE_SIZE,
+        )
+        entries, has_more = read_changes(position, max(limit, 1), self.get_kinds())
+        context = self.get_serializer_context()
+        context["payloads"] = load_payloads(entries, context)
+        return Response(
+            {
+                "results": ChangeSerializer(entries, many=True, context=context).data,
+                "next_since": format_cursor(
+                    (entries[-1].txid, entries[-1].seq) if entries else position
+                ),
+                "has_more": has_more,
+            }
+        )
+
+    def get_int_param(self, name, default):
+        raw = self.request.query_params.get(name)
+        if raw in (None, ""):
+            return default
+        try:
+            value = int(raw)
+        except ValueError:
+            value = -1
+        if value < 0:
+            raise ValidationError({name: ["Must be a non-negative integer."]})
+        return value
+
+    def get_kinds(self):
+        raw = self.request.query_params.get("kinds")
+        if not raw:
+            return None
+        kinds = {kind.strip() for kind in raw.split(",") if kind.strip()}
+        unknown = kinds - set(ChangeLogEntry.Kind.values)
+        if unknown:
+            raise ValidationError({"kinds": [f"Unknown kinds: {', '.join(sorted(unknown))}."]})
+        return kinds
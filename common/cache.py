@@ -0,0 +1,204 @@
+import logging
+import math
+import random
+import time
+from dataclasses import dataclass, replace
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError, transaction
+from rest_framework import status
+from rest_framework.response import Response
+
+logger = logging.getLogger(__name__)
+
+NAMESPACE_KEY = "ns:{}"
+# How long a stale value served after a database error is trusted before the
+# next recompute attempt.
+ERROR_RETRY_SECONDS = 5
+LOCK_POLL_SECONDS = 0.05
+
+
+def namespace_version(namespace):
+    key = NAMESPACE_KEY.format(namespace)
+    version = cache.get(key)
+    if version is None:
+        # Seed from the clock so an evicted counter never reuses an old version.
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def bump_namespace(*namespaces):
+    for namespace in namespaces:
+        key = NAMESPACE_KEY.format(namespace)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, time.time_ns(), timeout=None)
+
+
+def bump_namespace_on_commit(*namespaces):
+    transaction.on_commit(lambda: bump_namespace(*namespaces))
+
+
+@dataclass(frozen=True)
+class CacheEntry:
+    value: object
+    version: object
+    expires_at: float
+    compute_seconds: float
+
+    def is_fresh(self, version, beta):
+        if self.version != version:
+            return False
+        # XFetch: refresh early with a probability that grows towards expiry
+        # and with the cost of recomputing, so one caller usually refreshes
+        # before the entry actually expires.
+        jitter = -self.compute_seconds * beta * math.log(1 - random.random())
+        return time.time() + jitter < self.expires_at
+
+
+def get_or_compute(
+    key,
+    compute,
+    timeout,
+    version=None,
+    stale_timeout=None,
+    lock_timeout=None,
+    beta=1.0,
+):
+    """
+    Return the cached value for ``key``, calling ``compute()`` when it is
+    missing, expired or from another ``version``.
+
+    Only the caller holding the per-key lock recomputes; the others get the
+    stale value when there is one, or wait for the lock holder otherwise.
+    Stale values are kept ``stale_timeout`` seconds past expiry and are also
+    served when ``compute()`` raises a ``DatabaseError``.
+    """
+    if stale_timeout is None:
+        stale_timeout = settings.API_CACHE_STALE_TIMEOUT
+    if lock_timeout is None:
+        lock_timeout = settings.API_CACHE_LOCK_TIMEOUT
+
+    entry = cache.get(key)
+    if entry is not None and entry.is_fresh(version, beta):
+        return entry.value
+
+    lock_key = f"{key}:lock"
+    deadline = time.monotonic() + lock_timeout
+    while True:
+        if cache.add(lock_key, 1, lock_timeout):
+            try:
+                return _recompute(key, compute, timeout, version, stale_timeout, entry)
+            finally:
+                cache.delete(lock_key)
+        if entry is not None:
+            return entry.value
+        # Wait for the lock holder's value. When the lock goes away without
+        # one (its compute raised), go back to taking the lock ourselves.
+        while time.monotonic() < deadline:
+            time.sleep(LOCK_POLL_SECONDS)
+            # Lock first: the holder stores its value before releasing it.
+            locked = cache.get(lock_key) is not None
+            fresh = cache.get(key)
+            if fresh is not None and fresh.version == version:
+                return fresh.value
+            if not locked:
+                break
+        else:
+            # The lock holder died or is too slow; compute without the lock.
+            return _recompute(key, compute, timeout, version, stale_timeout, None)
+
+
+def _recompute(key, compute, timeout, version, stale_timeout, stale_entry):
+    started = time.monotonic()
+    try:
+        value = compute()
+    except DatabaseError:
+        if stale_entry is None:
+            raise
+        logger.warning("Serving stale cache entry %s after a database error.", key, exc_info=True)
+        retry_entry = replace(stale_entry, expires_at=time.time() + ERROR_RETRY_SECONDS)
+        cache.set(key, retry_entry, stale_timeout)
+        return stale_entry.value
+
+    entry = CacheEntry(
+        value=value,
+        version=version,
+        expires_at=time.time() + timeout,
+        compute_seconds=time.monotonic() - started,
+    )
+    cache.set(key, entry, timeout + stale_timeout)
+    return value
+
+
+def build_cache_key(request, view_name, namespace, kwargs):
+    query = urlencode(sorted(request.GET.lists()), doseq=True)
+    path_kwargs = ",".join(f"{name}={value}" for name, value in sorted(kwargs.items()))
+    return ":".join(
+        (
+            "api",
+            namespace,
+            view_name,
+            request.scheme,
+            request.get_host(),
+            path_kwargs,
+            query,
+        )
+    )
+
+
+class UncacheableResponse(Exception):
+    def __init__(self, response):
+        self.response = response
+
+
+class CachedAPIViewMixin:
+    """
+    Cache successful GET responses of public read views through
+    ``get_or_compute``. Entries are keyed on the view, host (payloads hold
+    absolute URLs), query string and URL kwargs, and go stale together when
+    ``cache_namespace`` is bumped.
+    """
+
+    cache_namespace = None
+    cache_timeout = None
+
+    def get_cache_key(self, request):
+        view_name = f"{type(self).__module__}.{type(self).__qualname__}"
+        return build_cache_key(request, view_name, self.cache_namespace, self.kwargs)
+
+    def get_cache_timeout(self):
+        if self.cache_timeout is not None:
+            return self.cache_timeout
+        return settings.API_CACHE_TIMEOUT
+
+    def get(self, request, *args, **kwargs):
+        computed = None
+
+        def compute():
+            nonlocal computed
+            computed = super(CachedAPIViewMixin, self).get(request, *args, **kwargs)
+            if computed.status_code != status.HTTP_200_OK:
+                raise UncacheableResponse(computed)
+            return computed.data
+
+        try:
+            data = get_or_compute(
+                self.get_cache_key(request),
+                compute,
+                self.get_cache_timeout(),
+                version=namespace_version(self.cache_namespace),
+            )
+        except UncacheableResponse as exc:
+            return exc.response
+
+        if computed is not None:
+            computed["X-Cache"] = "MISS"
+            return computed
+        response = Response(data)
+        response["X-Cache"] = "HIT"
+        return response
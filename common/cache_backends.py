@@ -0,0 +1,282 @@
+import pickle
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from threading import Lock
+
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+SEQ_KEY = "tiered:seq"
+BUS_KEY = "tiered:inv:{}"
+CLEAR_ALL = "*"
+
+# Cache instances are per thread; the local tier is shared by every thread of
+# the process, keyed by LOCATION like LocMemCache.
+_local_tiers = {}
+_local_tiers_lock = Lock()
+
+
+@dataclass(frozen=True)
+class _ShortLived:
+    """A shared-tier value written with a timeout below LOCAL_TIMEOUT."""
+
+    value: object
+    expires_at: float
+
+
+class _LocalTier:
+    def __init__(self):
+        self.entries = OrderedDict()
+        self.lock = Lock()
+        self.sync_lock = Lock()
+        self.last_seq = None
+        self.last_sync = 0.0
+
+
+class TieredCache(BaseCache):
+    """
+    A bounded in-process LRU in front of the cache alias ``SHARED_ALIAS``.
+
+    Reads are served locally for at most ``LOCAL_TIMEOUT`` seconds. Writes go
+    to the shared cache and publish the key on an invalidation bus there: a
+    sequence counter plus one short-lived key per sequence number. Every
+    process replays the bus at most every ``SYNC_INTERVAL`` seconds and evicts
+    the keys written elsewhere, or drops its whole local tier when it has
+    fallen too far behind. ``add`` and ``incr`` always go to the shared cache,
+    so locks and counters stay cross-process.
+
+    Values written with a timeout below ``LOCAL_TIMEOUT`` carry their expiry
+    so no process keeps them longer than the shared cache does (``incr`` does
+    not work on them). Keys ending in one of ``SHARED_ONLY_SUFFIXES`` (the
+    ``get_or_compute`` locks) skip the local tier and the bus altogether.
+
+        CACHES = {
+            "shared": env.cache("CACHE_URL"),
+            "default": {
+                "BACKEND": "common.cache_backends.TieredCache",
+                "LOCATION": "tiered",
+                "OPTIONS": {"SHARED_ALIAS": "shared", "MAX_ENTRIES": 2000},
+            },
+        }
+    """
+
+    pickle_protocol = pickle.HIGHEST_PROTOCOL
+
+    def __init__(self, name, params):
+        super().__init__(params)
+        options = params.get("OPTIONS", {})
+        self._shared_alias = options.get("SHARED_ALIAS", "shared")
+        self._local_timeout = options.get("LOCAL_TIMEOUT", 30)
+        self._sync_interval = options.get("SYNC_INTERVAL", 1.0)
+        self._bus_timeout = options.get("BUS_TIMEOUT", 300)
+        self._max_backlog = options.get("MAX_BACKLOG", 1000)
+        self._shared_only_suffixes = tuple(options.get("SHARED_ONLY_SUFFIXES", (":lock",)))
+        with _local_tiers_lock:
+            self._local = _local_tiers.setdefault(name or "", _LocalTier())
+
+    @property
+    def shared(self):
+        return caches[self._shared_alias]
+
+    def get(self, key, default=None, version=None):
+        local_key = self.make_and_validate_key(key, version=version)
+        if self._is_shared_only(key):
+            return self.shared.get(key, default, version=version)
+        self._sync()
+        hit = self._get_local(local_key)
+        if hit is not None:
+            return pickle.loads(hit)
+        sentinel = object()
+        value = self.shared.get(key, sentinel, version=version)
+        if value is sentinel:
+            return default
+        return self._read_through(local_key, value)
+
+    def get_many(self, keys, version=None):
+        self._sync()
+        found = {}
+        missing = {}
+        for key in keys:
+            local_key = self.make_and_validate_key(key, version=version)
+            if self._is_shared_only(key):
+                missing[key] = None
+                continue
+            hit = self._get_local(local_key)
+            if hit is None:
+                missing[key] = local_key
+            else:
+                found[key] = pickle.loads(hit)
+        if missing:
+            values = self.shared.get_many(list(missing), version=version)
+            for key, value in values.items():
+                if missing[key] is None:
+                    found[key] = value
+                else:
+                    found[key] = self._read_through(missing[key], value)
+        return found
+
+    def has_key(self, key, version=None):
+        local_key = self.make_and_validate_key(key, version=version)
+        if not self._is_shared_only(key):
+            self._sync()
+            if self._get_local(local_key) is not None:
+                return True
+        return self.shared.has_key(key, version=version)
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        local_key = self.make_and_validate_key(key, version=version)
+        value = self._stamp(key, value, timeout)
+        self.shared.set(key, value, timeout, version=version)
+        self._publish([local_key], [key])
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        local_keys = [self.make_and_validate_key(key, version=version) for key in data]
+        data = {key: self._stamp(key, value, timeout) for key, value in data.items()}
+        failed = self.shared.set_many(data, timeout, version=version)
+        self._publish(local_keys, list(data))
+        return failed
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        local_key = self.make_and_validate_key(key, version=version)
+        value = self._stamp(key, value, timeout)
+        added = self.shared.add(key, value, timeout, version=version)
+        if added:
+            self._publish([local_key], [key])
+        return added
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        self.make_and_validate_key(key, version=version)
+        return self.shared.touch(key, timeout, version=version)
+
+    def incr(self, key, delta=1, version=None):
+        local_key = self.make_and_validate_key(key, version=version)
+        value = self.shared.incr(key, delta, version=version)
+        self._publish([local_key], [key])
+        return value
+
+    def decr(self, key, delta=1, version=None):
+        return self.incr(key, -delta, version=version)
+
+    def delete(self, key, version=None):
+        local_key = self.make_and_validate_key(key, version=version)
+        deleted = self.shared.delete(key, version=version)
+        self._publish([local_key], [key])
+        return deleted
+
+    def delete_many(self, keys, version=None):
+        local_keys = [self.make_and_validate_key(key, version=version) for key in keys]
+        self.shared.delete_many(keys, version=version)
+        self._publish(local_keys, keys)
+
+    def clear(self):
+        # Clearing the shared cache drops the bus counter too, which makes
+        # every other process drop its local tier on its next sync.
+        self.shared.clear()
+        with self._local.lock:
+            self._local.entries.clear()
+            self._local.last_seq = None
+
+    def _is_shared_only(self, key):
+        return key.endswith(self._shared_only_suffixes)
+
+    def _stamp(self, key, value, timeout):
+        if timeout is DEFAULT_TIMEOUT:
+            timeout = self.default_timeout
+        if timeout is None or timeout >= self._local_timeout or self._is_shared_only(key):
+            return value
+        return _ShortLived(value, time.time() + timeout)
+
+    def _read_through(self, local_key, value):
+        """Keep ``value`` read from the shared tier locally; returns it unwrapped."""
+        timeout = self._local_timeout
+        if isinstance(value, _ShortLived):
+            timeout = min(timeout, value.expires_at - time.time())
+            value = value.value
+        if timeout > 0:
+            self._set_local(local_key, value, timeout)
+        return value
+
+    def _get_local(self, local_key):
+        with self._local.lock:
+            entry = self._local.entries.get(local_key)
+            if entry is None:
+                return None
+            pickled, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._local.entries[local_key]
+                return None
+            self._local.entries.move_to_end(local_key)
+            return pickled
+
+    def _set_local(self, local_key, value, timeout):
+        pickled = pickle.dumps(value, self.pickle_protocol)
+        expires_at = time.monotonic() + timeout
+        with self._local.lock:
+            self._local.entries[local_key] = (pickled, expires_at)
+            self._local.entries.move_to_end(local_key)
+            while len(self._local.entries) > self._max_entries:
+                self._local.entries.popitem(last=False)
+
+    def _evict_local(self, local_keys):
+        with self._local.lock:
+            if CLEAR_ALL in local_keys:
+                self._local.entries.clear()
+                return
+            for local_key in local_keys:
+                self._local.entries.pop(local_key, None)
+
+    def _publish(self, local_keys, keys):
+        local_keys = [
+            local_key
+            for local_key, key in zip(local_keys, keys)
+            if not self._is_shared_only(key)
+        ]
+        if not local_keys:
+            return
+        self._evict_local(local_keys)
+        count = len(local_keys)
+        try:
+            end = self.shared.incr(SEQ_KEY, count)
+        except ValueError:
+            self.shared.add(SEQ_KEY, 0, timeout=None)
+            end = self.shared.incr(SEQ_KEY, count)
+        self.shared.set_many(
+            {
+                BUS_KEY.format(seq): local_key
+                for seq, local_key in zip(range(end - count + 1, end + 1), local_keys)
+            },
+            self._bus_timeout,
+        )
+
+    def _sync(self):
+        local = self._local
+        if time.monotonic() - local.last_sync < self._sync_interval:
+            return
+        if not local.sync_lock.acquire(blocking=False):
+            return
+        try:
+            self._replay_bus()
+        finally:
+            local.last_sync = time.monotonic()
+            local.sync_lock.release()
+
+    def _replay_bus(self):
+        local = self._local
+        seq = self.shared.get(SEQ_KEY)
+        last_seq = local.last_seq
+        local.last_seq = seq
+        if seq == last_seq:
+            return
+        if seq is None or last_seq is None or seq < last_seq or seq - last_seq > self._max_backlog:
+            # Counter evicted or reset, first sync, or too far behind: start over.
+            self._evict_local([CLEAR_ALL])
+            return
+
+        bus_keys = [BUS_KEY.format(n) for n in range(last_seq + 1, seq + 1)]
+        published = self.shared.get_many(bus_keys)
+        if len(published) < len(bus_keys):
+            # Some notices expired or are still being written.
+            self._evict_local([CLEAR_ALL])
+            return
+        self._evict_local(list(published.values()))
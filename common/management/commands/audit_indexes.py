@@ -0,0 +1,319 @@
+import json
+from dataclasses import asdict, dataclass
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.db.models import UniqueConstraint
+
+# (model, leading columns, why) for the filters and orderings the API views and
+# admin issue. An index "serves" a shape when its key starts with the columns.
+QUERY_SHAPES = (
+    ("product.Product", ("slug",), "product detail and batch lookups"),
+    ("product.Product", ("created_at", "id"), "newest-first list pages, admin keyset"),
+    ("product.Category", ("slug",), "category detail, ?category= filter"),
+    ("product.Category", ("root_category_id",), "root-category trees"),
+    ("product.ProductGalleryImage", ("product_id",), "gallery prefetch"),
+    ("product.ProductFaqItem", ("product_id",), "FAQ prefetch"),
+    ("product.ProductSpecItem", ("product_id",), "spec table prefetch"),
+    ("blog.Blog", ("slug",), "blog detail"),
+    ("blog.Blog", ("published_at", "created_at"), "published blog list"),
+    ("blog.Category", ("root_category_id",), "root-category trees"),
+)
+
+LIVE_INDEXES_SQL = """
+SELECT
+    t.relname,
+    i.relname,
+    am.amname,
+    ix.indisunique,
+    ix.indisprimary,
+    ARRAY(
+        SELECT pg_get_indexdef(ix.indexrelid, k, true)
+        FROM generate_series(1, ix.indnkeyatts) AS k
+        ORDER BY k
+    ),
+    ix.indclass::text,
+    pg_get_expr(ix.indpred, ix.indrelid),
+    pg_get_indexdef(ix.indexrelid),
+    COALESCE(s.idx_scan, 0),
+    pg_relation_size(ix.indexrelid)
+FROM pg_index ix
+JOIN pg_class t ON t.oid = ix.indrelid
+JOIN pg_class i ON i.oid = ix.indexrelid
+JOIN pg_am am ON am.oid = i.relam
+LEFT JOIN pg_stat_user_indexes s ON s.indexrelid = ix.indexrelid
+WHERE t.relname = ANY(%s) AND pg_table_is_visible(t.oid)
+ORDER BY t.relname, i.relname
+"""
+
+
+@dataclass
+class LiveIndex:
+    table: str
+    name: str
+    method: str
+    unique: bool
+    primary: bool
+    columns: list
+    opclasses: str
+    predicate: str
+    definition: str
+    scans: int
+    size: int
+
+    @property
+    def signature(self):
+        return (self.table, self.method, tuple(self.columns), self.opclasses, self.predicate)
+
+    @property
+    def enforces_constraint(self):
+        return self.unique or self.primary
+
+
+@dataclass
+class Finding:
+    kind: str
+    table: str
+    index: str
+    detail: str
+    plan: str
+
+
+def format_size(size):
+    for unit in ("B", "kB", "MB", "GB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}"
+        size /= 1024
+    return f"{size:.0f} TB"
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare model-declared indexes with the live pg_index/pg_stat_user_indexes data "
+        "and report duplicate, redundant, unused and missing indexes with a migration plan."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--database", default="default")
+        parser.add_argument(
+            "--app",
+            action="append",
+            dest="app_labels",
+            help="Limit to these app labels (repeatable). Defaults to the project apps.",
+        )
+        parser.add_argument(
+            "--min-unused-size",
+            type=int,
+            default=0,
+            help="Only report unused indexes at least this many bytes large.",
+        )
+        parser.add_argument("--json", action="store_true", help="Print findings as JSON.")
+
+    def handle(self, *args, **options):
+        connection = connections[options["database"]]
+        if connection.vendor != "postgresql":
+            raise CommandError("audit_indexes needs a PostgreSQL database.")
+
+        models = self.get_models(options["app_labels"])
+        tables = {model._meta.db_table: model for model in models}
+        with connection.cursor() as cursor:
+            cursor.execute(LIVE_INDEXES_SQL, [list(tables)])
+            live = [LiveIndex(*row) for row in cursor.fetchall()]
+            cursor.execute(
+                "SELECT stats_reset FROM pg_stat_database WHERE datname = current_database()"
+            )
+            stats_reset = cursor.fetchone()[0]
+
+        findings = []
+        findings += self.find_duplicates(live, tables)
+        findings += self.find_redundant_prefixes(live, tables)
+        flagged = {(finding.table, finding.index) for finding in findings}
+        unused = [index for index in live if (index.table, index.name) not in flagged]
+        findings += self.find_unused(unused, tables, options["min_unused_size"])
+        findings += self.find_drift(live, tables)
+        findings += self.find_missing(live, {model._meta.label for model in models})
+
+        if options["json"]:
+            self.stdout.write(json.dumps([asdict(finding) for finding in findings], indent=2))
+            return
+        self.write_report(findings, live, stats_reset)
+
+    def get_models(self, app_labels):
+        if app_labels:
+            configs = [apps.get_app_config(label) for label in app_labels]
+        else:
+            configs = [
+                config
+                for config in apps.get_app_configs()
+                if not config.name.startswith(("django.", "rest_framework", "drf_"))
+            ]
+        models = []
+        for config in configs:
+            for model in config.get_models(include_auto_created=True):
+                if model._meta.managed and not model._meta.proxy:
+                    models.append(model)
+        return models
+
+    def declared_index_names(self, model):
+        return {index.name for index in model._meta.indexes} | {
+            constraint.name
+            for constraint in model._meta.constraints
+            if isinstance(constraint, UniqueConstraint)
+        }
+
+    def drop_plan(self, index, tables):
+        model = tables[index.table]
+        if index.name in self.declared_index_names(model):
+            return (
+                f"Remove {index.name!r} from {model._meta.label}.Meta.indexes and run "
+                "makemigrations (RemoveIndex)."
+            )
+        if index.enforces_constraint:
+            return "Backs a unique constraint; drop the constraint or the other index instead."
+        return (
+            f"Field-level index: drop db_index on the field, or run "
+            f"DROP INDEX CONCURRENTLY {index.name}; and record it in a migration."
+        )
+
+    def find_duplicates(self, live, tables):
+        findings = []
+        by_signature = {}
+        for index in live:
+            by_signature.setdefault(index.signature, []).append(index)
+        for group in by_signature.values():
+            if len(group) < 2:
+                continue
+            # Keep the index that enforces a constraint, else the one Django creates
+            # for the field itself; every other copy is dead weight.
+            keep = min(
+                group,
+                key=lambda index: (
+                    not index.enforces_constraint,
+                    index.name in self.declared_index_names(tables[index.table]),
+                    index.name,
+                ),
+            )
+            for index in group:
+                if index is keep or index.enforces_constraint:
+                    continue
+                findings.append(
+                    Finding(
+                        "duplicate",
+                        index.table,
+                        index.name,
+                        f"same key as {keep.name} ({', '.join(index.columns)}), "
+                        f"{format_size(index.size)}",
+                        self.drop_plan(index, tables),
+                    )
+                )
+        return findings
+
+    def find_redundant_prefixes(self, live, tables):
+        findings = []
+        btrees = [
+            index for index in live if index.method == "btree" and not index.predicate
+        ]
+        for index in btrees:
+            if index.enforces_constraint:
+                continue
+            for other in btrees:
+                if (
+                    other is not index
+                    and other.table == index.table
+                    and len(other.columns) > len(index.columns)
+                    and other.columns[: len(index.columns)] == index.columns
+                    and other.opclasses.split()[: len(index.columns)]
+                    == index.opclasses.split()
+                ):
+                    findings.append(
+                        Finding(
+                            "redundant",
+                            index.table,
+                            index.name,
+                            f"leading columns of {other.name} ({', '.join(other.columns)})",
+                            self.drop_plan(index, tables),
+                        )
+                    )
+                    break
+        return findings
+
+    def find_unused(self, live, tables, min_size):
+        return [
+            Finding(
+                "unused",
+                index.table,
+                index.name,
+                f"0 scans since stats reset, {format_size(index.size)}",
+                "Confirm on every replica before dropping. " + self.drop_plan(index, tables),
+            )
+            for index in live
+            if index.scans == 0 and not index.enforces_constraint and index.size >= min_size
+        ]
+
+    def find_drift(self, live, tables):
+        findings = []
+        live_names = {(index.table, index.name) for index in live}
+        for table, model in tables.items():
+            for name in sorted(self.declared_index_names(model)):
+                if (table, name) not in live_names:
+                    findings.append(
+                        Finding(
+                            "not-in-database",
+                            table,
+                            name,
+                            f"declared on {model._meta.label} but missing from the database",
+                            "Run migrate; check for a failed or faked migration.",
+                        )
+                    )
+        return findings
+
+    def find_missing(self, live, labels):
+        findings = []
+        for label, columns, reason in QUERY_SHAPES:
+            if label not in labels:
+                continue
+            model = apps.get_model(label)
+            table = model._meta.db_table
+            served = any(
+                index.table == table
+                and index.method == "btree"
+                and tuple(index.columns[: len(columns)]) == columns
+                for index in live
+            )
+            if not served:
+                fields = ", ".join(f'"{column}"' for column in columns)
+                findings.append(
+                    Finding(
+                        "missing",
+                        table,
+                        "",
+                        f"no index leads with ({', '.join(columns)}) for {reason}",
+                        f"Add models.Index(fields=[{fields}], name=...) to "
+                        f"{label}.Meta.indexes and run makemigrations.",
+                    )
+                )
+        return findings
+
+    def write_report(self, findings, live, stats_reset):
+        total_size = sum(index.size for index in live)
+        self.stdout.write(
+            f"{len(live)} indexes, {format_size(total_size)}; "
+            f"usage statistics since {stats_reset or 'the cluster started'}."
+        )
+        if not findings:
+            self.stdout.write(self.style.SUCCESS("No index issues found."))
+            return
+        for kind in ("duplicate", "redundant", "missing", "not-in-database", "unused"):
+            group = [finding for finding in findings if finding.kind == kind]
+            if not group:
+                continue
+            self.stdout.write(self.style.MIGRATE_HEADING(f"{kind.capitalize()} ({len(group)})"))
+            for finding in group:
+                name = f".{finding.index}" if finding.index else ""
+                self.stdout.write(f"  {finding.table}{name}: {finding.detail}")
+        self.stdout.write(self.style.MIGRATE_HEADING("Migration plan"))
+        for step, finding in enumerate(
+            (finding for finding in findings if finding.kind != "unused"), start=1
+        ):
+            self.stdout.write(f"  {step}. [{finding.table}] {finding.plan}")
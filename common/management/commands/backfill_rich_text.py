@@ -0,0 +1,97 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from common.cache import bump_namespace
+from common.models import RichTextModel
+
+
+def render_batch(label, pks):
+    model = apps.get_model(label)
+    objects = list(model.objects.filter(pk__in=pks).only("pk", *model.rich_text_fields))
+    for obj in objects:
+        obj.render_rich_text()
+    fields = [
+        field
+        for name in model.rich_text_fields
+        for field in model.rendered_field_names(name)
+    ]
+    model.objects.bulk_update(objects, fields)
+    return label, len(objects)
+
+
+class Command(BaseCommand):
+    help = "Render the stored HTML, plain text and word count for existing rich text rows."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--model",
+            action="append",
+            dest="models",
+            help="Limit to app_label.ModelName (repeatable).",
+        )
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+
+    def handle(self, *args, **options):
+        models = self.get_models(options["models"])
+        batch_size = options["batch_size"]
+        batches = [
+            (model._meta.label, pks)
+            for model in models
+            for pks in self.iter_pk_batches(model, batch_size)
+        ]
+        if not batches:
+            self.stdout.write("Nothing to backfill.")
+            return
+
+        totals = {}
+        if options["workers"] <= 1:
+            for label, pks in batches:
+                self.add_result(totals, *render_batch(label, pks))
+        else:
+            # Children must open their own database connections.
+            connections.close_all()
+            with ProcessPoolExecutor(
+                max_workers=options["workers"],
+                mp_context=multiprocessing.get_context("fork"),
+            ) as executor:
+                futures = [executor.submit(render_batch, label, pks) for label, pks in batches]
+                for future in as_completed(futures):
+                    self.add_result(totals, *future.result())
+
+        # bulk_update() sends no signals, so drop the cached API responses here.
+        bump_namespace("catalog", "blog")
+        for label, count in totals.items():
+            self.stdout.write(self.style.SUCCESS(f"{label}: rendered {count} rows."))
+
+    def get_models(self, labels):
+        models = [
+            model
+            for model in apps.get_models()
+            if issubclass(model, RichTextModel) and model.rich_text_fields
+        ]
+        if not labels:
+            return models
+        by_label = {model._meta.label_lower: model for model in models}
+        try:
+            return [by_label[label.lower()] for label in labels]
+        except KeyError as exc:
+            raise CommandError(f"{exc.args[0]} has no rich text fields.")
+
+    def iter_pk_batches(self, model, batch_size):
+        batch = []
+        for pk in model.objects.order_by("pk").values_list("pk", flat=True).iterator():
+            batch.append(pk)
+            if len(batch) == batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def add_result(self, totals, label, count):
+        totals[label] = totals.get(label, 0) + count
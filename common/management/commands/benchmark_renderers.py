@@ -0,0 +1,147 @@
+import timeit
+
+from django.core.management.base import BaseCommand
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory
+
+from common.renderers import MessagePackRenderer, ORJSONRenderer
+
+RENDERERS = (
+    ("drf-json", JSONRenderer),
+    ("orjson", ORJSONRenderer),
+    ("msgpack", MessagePackRenderer),
+)
+
+
+def _category(index):
+    return {
+        "id": index,
+        "name": f"Category {index}",
+        "slug": f"category-{index}",
+        "root_category": {
+            "id": index % 4,
+            "name": f"Root {index % 4}",
+            "slug": f"root-{index % 4}",
+            "image": f"https://example.com/media/products/root-categories/{index % 4}.jpg",
+        },
+    }
+
+
+def _product_summary(index):
+    return {
+        "id": index,
+        "title": f"Product {index}",
+        "slug": f"product-{index}",
+        "short_description": "A short summary of the product. " * 3,
+        "hero_image": f"https://example.com/media/products/hero/{index}.jpg",
+        "categories": [_category(index % 7), _category(index % 5)],
+    }
+
+
+def synthetic_payloads():
+    product_list = {
+        "count": 1000,
+        "next": "https://example.com/api/products/?page=2&page_size=60",
+        "previous": None,
+        "results": [_product_summary(index) for index in range(60)],
+    }
+    columns = [f"Model {index}" for index in range(20)]
+    product_detail = {
+        **_product_summary(1),
+        "description": "<p>" + "Rich product description text. " * 200 + "</p>",
+        "hero_video": None,
+        "gallery_images": [
+            {
+                "id": index,
+                "url": f"https://example.com/media/products/gallery/{index}.jpg",
+                "alt_text": f"Gallery image {index}",
+                "sort_order": index,
+            }
+            for index in range(12)
+        ],
+        "faq_items": [
+            {"question": f"Question {index}?", "answer": "<p>An answer.</p>", "sort_order": index}
+            for index in range(10)
+        ],
+        "spec_table": {
+            "columns": columns,
+            "rows": [
+                {"label": f"Spec {row}", "values": {column: f"{row} units" for column in columns}}
+                for row in range(40)
+            ],
+        },
+    }
+    blog_list = {
+        "count": 200,
+        "next": "https://example.com/api/blogs/?page=2",
+        "previous": None,
+        "results": [
+            {
+                "id": index,
+                "title": f"Blog post {index}",
+                "slug": f"blog-post-{index}",
+                "image": f"https://example.com/media/blogs/images/{index}.jpg",
+                "excerpt": "An excerpt of the blog post body. " * 5,
+                "categories": [{"id": 1, "name": "News", "slug": "news"}],
+                "published_at": "2026-01-08T15:51:00Z",
+            }
+            for index in range(20)
+        ],
+    }
+    return {"product-list": product_list, "product-detail": product_detail, "blog-list": blog_list}
+
+
+def database_payloads():
+    from blog.models import Blog
+    from blog.serializers import BlogListSerializer
+    from product.models import Product
+    from product.serializers import ProductDetailSerializer, ProductListSerializer
+
+    context = {"request": APIRequestFactory().get("/")}
+    products = Product.objects.prefetch_related(
+        "categories__root_category", "gallery_images", "faq_items", "spec_items"
+    )[:60]
+    detail = (
+        Product.objects.prefetch_related(
+            "categories__root_category", "gallery_images", "faq_items", "spec_items"
+        )
+        .order_by("-created_at")
+        .first()
+    )
+    blogs = Blog.objects.filter(is_published=True).prefetch_related("categories")[:20]
+    return {
+        "product-list": {"results": ProductListSerializer(products, many=True, context=context).data},
+        "product-detail": ProductDetailSerializer(detail, context=context).data if detail else {},
+        "blog-list": {"results": BlogListSerializer(blogs, many=True, context=context).data},
+    }
+
+
+class Command(BaseCommand):
+    help = "Compare render time and size of the API renderers on product and blog payloads."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--source",
+            choices=("synthetic", "db"),
+            default="synthetic",
+            help="Render generated payloads or serializer output for rows in the database.",
+        )
+        parser.add_argument("--iterations", type=int, default=500)
+
+    def handle(self, *args, **options):
+        payloads = database_payloads() if options["source"] == "db" else synthetic_payloads()
+        iterations = options["iterations"]
+
+        self.stdout.write(f"{'payload':<16}{'renderer':<10}{'us/render':>12}{'bytes':>10}{'speedup':>9}")
+        for payload_name, data in payloads.items():
+            baseline = None
+            for renderer_name, renderer_class in RENDERERS:
+                renderer = renderer_class()
+                size = len(renderer.render(data))
+                seconds = timeit.timeit(lambda: renderer.render(data), number=iterations)
+                micros = seconds / iterations * 1_000_000
+                baseline = baseline or micros
+                self.stdout.write(
+                    f"{payload_name:<16}{renderer_name:<10}{micros:>12.1f}{size:>10}"
+                    f"{baseline / micros:>8.1f}x"
+                )
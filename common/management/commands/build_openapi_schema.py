@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+from drf_spectacular.renderers import OpenApiJsonRenderer, OpenApiYamlRenderer
+from drf_spectacular.settings import spectacular_settings
+
+from common.schema import schema_path
+
+RENDERERS = {
+    "yaml": OpenApiYamlRenderer,
+    "json": OpenApiJsonRenderer,
+}
+
+
+class Command(BaseCommand):
+    help = "Generate the OpenAPI schema once and write it to OPENAPI_SCHEMA_DIR."
+
+    def handle(self, *args, **options):
+        generator = spectacular_settings.DEFAULT_GENERATOR_CLASS()
+        schema = generator.get_schema(request=None, public=True)
+
+        for schema_format, renderer_class in RENDERERS.items():
+            path = schema_path(schema_format)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            content = renderer_class().render(schema, renderer_context={})
+            tmp_path = path.with_name(f".{path.name}.tmp")
+            tmp_path.write_bytes(content)
+            tmp_path.replace(path)
+            self.stdout.write(self.style.SUCCESS(f"Wrote {path}"))
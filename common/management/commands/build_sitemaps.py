@@ -0,0 +1,158 @@
+import json
+import os
+import tempfile
+from dataclasses import dataclass
+from datetime import datetime
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count, F, Max
+
+from blog.models import Blog
+from product.models import Category, Product
+
+MANIFEST_NAME = "manifest.json"
+INDEX_NAME = "sitemap.xml"
+XMLNS = "http://www.sitemaps.org/schemas/sitemap/0.9"
+
+
+@dataclass
+class Section:
+    name: str
+    queryset: object
+
+    @property
+    def path_template(self):
+        return settings.SITEMAP_PATHS[self.name]
+
+
+def sections():
+    return (
+        Section("product", Product.objects.all()),
+        Section("category", Category.objects.all()),
+        Section("blog", Blog.objects.filter(is_published=True)),
+    )
+
+
+def lastmod(value):
+    return value.isoformat(timespec="seconds")
+
+
+def write_atomic(path, lines):
+    directory = os.path.dirname(path)
+    descriptor, temporary_path = tempfile.mkstemp(dir=directory, prefix=".sitemap-")
+    try:
+        with os.fdopen(descriptor, "w", encoding="utf-8") as output:
+            output.writelines(lines)
+        os.chmod(temporary_path, 0o644)
+        os.replace(temporary_path, path)
+    finally:
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+
+
+class Command(BaseCommand):
+    help = (
+        "Write sitemap shards (one per primary-key range) and the sitemap index under "
+        "SITEMAP_ROOT, regenerating only the shards whose rows changed since the last run."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--full", action="store_true", help="Regenerate every shard.")
+
+    def handle(self, *args, **options):
+        if not settings.SITEMAP_BASE_URL:
+            raise CommandError("Set SITEMAP_BASE_URL to the public site URL.")
+        root = settings.SITEMAP_ROOT
+        os.makedirs(root, exist_ok=True)
+        manifest_path = os.path.join(root, MANIFEST_NAME)
+        previous = {} if options["full"] else self.read_manifest(manifest_path)
+
+        manifest = {}
+        written = 0
+        for section in sections():
+            for shard, state in self.shard_states(section).items():
+                name = f"{section.name}-{shard}"
+                manifest[name] = state
+                if previous.get(name) != state or not os.path.exists(self.shard_path(name)):
+                    self.write_shard(section, shard, name)
+                    written += 1
+
+        removed = sorted(set(previous) - set(manifest))
+        for name in removed:
+            try:
+                os.remove(self.shard_path(name))
+            except FileNotFoundError:
+                pass
+
+        self.write_index(root, manifest)
+        write_atomic(manifest_path, [json.dumps(manifest, indent=2, sort_keys=True)])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{len(manifest)} shards: {written} written, "
+                f"{len(manifest) - written} unchanged, {len(removed)} removed."
+            )
+        )
+
+    def read_manifest(self, path):
+        try:
+            with open(path, encoding="utf-8") as manifest:
+                return json.load(manifest)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def shard_path(self, name):
+        return os.path.join(settings.SITEMAP_ROOT, f"{name}.xml")
+
+    def shard_states(self, section):
+        """``{shard number: {"count", "last_updated"}}`` from one grouped aggregate query."""
+        size = settings.SITEMAP_SHARD_SIZE
+        rows = (
+            section.queryset.order_by()
+            .annotate(shard=F("pk") / size)
+            .values("shard")
+            .annotate(count=Count("pk"), last_updated=Max("updated_at"))
+        )
+        return {
+            row["shard"]: {"count": row["count"], "last_updated": row["last_updated"].isoformat()}
+            for row in rows
+        }
+
+    def write_shard(self, section, shard, name):
+        size = settings.SITEMAP_SHARD_SIZE
+        base_url = settings.SITEMAP_BASE_URL.rstrip("/")
+        rows = (
+            section.queryset.filter(pk__gte=shard * size, pk__lt=(shard + 1) * size)
+            .order_by("pk")
+            .values_list("slug", "updated_at")
+            .iterator(chunk_size=2000)
+        )
+
+        def lines():
+            yield '<?xml version="1.0" encoding="UTF-8"?>\n'
+            yield f'<urlset xmlns="{XMLNS}">\n'
+            for slug, updated_at in rows:
+                location = escape(base_url + section.path_template.format(slug=slug))
+                yield f"<url><loc>{location}</loc><lastmod>{lastmod(updated_at)}</lastmod></url>\n"
+            yield "</urlset>\n"
+
+        write_atomic(self.shard_path(name), lines())
+
+    def write_index(self, root, manifest):
+        base_url = settings.SITEMAP_BASE_URL.rstrip("/")
+        prefix = settings.SITEMAP_URL.strip("/")
+
+        def lines():
+            yield '<?xml version="1.0" encoding="UTF-8"?>\n'
+            yield f'<sitemapindex xmlns="{XMLNS}">\n'
+            for name, state in sorted(manifest.items()):
+                location = escape(f"{base_url}/{prefix}/{name}.xml")
+                yield (
+                    f"<sitemap><loc>{location}</loc>"
+                    f"<lastmod>{lastmod(datetime.fromisoformat(state['last_updated']))}"
+                    "</lastmod></sitemap>\n"
+                )
+            yield "</sitemapindex>\n"
+
+        write_atomic(os.path.join(root, INDEX_NAME), lines())
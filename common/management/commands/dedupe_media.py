@@ -0,0 +1,206 @@
+import hashlib
+import os
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from common.cache import bump_namespace
+from common.media import blob_size, content_addressed_fields, count_references
+from common.models import ContentBlob
+from common.storage import (
+    CAS_PREFIX,
+    ContentAddressedStorage,
+    content_addressed_name,
+    is_content_addressed,
+)
+
+
+def format_size(size):
+    for unit in ("B", "kB", "MB", "GB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}"
+        size /= 1024
+    return f"{size:.0f} TB"
+
+
+class Command(BaseCommand):
+    help = (
+        "Move existing uploads into the content-addressed store: hash them in parallel, "
+        "point the model rows at one copy per content, rebuild the reference counts "
+        "and remove the originals. --gc also removes unreferenced blobs."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=8, help="Files hashed in parallel.")
+        parser.add_argument("--dry-run", action="store_true", help="Only report what would change.")
+        parser.add_argument(
+            "--keep-originals",
+            action="store_true",
+            help="Leave the legacy files in place after the rows point at the store.",
+        )
+        parser.add_argument(
+            "--gc",
+            action="store_true",
+            help="Also delete blobs unreferenced for MEDIA_GC_GRACE_HOURS.",
+        )
+
+    def handle(self, *args, **options):
+        if not isinstance(default_storage, ContentAddressedStorage):
+            raise CommandError("The default storage is not common.storage.ContentAddressedStorage.")
+        dry_run = options["dry_run"]
+        fields = content_addressed_fields()
+
+        legacy = self.legacy_references(fields)
+        self.stdout.write(f"{len(legacy)} legacy files to move into the store.")
+        moved = self.move_into_store(legacy, options["workers"], dry_run)
+
+        if not dry_run:
+            with transaction.atomic():
+                for old_name, new_name in moved.items():
+                    for model, field_name in legacy[old_name]:
+                        model._base_manager.filter(**{field_name: old_name}).update(
+                            **{field_name: new_name}
+                        )
+            self.rebuild_reference_counts()
+            if moved:
+                bump_namespace("catalog", "blog")
+
+        stored = {moved[name]: size for name, size in self.sizes.items()}
+        saved = sum(self.sizes.values()) - sum(stored.values())
+        verb = "Would move" if dry_run else "Moved"
+        self.stdout.write(
+            f"{verb} {len(moved)} files into {len(stored)} blobs, saving {format_size(saved)}."
+        )
+
+        if not options["keep_originals"] and not dry_run:
+            for old_name in moved:
+                if default_storage.exists(old_name):
+                    default_storage.delete(old_name)
+
+        if options["gc"]:
+            self.collect_garbage(dry_run)
+
+    def legacy_references(self, fields):
+        """``{stored name: [(model, field name)]}`` for rows outside the store."""
+        references = {}
+        for model, field_names in fields.items():
+            for field_name in field_names:
+                names = (
+                    model._base_manager.exclude(**{field_name: ""})
+                    .exclude(**{f"{field_name}__isnull": True})
+                    .exclude(**{f"{field_name}__startswith": f"{CAS_PREFIX}/"})
+                    .values_list(field_name, flat=True)
+                    .distinct()
+                )
+                for name in names:
+                    references.setdefault(name, set()).add((model, field_name))
+        return references
+
+    def move_into_store(self, legacy, workers, dry_run):
+        """Hash and link each legacy file into the store; ``{old name: new name}``."""
+        self.sizes = {}
+
+        def store(name):
+            path = default_storage.path(name)
+            try:
+                with open(path, "rb") as source:
+                    digest = hashlib.file_digest(source, "sha256").hexdigest()
+                size = os.path.getsize(path)
+            except OSError as exc:
+                return name, None, 0, str(exc)
+            new_name = content_addressed_name(digest, name)
+            target = default_storage.path(new_name)
+            if not dry_run and not os.path.exists(target):
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                try:
+                    os.link(path, target)
+                except FileExistsError:
+                    pass
+                except OSError:
+                    shutil.copy2(path, target)
+            return name, new_name, size, None
+
+        started = time.perf_counter()
+        moved = {}
+        with ThreadPoolExecutor(max_workers=max(workers, 1)) as executor:
+            for name, new_name, size, error in executor.map(store, sorted(legacy)):
+                if error:
+                    self.stderr.write(f"Skipping {name}: {error}")
+                    continue
+                moved[name] = new_name
+                self.sizes[name] = size
+        self.stdout.write(f"Hashed {len(moved)} files in {time.perf_counter() - started:.1f}s.")
+        return moved
+
+    def rebuild_reference_counts(self):
+        counts = count_references()
+        with transaction.atomic():
+            existing = dict(ContentBlob.objects.values_list("name", "ref_count"))
+            ContentBlob.objects.bulk_create(
+                [
+                    ContentBlob(name=name, size=blob_size(name), ref_count=count)
+                    for name, count in counts.items()
+                    if name not in existing
+                ],
+                batch_size=1000,
+            )
+            for name, ref_count in existing.items():
+                if counts.get(name, 0) != ref_count:
+                    ContentBlob.objects.filter(name=name).update(
+                        ref_count=counts.get(name, 0), updated_at=timezone.now()
+                    )
+
+    def collect_garbage(self, dry_run):
+        cutoff = timezone.now() - timedelta(hours=settings.MEDIA_GC_GRACE_HOURS)
+        grace_seconds = settings.MEDIA_GC_GRACE_HOURS * 3600
+        removed = 0
+        freed = 0
+        candidates = ContentBlob.objects.filter(ref_count__lte=0, updated_at__lt=cutoff)
+        for blob in candidates.iterator():
+            path = default_storage.path(blob.name)
+            try:
+                # Saving identical content touches the file, so a fresh upload
+                # that is about to reference it is left alone.
+                if time.time() - os.path.getmtime(path) < grace_seconds:
+                    continue
+                size = os.path.getsize(path)
+            except FileNotFoundError:
+                size = 0
+            if not dry_run:
+                with transaction.atomic():
+                    deleted, _ = ContentBlob.objects.filter(pk=blob.pk, ref_count__lte=0).delete()
+                if not deleted:
+                    continue
+                default_storage.delete_unreferenced(blob.name)
+            removed += 1
+            freed += size
+
+        # Files saved by uploads that never made it into a row.
+        known = set(ContentBlob.objects.values_list("name", flat=True))
+        root = default_storage.path(CAS_PREFIX)
+        for directory, _, filenames in os.walk(root):
+            for filename in filenames:
+                path = os.path.join(directory, filename)
+                name = os.path.relpath(path, default_storage.location).replace(os.sep, "/")
+                if name in known or not is_content_addressed(name):
+                    continue
+                try:
+                    if time.time() - os.path.getmtime(path) < grace_seconds:
+                        continue
+                    size = os.path.getsize(path)
+                except FileNotFoundError:
+                    continue
+                if not dry_run:
+                    default_storage.delete_unreferenced(name)
+                removed += 1
+                freed += size
+
+        verb = "Would remove" if dry_run else "Removed"
+        self.stdout.write(f"{verb} {removed} unreferenced blobs ({format_size(freed)}).")
@@ -0,0 +1,177 @@
+import json
+import os
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Runs in a fresh interpreter under ``-X importtime``: times django.setup() per
+# app (app module import, models import, ready()) and optionally the URLconf.
+PROBE = """
+import json, sys, time
+from django.apps.config import AppConfig
+
+timings = {}
+_create = AppConfig.create.__func__
+_import_models = AppConfig.import_models
+
+
+def _record(label, phase, started):
+    timings.setdefault(label, {})[phase] = (time.perf_counter() - started) * 1000
+
+
+def create(cls, entry):
+    started = time.perf_counter()
+    config = _create(cls, entry)
+    _record(config.label, "import", started)
+    ready = config.ready
+
+    def timed_ready():
+        started = time.perf_counter()
+        ready()
+        _record(config.label, "ready", started)
+
+    config.ready = timed_ready
+    return config
+
+
+def import_models(self):
+    started = time.perf_counter()
+    _import_models(self)
+    _record(self.label, "models", started)
+
+
+AppConfig.create = classmethod(create)
+AppConfig.import_models = import_models
+
+started = time.perf_counter()
+import django
+django.setup()
+setup_ms = (time.perf_counter() - started) * 1000
+urls_ms = None
+if "--urls" in sys.argv:
+    from importlib import import_module
+    from django.conf import settings
+    started = time.perf_counter()
+    import_module(settings.ROOT_URLCONF)
+    urls_ms = (time.perf_counter() - started) * 1000
+print(json.dumps({"setup_ms": setup_ms, "urls_ms": urls_ms, "apps": timings}))
+"""
+
+
+def parse_importtime(stderr):
+    """Return ``[(module, self_us, cumulative_us, depth)]`` from -X importtime output."""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        depth = (len(name) - len(name.lstrip(" ")) - 1) // 2
+        entries.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return entries
+
+
+class Command(BaseCommand):
+    help = "Profile interpreter start-up: import-time tree and django.setup() cost per app."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--urls", action="store_true", help="Also import ROOT_URLCONF.")
+        parser.add_argument("--top", type=int, default=25, help="Modules to list.")
+        parser.add_argument("--depth", type=int, default=3, help="Import tree depth to print.")
+        parser.add_argument("--repeat", type=int, default=3, help="Runs; the fastest is reported.")
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Fail if start-up exceeds STARTUP_TIME_BUDGET_MS.",
+        )
+
+    def handle(self, *args, **options):
+        runs = [self.run_probe(options["urls"]) for _ in range(max(options["repeat"], 1))]
+        result, imports = min(runs, key=lambda run: self.total_ms(run[0]))
+
+        self.write_import_tree(imports, options["depth"], options["top"])
+        self.write_top_modules(imports, options["top"])
+        self.write_packages(imports)
+        self.write_apps(result["apps"])
+
+        total = self.total_ms(result)
+        self.stdout.write("")
+        self.stdout.write(f"django.setup(): {result['setup_ms']:.1f} ms")
+        if result["urls_ms"] is not None:
+            self.stdout.write(f"URLconf import: {result['urls_ms']:.1f} ms")
+        self.stdout.write(f"Total: {total:.1f} ms")
+
+        if options["check"]:
+            budget = settings.STARTUP_TIME_BUDGET_MS
+            if total > budget:
+                raise CommandError(f"Start-up took {total:.1f} ms, budget is {budget} ms.")
+            self.stdout.write(self.style.SUCCESS(f"Within budget ({budget} ms)."))
+
+    def run_probe(self, include_urls):
+        command = [sys.executable, "-X", "importtime", "-c", PROBE]
+        if include_urls:
+            command.append("--urls")
+        completed = subprocess.run(
+            command,
+            capture_output=True,
+            text=True,
+            env={**os.environ, "DJANGO_SETTINGS_MODULE": os.environ["DJANGO_SETTINGS_MODULE"]},
+            cwd=settings.BASE_DIR,
+        )
+        if completed.returncode:
+            raise CommandError(completed.stderr.strip().splitlines()[-1])
+        result = json.loads(completed.stdout.strip().splitlines()[-1])
+        return result, parse_importtime(completed.stderr)
+
+    def total_ms(self, result):
+        return result["setup_ms"] + (result["urls_ms"] or 0)
+
+    def write_import_tree(self, imports, max_depth, top):
+        # importtime prints children before their parent; reverse to get a tree.
+        self.stdout.write(self.style.MIGRATE_HEADING("Import tree (cumulative ms)"))
+        roots = sorted(
+            (entry for entry in imports if entry[3] == 0), key=lambda entry: -entry[2]
+        )[:top]
+        children = defaultdict(list)
+        stack = []
+        for entry in reversed(imports):
+            while stack and stack[-1][3] >= entry[3]:
+                stack.pop()
+            if stack:
+                children[stack[-1]].append(entry)
+            stack.append(entry)
+
+        def write(entry):
+            name, _, cumulative_us, depth = entry
+            self.stdout.write(f"{'  ' * depth}{cumulative_us / 1000:8.1f}  {name}")
+            if depth + 1 < max_depth:
+                for child in sorted(children[entry], key=lambda child: -child[2])[:5]:
+                    if child[2] >= 1000:
+                        write(child)
+
+        for root in roots:
+            write(root)
+
+    def write_top_modules(self, imports, top):
+        self.stdout.write(self.style.MIGRATE_HEADING("Slowest modules (self ms)"))
+        for name, self_us, _, _ in sorted(imports, key=lambda entry: -entry[1])[:top]:
+            self.stdout.write(f"{self_us / 1000:8.1f}  {name}")
+
+    def write_packages(self, imports):
+        self.stdout.write(self.style.MIGRATE_HEADING("Import time by top-level package (self ms)"))
+        packages = defaultdict(int)
+        for name, self_us, _, _ in imports:
+            packages[name.split(".")[0]] += self_us
+        for package, self_us in sorted(packages.items(), key=lambda item: -item[1])[:15]:
+            self.stdout.write(f"{self_us / 1000:8.1f}  {package}")
+
+    def write_apps(self, apps):
+        self.stdout.write(self.style.MIGRATE_HEADING("django.setup() by app (ms)"))
+        self.stdout.write(f"{'app':<20}{'import':>9}{'models':>9}{'ready':>9}")
+        for label, phases in sorted(apps.items(), key=lambda item: -sum(item[1].values())):
+            self.stdout.write(
+                f"{label:<20}{phases.get('import', 0):>9.1f}"
+                f"{phases.get('models', 0):>9.1f}{phases.get('ready', 0):>9.1f}"
+            )
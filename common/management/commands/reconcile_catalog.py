@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from common.cache import bump_namespace
+from product.counts import reconcile_product_counts
+from product.denormalize import reconcile_category_arrays
+from product.signals import CACHE_NAMESPACE
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the denormalized catalog columns (product counts, product category "
+        "id arrays) where they drifted."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report drifted rows without fixing them.",
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options["dry_run"]
+        with transaction.atomic():
+            categories, roots = reconcile_product_counts(dry_run=dry_run)
+            products = reconcile_category_arrays(dry_run=dry_run)
+        verb = "Would fix" if dry_run else "Fixed"
+        self.stdout.write(
+            f"{verb} product_count on {categories} categories and {roots} root categories."
+        )
+        self.stdout.write(f"{verb} category id arrays on {products} products.")
+        if not dry_run and (categories or roots or products):
+            bump_namespace(CACHE_NAMESPACE)
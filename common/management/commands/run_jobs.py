@@ -0,0 +1,94 @@
+import json
+import multiprocessing
+import signal
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from jobs.queue import queue_stats
+from jobs.worker import Worker
+
+
+class Command(BaseCommand):
+    help = (
+        "Run background jobs from the database queue with a pool of processes and "
+        "threads, logging throughput and queue lag."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--processes", type=int, default=settings.JOBS_WORKER_PROCESSES)
+        parser.add_argument(
+            "--threads",
+            type=int,
+            default=settings.JOBS_WORKER_THREADS,
+            help="Worker threads per process (I/O-bound tasks); each holds a connection.",
+        )
+        parser.add_argument("--poll-interval", type=float, default=settings.JOBS_POLL_INTERVAL)
+        parser.add_argument(
+            "--stats-interval",
+            type=float,
+            default=60,
+            help="Seconds between throughput/lag reports and stale-job housekeeping.",
+        )
+        parser.add_argument(
+            "--burst",
+            action="store_true",
+            help="Exit once no job is ready instead of polling.",
+        )
+        parser.add_argument(
+            "--stats",
+            action="store_true",
+            help="Print queue depth and lag as JSON and exit.",
+        )
+
+    def handle(self, *args, **options):
+        if options["stats"]:
+            self.stdout.write(json.dumps(queue_stats(), indent=2))
+            return
+
+        processes = max(options["processes"], 1)
+        self.stdout.write(
+            f"Starting {processes} worker processes x {options['threads']} threads."
+        )
+        if processes == 1:
+            self.run_worker(options, housekeeping=True)
+            return
+
+        # Children must not inherit the parent's database connections.
+        connections.close_all()
+        context = multiprocessing.get_context("fork")
+        children = [
+            context.Process(target=self.run_worker, args=(options, index == 0))
+            for index in range(processes)
+        ]
+        for child in children:
+            child.start()
+
+        def forward(signum, frame):
+            for child in children:
+                if child.is_alive():
+                    child.terminate()
+
+        signal.signal(signal.SIGTERM, forward)
+        signal.signal(signal.SIGINT, forward)
+        for child in children:
+            child.join()
+
+    def run_worker(self, options, housekeeping):
+        worker = Worker(
+            threads=max(options["threads"], 1),
+            poll_interval=options["poll_interval"],
+            stats_interval=options["stats_interval"],
+            log=self.stdout.write,
+            burst=options["burst"],
+            housekeeping=housekeeping,
+        )
+
+        def shutdown(signum, frame):
+            # Let running jobs finish; stale locks are requeued otherwise.
+            worker.stop.set()
+
+        signal.signal(signal.SIGTERM, shutdown)
+        signal.signal(signal.SIGINT, shutdown)
+        worker.run()
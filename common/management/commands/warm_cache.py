@@ -0,0 +1,144 @@
+import math
+import re
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test import RequestFactory
+from django.urls import resolve, reverse
+
+from blog.models import Blog
+from product.models import RESERVED_PRODUCT_SLUGS, Category, Product
+from product.views import CategoryListPagination, ProductListPagination
+
+# Request line of an nginx "combined" log entry for a product detail page.
+PRODUCT_REQUEST_RE = re.compile(
+    r'"GET /api/products/(?P<slug>[-\w]+)/(?:\?[^ "]*)? HTTP/[\d.]+" 200 '
+)
+
+
+def top_products_from_log(path, limit):
+    hits = Counter()
+    try:
+        with open(path, encoding="utf-8", errors="replace") as log:
+            for line in log:
+                match = PRODUCT_REQUEST_RE.search(line)
+                if match and match["slug"] not in RESERVED_PRODUCT_SLUGS:
+                    hits[match["slug"]] += 1
+    except OSError as exc:
+        raise CommandError(f"Cannot read access log: {exc}")
+    return [slug for slug, _ in hits.most_common(limit)]
+
+
+class Command(BaseCommand):
+    help = "Render the hot public API routes into the cache, e.g. after a deploy."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--host", default=settings.CACHE_WARM_HOST)
+        parser.add_argument("--scheme", choices=("http", "https"), default="https")
+        parser.add_argument("--top", type=int, default=200, help="Product and blog detail pages to warm.")
+        parser.add_argument(
+            "--access-log",
+            help="nginx access log to rank products by traffic; "
+            "defaults to the most recently updated products.",
+        )
+        parser.add_argument("--pages", type=int, default=3, help="List pages to warm per route.")
+        parser.add_argument("--workers", type=int, default=8)
+
+    def handle(self, *args, **options):
+        paths = self.get_paths(options)
+        factory = RequestFactory(
+            HTTP_HOST=options["host"],
+            secure=options["scheme"] == "https",
+        )
+        workers = max(options["workers"], 1)
+        chunks = [paths[index::workers] for index in range(workers)]
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = [
+                result
+                for chunk in executor.map(lambda chunk: self.warm(factory, chunk), chunks)
+                for result in chunk
+            ]
+        elapsed = time.perf_counter() - started
+
+        outcomes = Counter(outcome for _, outcome, _ in results)
+        for path, outcome, ms in results:
+            if outcome not in ("MISS", "HIT"):
+                self.stderr.write(f"{outcome}  {path} ({ms:.0f} ms)")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Warmed {outcomes['MISS']} routes ({outcomes['HIT']} already cached, "
+                f"{len(results) - outcomes['MISS'] - outcomes['HIT']} failed) "
+                f"in {elapsed:.1f}s with {workers} workers."
+            )
+        )
+
+    def get_paths(self, options):
+        paths = [
+            reverse("product:root-category-list"),
+            reverse("blog:root-category-list"),
+            reverse("blog:blog-list"),
+        ]
+        paths += self.get_page_paths(
+            "product:product-list", Product.objects.count(), ProductListPagination, options
+        )
+        paths += self.get_page_paths(
+            "product:category-list", Category.objects.count(), CategoryListPagination, options
+        )
+        paths += [
+            reverse("product:category-detail", kwargs={"slug": slug})
+            for slug in Category.objects.order_by("name").values_list("slug", flat=True)
+        ]
+        paths += [
+            reverse("product:product-detail", kwargs={"slug": slug})
+            for slug in self.get_top_product_slugs(options)
+        ]
+        paths += [
+            reverse("blog:blog-detail", kwargs={"slug": slug})
+            for slug in Blog.objects.filter(is_published=True)
+            .order_by("-published_at")
+            .values_list("slug", flat=True)[: options["top"]]
+        ]
+        return paths
+
+    def get_page_paths(self, url_name, count, pagination_class, options):
+        pages = min(options["pages"], math.ceil(count / pagination_class.page_size))
+        path = reverse(url_name)
+        return [path] + [f"{path}?page={page}" for page in range(2, pages + 1)]
+
+    def get_top_product_slugs(self, options):
+        if options["access_log"]:
+            return top_products_from_log(options["access_log"], options["top"])
+        return list(
+            Product.objects.order_by("-updated_at").values_list("slug", flat=True)[: options["top"]]
+        )
+
+    def warm(self, factory, paths):
+        results = []
+        try:
+            for path in paths:
+                started = time.perf_counter()
+                outcome = self.render(factory, path)
+                results.append((path, outcome, (time.perf_counter() - started) * 1000))
+        finally:
+            # Each worker thread holds its own connection.
+            connections.close_all()
+        return results
+
+    def render(self, factory, path):
+        request = factory.get(path)
+        request.user = AnonymousUser()
+        match = resolve(request.path_info)
+        try:
+            response = match.func(request, *match.args, **match.kwargs)
+        except Exception as exc:
+            return f"ERROR {exc!r}"
+        if response.status_code != 200:
+            return f"HTTP {response.status_code}"
+        return response.get("X-Cache", "MISS")
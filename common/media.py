@@ -0,0 +1,104 @@
+from collections import Counter
+
+from django.apps import apps
+from django.core.files.storage import default_storage
+from django.db.models import F, FileField
+from django.db.models.functions import Now
+from django.db.models.signals import post_delete, post_save, pre_save
+
+from .models import ContentBlob
+from .storage import ContentAddressedStorage, is_content_addressed
+
+# {model: [file field names]} whose references are counted.
+_tracked = {}
+
+
+def content_addressed_fields():
+    """``{model: [field names]}`` for every file field stored by content hash."""
+    fields = {}
+    for model in apps.get_models():
+        if not model._meta.managed or model._meta.proxy:
+            continue
+        for field in model._meta.concrete_fields:
+            if isinstance(field, FileField) and isinstance(field.storage, ContentAddressedStorage):
+                fields.setdefault(model, []).append(field.name)
+    return fields
+
+
+def blob_size(name):
+    try:
+        return default_storage.size(name)
+    except OSError:
+        return 0
+
+
+def change_references(deltas):
+    """Apply ``{blob name: delta}`` to the reference counts."""
+    deltas = {name: delta for name, delta in deltas.items() if is_content_addressed(name)}
+    new_blobs = [
+        ContentBlob(name=name, size=blob_size(name)) for name, delta in deltas.items() if delta > 0
+    ]
+    if new_blobs:
+        ContentBlob.objects.bulk_create(new_blobs, ignore_conflicts=True)
+    for name, delta in deltas.items():
+        if delta:
+            ContentBlob.objects.filter(name=name).update(
+                ref_count=F("ref_count") + delta, updated_at=Now()
+            )
+
+
+def count_references():
+    """Reference counts recomputed from the model rows."""
+    counts = Counter()
+    for model, field_names in content_addressed_fields().items():
+        for field_name in field_names:
+            names = (
+                model._base_manager.filter(**{f"{field_name}__startswith": "cas/"})
+                .values_list(field_name, flat=True)
+                .iterator()
+            )
+            counts.update(names)
+    return counts
+
+
+def stash_file_names(sender, instance, raw, update_fields, **kwargs):
+    field_names = _tracked[sender]
+    if update_fields is not None:
+        field_names = [name for name in field_names if name in update_fields]
+    if raw or instance.pk is None or not field_names:
+        return
+    instance._previous_file_names = (
+        sender._base_manager.filter(pk=instance.pk).values(*field_names).first() or {}
+    )
+
+
+def track_file_references(sender, instance, raw, created, update_fields, **kwargs):
+    if raw:
+        return
+    previous = instance.__dict__.pop("_previous_file_names", {})
+    deltas = Counter()
+    for field_name in _tracked[sender]:
+        if not created and field_name not in previous:
+            continue
+        old_name = previous.get(field_name) or ""
+        new_name = getattr(instance, field_name).name or ""
+        if old_name != new_name:
+            deltas[new_name] += 1
+            deltas[old_name] -= 1
+    change_references(deltas)
+
+
+def release_file_references(sender, instance, **kwargs):
+    deltas = Counter()
+    for field_name in _tracked[sender]:
+        deltas[getattr(instance, field_name).name or ""] -= 1
+    change_references(deltas)
+
+
+def connect_reference_tracking():
+    _tracked.update(content_addressed_fields())
+    for model in _tracked:
+        uid = f"content-blobs-{model._meta.label_lower}"
+        pre_save.connect(stash_file_names, sender=model, dispatch_uid=f"{uid}-pre-save")
+        post_save.connect(track_file_references, sender=model, dispatch_uid=f"{uid}-save")
+        post_delete.connect(release_file_references, sender=model, dispatch_uid=f"{uid}-delete")
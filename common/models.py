@@ -1,5 +1,7 @@
 from django.db import models
 
+from .richtext import render_rich_text
+
 
 class AuditableModel(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
@@ -7,3 +9,64 @@ class AuditableModel(models.Model):
 
     class Meta:
         abstract = True
+
+
+class ContentBlob(AuditableModel):
+    """
+    A file of the content-addressed media storage and the number of model
+    file fields pointing at it.
+    """
+
+    name = models.CharField(max_length=255, unique=True)
+    size = models.PositiveBigIntegerField(default=0)
+    ref_count = models.IntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["updated_at"],
+                name="content_blob_unreferenced_idx",
+                condition=models.Q(ref_count__lte=0),
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.name} ({self.ref_count} refs)"
+
+
+class RichTextModel(models.Model):
+    """
+    Keeps ``<field>_html``, ``<field>_text`` and ``<field>_word_count``
+    rendered from each raw Quill field named in ``rich_text_fields``.
+    """
+
+    rich_text_fields = ()
+
+    class Meta:
+        abstract = True
+
+    @classmethod
+    def rendered_field_names(cls, name):
+        return (f"{name}_html", f"{name}_text", f"{name}_word_count")
+
+    def render_rich_text(self, names=None):
+        for name in self.rich_text_fields if names is None else names:
+            rendered = render_rich_text(getattr(self, name))
+            html_field, text_field, word_count_field = self.rendered_field_names(name)
+            setattr(self, html_field, rendered.html)
+            setattr(self, text_field, rendered.text)
+            setattr(self, word_count_field, rendered.word_count)
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None:
+            self.render_rich_text()
+        else:
+            # Only render what is saved; other raw fields may be deferred.
+            update_fields = set(update_fields)
+            names = [name for name in self.rich_text_fields if name in update_fields]
+            self.render_rich_text(names)
+            for name in names:
+                update_fields.update(self.rendered_field_names(name))
+            kwargs["update_fields"] = update_fields
+        super().save(*args, **kwargs)
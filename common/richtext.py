@@ -0,0 +1,130 @@
+import re
+from dataclasses import dataclass
+from html.parser import HTMLParser
+
+ALLOWED_TAGS = {
+    "a",
+    "b",
+    "blockquote",
+    "br",
+    "em",
+    "h1",
+    "h2",
+    "h3",
+    "i",
+    "li",
+    "ol",
+    "p",
+    "pre",
+    "s",
+    "span",
+    "strong",
+    "sub",
+    "sup",
+    "u",
+    "ul",
+}
+ALLOWED_ATTRIBUTES = {
+    "*": {"class", "style"},
+    "a": {"href", "target"},
+    "li": {"data-list"},
+}
+ALLOWED_STYLE_PROPERTIES = {"color", "background-color"}
+ALLOWED_URL_SCHEMES = {"http", "https", "mailto", "tel"}
+
+BLOCK_TAGS = {"blockquote", "br", "h1", "h2", "h3", "li", "ol", "p", "pre", "ul"}
+BLOCK_TAG_RE = re.compile(r"\s*(</?(?:%s)\b[^>]*>)\s*" % "|".join(sorted(BLOCK_TAGS)))
+PRE_RE = re.compile(r"(<pre\b[^>]*>.*?</pre>)", re.DOTALL)
+WHITESPACE_RE = re.compile(r"\s+")
+
+
+@dataclass(frozen=True)
+class RenderedRichText:
+    html: str
+    text: str
+    word_count: int
+
+
+def _filter_attribute(tag, attribute, value):
+    if attribute == "class":
+        # Quill formats (alignment, indent, font, size, code) are ql-* classes.
+        classes = [name for name in value.split() if name.startswith("ql-")]
+        return " ".join(classes) or None
+    return value
+
+
+def sanitize_html(html):
+    import nh3
+
+    return nh3.clean(
+        html,
+        tags=ALLOWED_TAGS,
+        attributes=ALLOWED_ATTRIBUTES,
+        attribute_filter=_filter_attribute,
+        filter_style_properties=ALLOWED_STYLE_PROPERTIES,
+        url_schemes=ALLOWED_URL_SCHEMES,
+    )
+
+
+def minify_html(html):
+    parts = PRE_RE.split(html)
+    for index in range(0, len(parts), 2):
+        part = WHITESPACE_RE.sub(" ", parts[index])
+        parts[index] = BLOCK_TAG_RE.sub(r"\1", part)
+    return "".join(parts).strip()
+
+
+class _TextExtractor(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag in BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_endtag(self, tag):
+        if tag in BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_data(self, data):
+        self.parts.append(data)
+
+
+def html_to_text(html):
+    extractor = _TextExtractor()
+    extractor.feed(html)
+    extractor.close()
+    lines = (WHITESPACE_RE.sub(" ", line).strip() for line in "".join(extractor.parts).split("\n"))
+    return "\n".join(line for line in lines if line)
+
+
+def render_rich_text(raw):
+    """Sanitize and minify Quill HTML and extract its plain text."""
+    html = minify_html(sanitize_html(raw or ""))
+    text = html_to_text(html)
+    if not text:
+        # Quill stores an empty editor as "<p><br></p>".
+        html = ""
+    return RenderedRichText(html=html, text=text, word_count=len(text.split()))
+
+
+def backfill_rendered_rich_text(model, names, batch_size=500):
+    """
+    Render ``<name>_html``, ``<name>_text`` and ``<name>_word_count`` for every
+    row of ``model``. Works on the historical models of a migration.
+    """
+    fields = [f"{name}_{suffix}" for name in names for suffix in ("html", "text", "word_count")]
+    batch = []
+    for obj in model.objects.order_by("pk").only("pk", *names).iterator(chunk_size=batch_size):
+        for name in names:
+            rendered = render_rich_text(getattr(obj, name))
+            setattr(obj, f"{name}_html", rendered.html)
+            setattr(obj, f"{name}_text", rendered.text)
+            setattr(obj, f"{name}_word_count", rendered.word_count)
+        batch.append(obj)
+        if len(batch) == batch_size:
+            model.objects.bulk_update(batch, fields)
+            batch = []
+    if batch:
+        model.objects.bulk_update(batch, fields)
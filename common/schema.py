@@ -0,0 +1,36 @@
+import hashlib
+from pathlib import Path
+
+from django.conf import settings
+
+SCHEMA_FORMATS = {
+    "yaml": ("yaml", "application/vnd.oai.openapi"),
+    "json": ("json", "application/vnd.oai.openapi+json"),
+}
+
+
+def schema_path(schema_format):
+    extension, _ = SCHEMA_FORMATS[schema_format]
+    version = settings.SPECTACULAR_SETTINGS["VERSION"]
+    return Path(settings.OPENAPI_SCHEMA_DIR) / f"schema-{version}.{extension}"
+
+
+_artifacts = {}
+
+
+def load_schema_artifact(schema_format):
+    """
+    Return ``(content, etag)`` for the prebuilt schema, or None when it has
+    not been built. The file is re-read only when its mtime changes.
+    """
+    path = schema_path(schema_format)
+    try:
+        mtime = path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+    cached = _artifacts.get(path)
+    if cached is None or cached[0] != mtime:
+        content = path.read_bytes()
+        cached = (mtime, content, hashlib.sha256(content).hexdigest())
+        _artifacts[path] = cached
+    return cached[1], cached[2]
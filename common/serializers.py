@@ -0,0 +1,12 @@
+class SparseFieldsetMixin:
+    """
+    Serializer mixin that keeps only the field names listed in
+    ``context["fields"]`` (all fields when it is missing or None).
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        requested = self.context.get("fields")
+        if requested is not None:
+            for name in set(self.fields) - set(requested):
+                self.fields.pop(name)
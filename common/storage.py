@@ -0,0 +1,69 @@
+import hashlib
+import os
+import posixpath
+import tempfile
+
+from django.core.files.storage import FileSystemStorage
+
+CAS_PREFIX = "cas"
+
+
+def content_addressed_name(digest, original_name):
+    extension = posixpath.splitext(original_name)[1].lower()[:10]
+    return f"{CAS_PREFIX}/{digest[:2]}/{digest[2:4]}/{digest}{extension}"
+
+
+def is_content_addressed(name):
+    return bool(name) and name.startswith(f"{CAS_PREFIX}/")
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    Store each file once under ``cas/aa/bb/<sha256>.<ext>``; ``upload_to``
+    only contributes the extension. Saving content that already exists
+    returns the existing name, so identical uploads share one file and its
+    URL never changes meaning (safe to cache as immutable).
+
+    ``delete`` is a no-op: a file may be referenced by several rows. The
+    ``ContentBlob`` reference counts, kept by ``common.media``, decide when
+    ``dedupe_media --gc`` may remove it.
+    """
+
+    def get_available_name(self, name, max_length=None):
+        # The final name comes from the content; nothing to make unique here.
+        return name
+
+    def _save(self, name, content):
+        directory = self.path(CAS_PREFIX)
+        os.makedirs(directory, exist_ok=True)
+        digest = hashlib.sha256()
+        descriptor, temporary_path = tempfile.mkstemp(dir=directory, prefix=".upload-")
+        try:
+            with os.fdopen(descriptor, "wb") as temporary:
+                if hasattr(content, "seek"):
+                    content.seek(0)
+                for chunk in content.chunks():
+                    digest.update(chunk)
+                    temporary.write(chunk)
+            final_name = content_addressed_name(digest.hexdigest(), name)
+            final_path = self.path(final_name)
+            if os.path.exists(final_path):
+                # Fresh mtime: garbage collection skips recently saved blobs.
+                os.utime(final_path)
+                return final_name
+            os.makedirs(os.path.dirname(final_path), exist_ok=True)
+            if self.file_permissions_mode is not None:
+                os.chmod(temporary_path, self.file_permissions_mode)
+            # A concurrent save of the same content writes identical bytes.
+            os.replace(temporary_path, final_path)
+            return final_name
+        finally:
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
+
+    def delete(self, name):
+        if not is_content_addressed(name):
+            super().delete(name)
+
+    def delete_unreferenced(self, name):
+        super().delete(name)
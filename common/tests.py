@@ -0,0 +1,196 @@
+import tempfile
+import threading
+import time
+
+from datetime import datetime, timezone
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.http import Http404
+from django.test import SimpleTestCase, override_settings
+from rest_framework.renderers import JSONRenderer
+
+from . import cache_backends
+from .cache import CacheEntry, get_or_compute
+from .cache_backends import SEQ_KEY, TieredCache
+from .management.commands.warm_cache import top_products_from_log
+from .renderers import ORJSONRenderer
+
+LOCMEM_CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+# A local-memory cache stands in for the shared server (Redis in production).
+SHARED_CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "shared": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "tiered-tests",
+    },
+}
+
+
+def run_concurrently(count, target):
+    """Start ``count`` threads on ``target`` together; returns their results or exceptions."""
+    barrier = threading.Barrier(count)
+    results = [None] * count
+
+    def run(index):
+        barrier.wait()
+        try:
+            results[index] = target()
+        except Exception as exc:
+            results[index] = exc
+
+    threads = [threading.Thread(target=run, args=(index,)) for index in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+@override_settings(CACHES=LOCMEM_CACHES, API_CACHE_STALE_TIMEOUT=60, API_CACHE_LOCK_TIMEOUT=3)
+class GetOrComputeTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.calls = 0
+        self.calls_lock = threading.Lock()
+
+    def compute(self, value="fresh", error=None):
+        def compute():
+            with self.calls_lock:
+                self.calls += 1
+            time.sleep(0.2)
+            if error is not None:
+                raise error
+            return value
+
+        return compute
+
+    def test_one_recompute_for_concurrent_callers_of_an_expired_entry(self):
+        cache.set("key", CacheEntry("stale", 1, time.time() - 1, 0.1), 60)
+
+        results = run_concurrently(8, lambda: get_or_compute("key", self.compute(), 30, version=1))
+
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(results.count("fresh"), 1)
+        self.assertEqual(results.count("stale"), 7)
+        self.assertEqual(get_or_compute("key", self.compute(), 30, version=1), "fresh")
+        self.assertEqual(self.calls, 1)
+
+    def test_one_compute_for_concurrent_callers_of_a_missing_entry(self):
+        results = run_concurrently(8, lambda: get_or_compute("key", self.compute(), 30, version=1))
+
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(results, ["fresh"] * 8)
+
+    def test_waiters_stop_waiting_when_the_lock_holder_raises(self):
+        started = time.monotonic()
+
+        results = run_concurrently(
+            5, lambda: get_or_compute("key", self.compute(error=Http404()), 30, version=1)
+        )
+
+        # Each waiter takes the released lock in turn instead of sleeping out
+        # API_CACHE_LOCK_TIMEOUT.
+        self.assertLess(time.monotonic() - started, 3)
+        self.assertTrue(all(isinstance(result, Http404) for result in results))
+        self.assertIsNone(cache.get("key:lock"))
+
+
+@override_settings(CACHES=SHARED_CACHES)
+class TieredCacheTests(SimpleTestCase):
+    def setUp(self):
+        from django.core.cache import caches
+
+        self.shared = caches["shared"]
+        self.shared.clear()
+        self.addCleanup(self.shared.clear)
+        # Two processes: separate local tiers over one shared cache.
+        self.first = self.make_process("first")
+        self.second = self.make_process("second")
+
+    def make_process(self, name, **options):
+        cache_backends._local_tiers.pop(name, None)
+        self.addCleanup(cache_backends._local_tiers.pop, name, None)
+        options = {"SHARED_ALIAS": "shared", "SYNC_INTERVAL": 0, **options}
+        return TieredCache(name, {"OPTIONS": options})
+
+    def test_reads_are_served_from_the_local_tier(self):
+        self.shared.set("key", "shared")
+        self.assertEqual(self.first.get("key"), "shared")
+
+        # A write that bypasses the bus is not seen until the local copy expires.
+        self.shared.set("key", "changed")
+        self.assertEqual(self.first.get("key"), "shared")
+        self.assertEqual(self.first.get_many(["key", "missing"]), {"key": "shared"})
+
+    def test_writes_evict_other_processes_through_the_bus(self):
+        self.first.set("key", "old")
+        self.assertEqual(self.second.get("key"), "old")
+
+        self.first.set("key", "new")
+        self.assertEqual(self.second.get("key"), "new")
+        self.first.delete("key")
+        self.assertIsNone(self.second.get("key"))
+
+    def test_a_process_too_far_behind_drops_its_local_tier(self):
+        second = self.make_process("lagging", MAX_BACKLOG=5)
+        self.first.set("unrelated", 0)
+        self.shared.set("key", "old")
+        self.assertEqual(second.get("key"), "old")
+
+        self.shared.set("key", "new")
+        for index in range(6):
+            self.first.set(f"other-{index}", index)
+        self.assertEqual(second.get("key"), "new")
+
+    def test_expired_bus_notices_drop_the_local_tier(self):
+        self.first.set("unrelated", 0)
+        self.shared.set("key", "old")
+        self.assertEqual(self.second.get("key"), "old")
+
+        self.shared.set("key", "new")
+        self.first.set("other", 1)
+        self.shared.delete_many(["tiered:inv:2"])
+        self.assertEqual(self.second.get("key"), "new")
+
+    def test_short_timeouts_bound_the_local_copy(self):
+        self.first.set("key", "value", timeout=0.2)
+        self.assertEqual(self.second.get("key"), "value")
+
+        time.sleep(0.3)
+        self.assertIsNone(self.second.get("key"))
+
+    def test_lock_keys_skip_the_local_tier_and_the_bus(self):
+        self.first.set("unrelated", 0)
+        seq = self.shared.get(SEQ_KEY)
+
+        self.assertTrue(self.first.add("key:lock", 1, 10))
+        self.assertEqual(self.second.get("key:lock"), 1)
+        self.first.delete("key:lock")
+
+        self.assertIsNone(self.second.get("key:lock"))
+        self.assertEqual(self.shared.get(SEQ_KEY), seq)
+
+
+class ORJSONRendererTests(SimpleTestCase):
+    def test_output_matches_the_json_renderer(self):
+        data = {
+            "title": "Caf\u00e9 \u2028line\u2029 <b>&</b> \U0001f600",
+            "price": Decimal("9.90"),
+            "published_at": datetime(2026, 1, 2, 3, 4, 5, 678000, tzinfo=timezone.utc),
+            "items": [1, 2.5, None, True],
+            "nested": {"empty": [], "text": "quote \" backslash \\"},
+        }
+
+        self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
+
+
+class WarmCacheTests(SimpleTestCase):
+    def test_access_log_ranking_skips_fixed_routes(self):
+        line = '1.2.3.4 - - [19/Oct/2026:10:00:00 +0000] "GET /api/products/{}/ HTTP/1.1" 200 9\n'
+        paths = ["lamp", "typeahead", "lamp", "categories", "typeahead", "chair", "batch"]
+        with tempfile.NamedTemporaryFile("w", suffix=".log") as log:
+            log.writelines(line.format(path) for path in paths)
+            log.flush()
+
+            self.assertEqual(top_products_from_log(log.name, 10), ["lamp", "chair"])
@@ -0,0 +1,58 @@
+from functools import cache
+
+from django.conf import settings
+from django.http import Http404, HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control, quote_etag
+from django.views.decorators.http import require_safe
+
+from .schema import SCHEMA_FORMATS, load_schema_artifact
+
+
+def _requested_schema_format(request):
+    requested = request.GET.get("format")
+    if requested in SCHEMA_FORMATS:
+        return requested
+    return "json" if "json" in request.headers.get("Accept", "") else "yaml"
+
+
+@require_safe
+def openapi_schema_view(request):
+    """
+    Serve the OpenAPI schema written by ``build_openapi_schema``. In DEBUG
+    the schema is generated live when no artifact has been built.
+    """
+    schema_format = _requested_schema_format(request)
+    artifact = load_schema_artifact(schema_format)
+    if artifact is None:
+        if settings.DEBUG:
+            from drf_spectacular.views import SpectacularAPIView
+
+            return SpectacularAPIView.as_view()(request)
+        raise Http404("OpenAPI schema has not been built.")
+
+    content, etag = artifact
+    etag = quote_etag(etag)
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        _, content_type = SCHEMA_FORMATS[schema_format]
+        response = HttpResponse(content, content_type=content_type)
+    response["ETag"] = etag
+    patch_cache_control(response, public=True, max_age=settings.OPENAPI_SCHEMA_MAX_AGE)
+    return response
+
+
+# drf-spectacular's views pull in its generator and plumbing modules, so the
+# documentation pages import them on first use rather than with the URLconf.
+@cache
+def _spectacular_view(name):
+    from drf_spectacular import views
+
+    return getattr(views, name).as_view(url_name="schema")
+
+
+def swagger_ui_view(request, *args, **kwargs):
+    return _spectacular_view("SpectacularSwaggerView")(request, *args, **kwargs)
+
+
+def redoc_view(request, *args, **kwargs):
+    return _spectacular_view("SpectacularRedocView")(request, *args, **kwargs)
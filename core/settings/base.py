@@ -24,6 +24,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "rest_framework",
     "drf_spectacular",
     "django_filters",
@@ -32,6 +33,9 @@ INSTALLED_APPS = [
     "blog",
     "product",
     "contact",
+    "diagnostics",
+    "jobs",
+    "changefeed",
 ]
 
 MIDDLEWARE = [
@@ -43,6 +47,8 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "diagnostics.middleware.SlowQueryMiddleware",
+    "diagnostics.middleware.RequestProfilerMiddleware",
 ]
 
 ROOT_URLCONF = "core.urls"
@@ -76,6 +82,33 @@ if not database_url:
 
 DATABASES = {"default": env.db("DATABASE_URL", default=database_url)}
 
+# Hot keys are served from a per-process LRU in front of the shared cache;
+# writes are broadcast to the other processes through the shared cache.
+CACHES = {
+    "shared": env.cache("CACHE_URL", default="locmemcache://"),
+    "default": {
+        "BACKEND": "common.cache_backends.TieredCache",
+        "LOCATION": "tiered",
+        "OPTIONS": {
+            "SHARED_ALIAS": "shared",
+            "MAX_ENTRIES": env.int("LOCAL_CACHE_MAX_ENTRIES", default=2000),
+            "LOCAL_TIMEOUT": env.int("LOCAL_CACHE_TIMEOUT", default=30),
+            "SYNC_INTERVAL": env.float("LOCAL_CACHE_SYNC_INTERVAL", default=1.0),
+        },
+    },
+}
+# Seconds public catalog and blog responses stay cached; writes invalidate them sooner.
+API_CACHE_TIMEOUT = env.int("API_CACHE_TIMEOUT", default=600)
+# Expired responses are kept this long to serve while one worker recomputes them,
+# or while the database is unavailable.
+API_CACHE_STALE_TIMEOUT = env.int("API_CACHE_STALE_TIMEOUT", default=3600)
+API_CACHE_LOCK_TIMEOUT = env.int("API_CACHE_LOCK_TIMEOUT", default=10)
+# Typeahead results for queries up to this many characters are cached per prefix.
+TYPEAHEAD_CACHE_PREFIX_LENGTH = env.int("TYPEAHEAD_CACHE_PREFIX_LENGTH", default=3)
+TYPEAHEAD_CACHE_TIMEOUT = env.int("TYPEAHEAD_CACHE_TIMEOUT", default=300)
+# Host the cache is warmed for (see `manage.py warm_cache`); cached payloads hold absolute URLs.
+CACHE_WARM_HOST = env("CACHE_WARM_HOST", default="localhost")
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         "NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator",
@@ -99,11 +132,18 @@ USE_TZ = True
 STATIC_URL = "static/"
 STATIC_ROOT = BASE_DIR / "staticfiles"
 STATICFILES_DIRS = [BASE_DIR / "static"]
-STATICFILES_STORAGE = "whitenoise.storage.CompressedManifestStaticFilesStorage"
 
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
+STORAGES = {
+    # Uploads are stored once per content hash under MEDIA_ROOT/cas/.
+    "default": {"BACKEND": "common.storage.ContentAddressedStorage"},
+    "staticfiles": {"BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage"},
+}
+# Unreferenced content blobs are kept this long before `dedupe_media --gc` removes them.
+MEDIA_GC_GRACE_HOURS = 24
+
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 AUTH_USER_MODEL = "users.CustomUser"
@@ -116,6 +156,17 @@ REST_FRAMEWORK = {
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticated",
     ],
+    "DEFAULT_RENDERER_CLASSES": [
+        "common.renderers.ORJSONRenderer",
+        "common.renderers.MessagePackRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "common.parsers.ORJSONParser",
+        "common.parsers.MessagePackParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
 }
 
@@ -125,3 +176,64 @@ SPECTACULAR_SETTINGS = {
     "VERSION": "1.0.0",
     "SERVE_INCLUDE_SCHEMA": False,
 }
+
+# Prebuilt schema served at /api/schema/ (see `manage.py build_openapi_schema`).
+OPENAPI_SCHEMA_DIR = BASE_DIR / "openapi"
+OPENAPI_SCHEMA_MAX_AGE = env.int("OPENAPI_SCHEMA_MAX_AGE", default=3600)
+
+# Background jobs (`manage.py run_jobs`).
+JOBS_WORKER_PROCESSES = env.int("JOBS_WORKER_PROCESSES", default=1)
+JOBS_WORKER_THREADS = env.int("JOBS_WORKER_THREADS", default=4)
+JOBS_POLL_INTERVAL = env.float("JOBS_POLL_INTERVAL", default=1.0)
+JOBS_RETRY_BACKOFF_SECONDS = 10
+JOBS_RETRY_BACKOFF_MAX_SECONDS = 3600
+# Running jobs without a heartbeat for this long are presumed dead and retried.
+JOBS_LOCK_TIMEOUT_SECONDS = env.int("JOBS_LOCK_TIMEOUT_SECONDS", default=900)
+JOBS_KEEP_SUCCEEDED_HOURS = 24
+
+PRODUCT_IMAGE_MAX_DIMENSION = env.int("PRODUCT_IMAGE_MAX_DIMENSION", default=2400)
+
+# Resumable product uploads (`/api/products/<slug>/uploads/`).
+# Partial files live outside MEDIA_ROOT so they are never served.
+PRODUCT_UPLOAD_TEMP_DIR = env("PRODUCT_UPLOAD_TEMP_DIR", default=str(BASE_DIR / "uploads"))
+PRODUCT_UPLOAD_MAX_SIZE = {
+    "hero_video": env.int("PRODUCT_UPLOAD_MAX_VIDEO_SIZE", default=2 * 1024**3),
+    "gallery_image": env.int("PRODUCT_UPLOAD_MAX_IMAGE_SIZE", default=25 * 1024**2),
+}
+PRODUCT_UPLOAD_EXTENSIONS = {
+    "hero_video": ("mp4", "webm", "mov"),
+    "gallery_image": ("jpg", "jpeg", "png", "webp"),
+}
+PRODUCT_UPLOAD_MAX_CHUNK_SIZE = 16 * 1024**2
+PRODUCT_UPLOAD_EXPIRY_HOURS = 24
+
+# `manage.py build_sitemaps` writes SITEMAP_ROOT/sitemap.xml (served as /sitemap.xml)
+# and one shard per SITEMAP_SHARD_SIZE primary keys (served under SITEMAP_URL).
+SITEMAP_BASE_URL = env("SITEMAP_BASE_URL", default="")
+SITEMAP_ROOT = env("SITEMAP_ROOT", default=str(BASE_DIR / "sitemaps"))
+SITEMAP_URL = "/sitemaps/"
+SITEMAP_SHARD_SIZE = 50000
+SITEMAP_PATHS = {
+    "product": "/products/{slug}/",
+    "category": "/categories/{slug}/",
+    "blog": "/blog/{slug}/",
+}
+
+# /api/changes/ page sizes.
+CHANGEFEED_PAGE_SIZE = 200
+CHANGEFEED_MAX_PAGE_SIZE = 1000
+
+# Staff add ?_profile=1 or an X-Profile header to store a RequestProfile.
+PROFILER_QUERY_PARAM = "_profile"
+PROFILER_HEADER = "X-Profile"
+PROFILER_EXPLAIN_LIMIT = env.int("PROFILER_EXPLAIN_LIMIT", default=5)
+PROFILER_STATS_LIMIT = env.int("PROFILER_STATS_LIMIT", default=40)
+
+# Statements at least this slow are aggregated per fingerprint (admin: Slow query
+# fingerprints). SLOW_QUERY_THRESHOLD_MS=0 disables it.
+SLOW_QUERY_THRESHOLD_MS = env.float("SLOW_QUERY_THRESHOLD_MS", default=200) or None
+SLOW_QUERY_EXPLAIN_RATE = env.float("SLOW_QUERY_EXPLAIN_RATE", default=0.1)
+SLOW_QUERY_SAMPLES_KEPT = env.int("SLOW_QUERY_SAMPLES_KEPT", default=20)
+
+# `manage.py profile_startup --check` fails above this (django.setup() + URLconf).
+STARTUP_TIME_BUDGET_MS = env.int("STARTUP_TIME_BUDGET_MS", default=1500)
@@ -18,11 +18,8 @@ from django.conf import settings
 from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import include, path
-from drf_spectacular.views import (
-    SpectacularAPIView,
-    SpectacularRedocView,
-    SpectacularSwaggerView,
-)
+
+from common.views import openapi_schema_view, redoc_view, swagger_ui_view
 
 urlpatterns = [
     path("admin/", admin.site.urls),
@@ -30,17 +27,10 @@ urlpatterns = [
     path("api/blogs/", include("blog.urls")),
     path("api/products/", include("product.urls")),
     path("api/contact/", include("contact.urls")),
-    path("api/schema/", SpectacularAPIView.as_view(), name="schema"),
-    path(
-        "api/docs/",
-        SpectacularSwaggerView.as_view(url_name="schema"),
-        name="swagger-ui",
-    ),
-    path(
-        "api/redoc/",
-        SpectacularRedocView.as_view(url_name="schema"),
-        name="redoc",
-    ),
+    path("api/changes/", include("changefeed.urls")),
+    path("api/schema/", openapi_schema_view, name="schema"),
+    path("api/docs/", swagger_ui_view, name="swagger-ui"),
+    path("api/redoc/", redoc_view, name="redoc"),
     
 ]
 
@@ -0,0 +1,137 @@
+from django.contrib import admin
+from django.utils.html import format_html, format_html_join
+
+from .models import RequestProfile, SlowQueryFingerprint, SlowQuerySample
+
+
+@admin.register(RequestProfile)
+class RequestProfileAdmin(admin.ModelAdmin):
+    list_display = (
+        "created_at",
+        "method",
+        "path",
+        "view_name",
+        "status_code",
+        "duration_ms",
+        "sql_count",
+        "sql_ms",
+        "user",
+    )
+    list_filter = ("method", "status_code", "view_name")
+    search_fields = ("path", "view_name")
+    date_hierarchy = "created_at"
+    fields = (
+        "created_at",
+        "user",
+        "method",
+        "path",
+        "view_name",
+        "status_code",
+        "duration_ms",
+        "sql_count",
+        "sql_ms",
+        "breakdown_table",
+        "queries_report",
+        "profile_report",
+    )
+    readonly_fields = fields
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    @admin.display(description="Breakdown (ms)")
+    def breakdown_table(self, obj):
+        return format_html_join(
+            "",
+            "<div><strong>{}</strong>: {}</div>",
+            obj.breakdown.items(),
+        )
+
+    @admin.display(description="SQL")
+    def queries_report(self, obj):
+        return format_html_join(
+            "",
+            "<div style='margin-bottom:1em'><strong>{} ms</strong> ({})"
+            "<pre style='white-space:pre-wrap'>{}\n{}</pre>{}</div>",
+            (
+                (
+                    query["ms"],
+                    query["phase"],
+                    query["sql"],
+                    query["params"],
+                    format_html("<pre>{}</pre>", query["explain"]) if query["explain"] else "",
+                )
+                for query in obj.queries
+            ),
+        )
+
+    @admin.display(description="cProfile")
+    def profile_report(self, obj):
+        return format_html("<pre>{}</pre>", obj.profile)
+
+
+class SlowQuerySampleInline(admin.StackedInline):
+    model = SlowQuerySample
+    extra = 0
+    fields = ("created_at", "duration_ms", "path", "sql", "params", "explain_plan")
+    readonly_fields = fields
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    @admin.display(description="EXPLAIN")
+    def explain_plan(self, obj):
+        return format_html("<pre>{}</pre>", obj.explain) if obj.explain else "-"
+
+
+@admin.register(SlowQueryFingerprint)
+class SlowQueryFingerprintAdmin(admin.ModelAdmin):
+    list_display = (
+        "short_sql",
+        "view_name",
+        "calls",
+        "total_ms",
+        "mean",
+        "max_ms",
+        "last_seen_at",
+    )
+    list_filter = ("view_name",)
+    search_fields = ("normalized_sql", "view_name", "digest")
+    date_hierarchy = "last_seen_at"
+    fields = (
+        "digest",
+        "view_name",
+        "sql",
+        "calls",
+        "total_ms",
+        "mean",
+        "max_ms",
+        "created_at",
+        "last_seen_at",
+    )
+    readonly_fields = fields
+    inlines = (SlowQuerySampleInline,)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    @admin.display(description="SQL")
+    def short_sql(self, obj):
+        return obj.normalized_sql[:120]
+
+    @admin.display(description="SQL")
+    def sql(self, obj):
+        return format_html("<pre style='white-space:pre-wrap'>{}</pre>", obj.normalized_sql)
+
+    @admin.display(description="Mean ms")
+    def mean(self, obj):
+        return round(obj.mean_ms, 1)
@@ -0,0 +1,24 @@
+EXPLAINABLE_PREFIXES = ("select", "with")
+
+
+def is_explainable(sql):
+    statement = sql.lstrip().lower()
+    return statement.startswith(EXPLAINABLE_PREFIXES) and " for update" not in statement
+
+
+def explain_sql(connection, sql, params, analyze=False):
+    """
+    Return the plan for ``sql`` as text, or ``None`` for statements that are
+    not plain reads. With ``analyze`` on PostgreSQL the statement is executed
+    (``EXPLAIN (ANALYZE, BUFFERS)``).
+    """
+    if not is_explainable(sql):
+        return None
+    options = {}
+    if analyze and connection.vendor == "postgresql":
+        options = {"analyze": True, "buffers": True}
+    prefix = connection.ops.explain_query_prefix(**options)
+    with connection.cursor() as cursor:
+        cursor.execute(f"{prefix} {sql}", params)
+        rows = cursor.fetchall()
+    return "\n".join(" ".join(str(value) for value in row) for row in rows)
@@ -0,0 +1,240 @@
+import cProfile
+import io
+import pstats
+import sys
+import time
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+from django.urls import Resolver404, resolve
+from rest_framework.authentication import SessionAuthentication
+from rest_framework.exceptions import APIException
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.serializers import BaseSerializer
+
+from .explain import explain_sql, is_explainable
+from .models import RequestProfile
+from .slow_queries import SlowQueryRecorder, save_slow_queries
+
+PROFILE_FLAG_VALUES = {"1", "true", "yes", "on"}
+
+# Entry points of the phases reported besides SQL; nested calls are counted once.
+PHASE_CODES = {
+    "serializer": BaseSerializer.data.fget.__code__,
+    "renderer": Response.rendered_content.fget.__code__,
+}
+
+
+def _stats_key(code):
+    return (code.co_filename, code.co_firstlineno, code.co_name)
+
+
+def current_phase():
+    frame = sys._getframe(2)
+    while frame is not None:
+        for phase, code in PHASE_CODES.items():
+            if frame.f_code is code:
+                return phase
+        frame = frame.f_back
+    return "view"
+
+
+def view_label(request):
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return ""
+    view = getattr(match.func, "view_class", match.func)
+    return f"{view.__module__}.{view.__qualname__}"
+
+
+@dataclass
+class RecordedQuery:
+    sql: str
+    params: object
+    many: bool
+    ms: float
+    phase: str
+
+
+class QueryRecorder:
+    """``execute_wrapper`` that records every statement with its timing and phase."""
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append(
+                RecordedQuery(
+                    sql=sql,
+                    params=params,
+                    many=many,
+                    ms=(time.perf_counter() - started) * 1000,
+                    phase=current_phase(),
+                )
+            )
+
+
+class RequestProfilerMiddleware:
+    """
+    Profile a request when a staff user adds ``?_profile=1`` or the
+    ``X-Profile`` header (see PROFILER_QUERY_PARAM / PROFILER_HEADER), and
+    store the report as a ``RequestProfile``. The response carries its id in
+    ``X-Profile-Id``. Other requests pass straight through.
+
+    Must come after AuthenticationMiddleware. Users without a session are
+    looked up with the DRF authenticators of the view (e.g. Basic auth).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        user = self.profiling_user(request)
+        if user is None:
+            return self.get_response(request)
+        return self.profile(request, user)
+
+    def profiling_user(self, request):
+        """The staff user who asked for a profile of this request, or None."""
+        param = settings.PROFILER_QUERY_PARAM
+        flag = None
+        if param in request.META.get("QUERY_STRING", ""):
+            flag = request.GET.get(param)
+        if flag is None:
+            flag = request.headers.get(settings.PROFILER_HEADER)
+        if flag is None or flag.strip().lower() not in PROFILE_FLAG_VALUES:
+            return None
+        user = getattr(request, "user", None)
+        if user is None or not user.is_authenticated:
+            user = self.api_user(request)
+        if user is None or not (user.is_active and user.is_staff):
+            return None
+        return user
+
+    def api_user(self, request):
+        try:
+            match = resolve(request.path_info)
+        except Resolver404:
+            return None
+        view_class = getattr(match.func, "cls", None)
+        if view_class is None:
+            return None
+        authentication_classes = match.func.initkwargs.get(
+            "authentication_classes", view_class.authentication_classes
+        )
+        api_request = Request(request)
+        for authentication_class in authentication_classes:
+            # The session user is AuthenticationMiddleware's request.user.
+            if issubclass(authentication_class, SessionAuthentication):
+                continue
+            try:
+                result = authentication_class().authenticate(api_request)
+            except APIException:
+                return None
+            if result is not None:
+                return result[0]
+        return None
+
+    def profile(self, request, user):
+        recorder = QueryRecorder()
+        profiler = cProfile.Profile()
+        started = time.perf_counter()
+        with connection.execute_wrapper(recorder):
+            try:
+                profiler.enable()
+            except ValueError:
+                # Another profiler is active (e.g. a concurrent profiled request).
+                profiler = None
+            try:
+                response = self.get_response(request)
+            finally:
+                if profiler is not None:
+                    profiler.disable()
+        duration_ms = (time.perf_counter() - started) * 1000
+
+        profile = RequestProfile.objects.create(
+            user=user,
+            method=request.method,
+            path=request.get_full_path(),
+            view_name=view_label(request),
+            status_code=response.status_code,
+            duration_ms=duration_ms,
+            sql_count=len(recorder.queries),
+            sql_ms=sum(query.ms for query in recorder.queries),
+            breakdown=self.breakdown(profiler, recorder.queries, duration_ms),
+            queries=self.query_report(recorder.queries),
+            profile=self.profile_summary(profiler),
+        )
+        response["X-Profile-Id"] = str(profile.pk)
+        return response
+
+    def breakdown(self, profiler, queries, duration_ms):
+        sql_ms = sum(query.ms for query in queries)
+        phases = {"sql": sql_ms}
+        if profiler is not None:
+            stats = pstats.Stats(profiler).stats
+            for phase, code in PHASE_CODES.items():
+                inclusive_ms = stats.get(_stats_key(code), (0, 0, 0, 0))[3] * 1000
+                # SQL issued while serializing (lazy relations) is reported as SQL.
+                phase_sql_ms = sum(query.ms for query in queries if query.phase == phase)
+                phases[phase] = max(inclusive_ms - phase_sql_ms, 0)
+        phases["other"] = max(duration_ms - sum(phases.values()), 0)
+        return {phase: round(ms, 2) for phase, ms in phases.items()}
+
+    def query_report(self, queries):
+        slowest = sorted(
+            (query for query in queries if not query.many and is_explainable(query.sql)),
+            key=lambda query: -query.ms,
+        )[: settings.PROFILER_EXPLAIN_LIMIT]
+        plans = {}
+        for query in slowest:
+            try:
+                plans[id(query)] = explain_sql(connection, query.sql, query.params, analyze=True)
+            except Exception as exc:
+                plans[id(query)] = f"EXPLAIN failed: {exc}"
+        return [
+            {
+                "sql": query.sql,
+                "params": repr(query.params),
+                "ms": round(query.ms, 3),
+                "phase": query.phase,
+                "explain": plans.get(id(query)),
+            }
+            for query in queries
+        ]
+
+    def profile_summary(self, profiler):
+        if profiler is None:
+            return "cProfile was unavailable: another profiler was active."
+        stream = io.StringIO()
+        stats = pstats.Stats(profiler, stream=stream)
+        stats.strip_dirs().sort_stats("cumulative").print_stats(settings.PROFILER_STATS_LIMIT)
+        return stream.getvalue()
+
+
+class SlowQueryMiddleware:
+    """
+    Record statements slower than SLOW_QUERY_THRESHOLD_MS with the view that
+    issued them, aggregated per SQL fingerprint (see the admin). The rows are
+    written after the response is built. Disabled when the threshold is unset.
+    """
+
+    def __init__(self, get_response):
+        if settings.SLOW_QUERY_THRESHOLD_MS is None:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        recorder = SlowQueryRecorder(settings.SLOW_QUERY_THRESHOLD_MS)
+        with connection.execute_wrapper(recorder):
+            response = self.get_response(request)
+        if recorder.queries:
+            save_slow_queries(recorder.queries, view_label(request), request.get_full_path())
+        return response
@@ -0,0 +1,77 @@
+from django.conf import settings
+from django.db import models
+
+from common.models import AuditableModel
+
+
+class RequestProfile(AuditableModel):
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="request_profiles",
+    )
+    method = models.CharField(max_length=10)
+    path = models.TextField(help_text="Path with query string.")
+    view_name = models.CharField(max_length=255, blank=True)
+    status_code = models.PositiveSmallIntegerField()
+    duration_ms = models.FloatField()
+    sql_count = models.PositiveIntegerField(default=0)
+    sql_ms = models.FloatField(default=0)
+    breakdown = models.JSONField(default=dict, help_text="Milliseconds per phase.")
+    queries = models.JSONField(
+        default=list,
+        help_text="Every SQL statement with its timing; EXPLAIN for the slowest.",
+    )
+    profile = models.TextField(blank=True, help_text="cProfile summary.")
+
+    class Meta:
+        ordering = ["-created_at"]
+
+    def __str__(self) -> str:
+        return f"{self.method} {self.path} ({self.duration_ms:.0f} ms)"
+
+
+class SlowQueryFingerprint(AuditableModel):
+    """Aggregate of the slow statements sharing a normalized SQL shape and view."""
+
+    digest = models.CharField(max_length=40)
+    view_name = models.CharField(max_length=255, blank=True)
+    normalized_sql = models.TextField()
+    calls = models.PositiveIntegerField(default=0)
+    total_ms = models.FloatField(default=0)
+    max_ms = models.FloatField(default=0)
+    last_seen_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-total_ms"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["digest", "view_name"], name="slow_query_digest_view_uniq"
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.view_name or '-'}: {self.normalized_sql[:80]}"
+
+    @property
+    def mean_ms(self):
+        return self.total_ms / self.calls if self.calls else 0
+
+
+class SlowQuerySample(AuditableModel):
+    fingerprint = models.ForeignKey(
+        SlowQueryFingerprint, on_delete=models.CASCADE, related_name="samples"
+    )
+    path = models.TextField(blank=True)
+    sql = models.TextField()
+    params = models.TextField(blank=True)
+    duration_ms = models.FloatField()
+    explain = models.TextField(blank=True, help_text="Plain EXPLAIN, for sampled statements.")
+
+    class Meta:
+        ordering = ["-created_at", "-id"]
+
+    def __str__(self) -> str:
+        return f"{self.duration_ms:.0f} ms"
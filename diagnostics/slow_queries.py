@@ -0,0 +1,111 @@
+import hashlib
+import logging
+import random
+import re
+import time
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.db import DatabaseError, connection
+from django.db.models import F
+from django.db.models.functions import Greatest, Now
+
+from .explain import explain_sql
+from .models import SlowQueryFingerprint, SlowQuerySample
+
+logger = logging.getLogger(__name__)
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w\"])-?\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_sql(sql):
+    """
+    Reduce ``sql`` to its shape: literals and placeholders become ``?`` and
+    ``IN`` lists of any length collapse to ``(...)``, so the same query with
+    different arguments shares a fingerprint.
+    """
+    sql = _STRING_LITERAL.sub("?", sql)
+    sql = sql.replace("%s", "?")
+    sql = _NUMBER_LITERAL.sub("?", sql)
+    sql = _PLACEHOLDER_LIST.sub("(...)", sql)
+    return _WHITESPACE.sub(" ", sql).strip()
+
+
+def fingerprint_sql(normalized_sql):
+    return hashlib.sha1(normalized_sql.encode()).hexdigest()
+
+
+@dataclass
+class SlowQuery:
+    sql: str
+    params: object
+    many: bool
+    ms: float
+
+
+class SlowQueryRecorder:
+    """``execute_wrapper`` that keeps the statements slower than ``threshold_ms``."""
+
+    def __init__(self, threshold_ms):
+        self.threshold_ms = threshold_ms
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            ms = (time.perf_counter() - started) * 1000
+            # EXPLAINs issued by the profiler would only fingerprint themselves.
+            if ms >= self.threshold_ms and sql.lstrip()[:7].lower() != "explain":
+                self.queries.append(SlowQuery(sql, params, many, ms))
+
+
+def save_slow_queries(queries, view_name, path):
+    for query in queries:
+        try:
+            save_slow_query(query, view_name, path)
+        except DatabaseError:
+            logger.warning("Could not record a slow query for %s.", view_name, exc_info=True)
+
+
+def save_slow_query(query, view_name, path):
+    normalized = normalize_sql(query.sql)
+    fingerprint, created = SlowQueryFingerprint.objects.get_or_create(
+        digest=fingerprint_sql(normalized),
+        view_name=view_name,
+        defaults={"normalized_sql": normalized},
+    )
+    SlowQueryFingerprint.objects.filter(pk=fingerprint.pk).update(
+        calls=F("calls") + 1,
+        total_ms=F("total_ms") + query.ms,
+        max_ms=Greatest(F("max_ms"), query.ms),
+        last_seen_at=Now(),
+    )
+
+    explain = ""
+    # Always explain a new shape, then sample: a plain EXPLAIN still costs a
+    # round trip and planning time on every slow statement.
+    if not query.many and (created or random.random() < settings.SLOW_QUERY_EXPLAIN_RATE):
+        try:
+            explain = explain_sql(connection, query.sql, query.params) or ""
+        except DatabaseError as exc:
+            explain = f"EXPLAIN failed: {exc}"
+    SlowQuerySample.objects.create(
+        fingerprint=fingerprint,
+        path=path,
+        sql=query.sql,
+        params=repr(query.params),
+        duration_ms=query.ms,
+        explain=explain,
+    )
+
+    # Ring buffer: keep only the newest samples per fingerprint.
+    stale = list(
+        fingerprint.samples.values_list("pk", flat=True)[settings.SLOW_QUERY_SAMPLES_KEPT :]
+    )
+    if stale:
+        SlowQuerySample.objects.filter(pk__in=stale).delete()
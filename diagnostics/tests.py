@@ -0,0 +1,55 @@
+import base64
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.test import RequestFactory, TestCase
+
+from .middleware import RequestProfilerMiddleware
+
+
+def basic_auth(username, password):
+    credentials = base64.b64encode(f"{username}:{password}".encode()).decode()
+    return {"HTTP_AUTHORIZATION": f"Basic {credentials}"}
+
+
+class ProfilingUserTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        users = get_user_model().objects
+        cls.staff = users.create_user("staff", "staff@example.com", "secret", is_staff=True)
+        users.create_user("member", "member@example.com", "secret")
+
+    def setUp(self):
+        self.middleware = RequestProfilerMiddleware(lambda request: None)
+
+    def profiling_user(self, path, user=None, **headers):
+        request = RequestFactory().get(path, **headers)
+        request.user = user or AnonymousUser()
+        return self.middleware.profiling_user(request)
+
+    def test_session_staff_user(self):
+        self.assertEqual(self.profiling_user("/api/products/?_profile=1", self.staff), self.staff)
+        self.assertEqual(
+            self.profiling_user("/api/products/", self.staff, HTTP_X_PROFILE="1"), self.staff
+        )
+
+    def test_basic_auth_staff_user(self):
+        user = self.profiling_user("/api/products/?_profile=1", **basic_auth("staff", "secret"))
+
+        self.assertEqual(user, self.staff)
+
+    def test_flag_must_be_on(self):
+        self.assertIsNone(self.profiling_user("/api/products/?_profile=0", self.staff))
+        self.assertIsNone(self.profiling_user("/api/products/", self.staff, HTTP_X_PROFILE="0"))
+        self.assertIsNone(self.profiling_user("/api/products/", self.staff))
+
+    def test_other_users_are_not_profiled(self):
+        self.assertIsNone(
+            self.profiling_user("/api/products/?_profile=1", **basic_auth("member", "secret"))
+        )
+        self.assertIsNone(
+            self.profiling_user("/api/products/?_profile=1", **basic_auth("staff", "wrong"))
+        )
+        self.assertIsNone(
+            self.profiling_user("/missing/?_profile=1", **basic_auth("staff", "secret"))
+        )
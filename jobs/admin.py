@@ -0,0 +1,43 @@
+from django.contrib import admin, messages
+from django.utils import timezone
+
+from .models import Job
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = (
+        "id",
+        "task",
+        "status",
+        "priority",
+        "attempts",
+        "max_attempts",
+        "run_at",
+        "locked_by",
+        "finished_at",
+    )
+    list_filter = ("status", "task")
+    search_fields = ("task", "dedupe_key", "locked_by")
+    date_hierarchy = "created_at"
+    readonly_fields = (
+        "created_at",
+        "updated_at",
+        "attempts",
+        "locked_at",
+        "locked_by",
+        "finished_at",
+        "last_error",
+    )
+    actions = ("retry_now",)
+
+    @admin.action(description="Retry selected failed jobs now")
+    def retry_now(self, request, queryset):
+        updated = queryset.filter(status=Job.Status.FAILED).update(
+            status=Job.Status.QUEUED,
+            run_at=timezone.now(),
+            attempts=0,
+            finished_at=None,
+            updated_at=timezone.now(),
+        )
+        self.message_user(request, f"Requeued {updated} jobs.", messages.SUCCESS)
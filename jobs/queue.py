@@ -0,0 +1,170 @@
+import random
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Count, Min, Q
+from django.utils import timezone
+
+from .models import Job
+from .registry import get_task
+
+
+def enqueue(task, payload=None, priority=None, dedupe_key=None, run_at=None, max_attempts=None):
+    """
+    Queue ``task`` (a registered task or its name). Inside a transaction the
+    job becomes visible to workers when it commits. With ``dedupe_key`` the
+    job is dropped if one with the same key is still queued.
+    """
+    task = get_task(task) if isinstance(task, str) else task
+    job = Job(
+        task=task.name,
+        payload=payload or {},
+        priority=task.priority if priority is None else priority,
+        dedupe_key=dedupe_key,
+        run_at=run_at or timezone.now(),
+        max_attempts=task.max_attempts if max_attempts is None else max_attempts,
+    )
+    # ON CONFLICT DO NOTHING also covers the partial unique dedupe index.
+    Job.objects.bulk_create([job], ignore_conflicts=dedupe_key is not None)
+
+
+def enqueue_on_commit(task, payload=None, **options):
+    """Like ``enqueue``, but only once the current transaction commits."""
+    transaction.on_commit(lambda: enqueue(task, payload, **options))
+
+
+def claim_job(worker_id):
+    """Lock the next ready job for ``worker_id`` and mark it running, or return ``None``."""
+    now = timezone.now()
+    with transaction.atomic():
+        job = (
+            Job.objects.select_for_update(skip_locked=True)
+            .filter(status=Job.Status.QUEUED, run_at__lte=now)
+            .order_by("-priority", "run_at", "id")
+            .first()
+        )
+        if job is None:
+            return None
+        job.status = Job.Status.RUNNING
+        job.locked_at = now
+        job.locked_by = worker_id
+        job.attempts += 1
+        job.save(update_fields=["status", "locked_at", "locked_by", "attempts", "updated_at"])
+    return job
+
+
+def claimed(job):
+    """
+    The job's row while it is still this run's: a requeued stale job is
+    claimed again under another worker id or attempt, and updates through
+    this queryset then match nothing.
+    """
+    return Job.objects.filter(
+        pk=job.pk,
+        status=Job.Status.RUNNING,
+        locked_by=job.locked_by,
+        attempts=job.attempts,
+    )
+
+
+def heartbeat(job):
+    """Refresh ``locked_at`` so a long-running job is not requeued as stale."""
+    return bool(claimed(job).update(locked_at=timezone.now()))
+
+
+def complete_job(job):
+    """Mark the run succeeded; ``False`` when it was requeued meanwhile."""
+    now = timezone.now()
+    completed = claimed(job).update(
+        status=Job.Status.SUCCEEDED,
+        finished_at=now,
+        locked_at=None,
+        last_error="",
+        updated_at=now,
+    )
+    return bool(completed)
+
+
+def retry_delay(attempts):
+    base = settings.JOBS_RETRY_BACKOFF_SECONDS * 2 ** (attempts - 1)
+    delay = min(base, settings.JOBS_RETRY_BACKOFF_MAX_SECONDS)
+    return timedelta(seconds=delay * random.uniform(0.5, 1.0))
+
+
+def fail_job(job, error):
+    """
+    Reschedule ``job`` with exponential backoff, or fail it for good. Returns
+    the new status, or ``None`` when the run was requeued meanwhile.
+    """
+    now = timezone.now()
+    if job.attempts >= job.max_attempts:
+        failed = claimed(job).update(
+            status=Job.Status.FAILED,
+            finished_at=now,
+            locked_at=None,
+            last_error=error,
+            updated_at=now,
+        )
+        return Job.Status.FAILED if failed else None
+    try:
+        with transaction.atomic():
+            requeued = claimed(job).update(
+                status=Job.Status.QUEUED,
+                run_at=now + retry_delay(job.attempts),
+                locked_at=None,
+                last_error=error,
+                updated_at=now,
+            )
+        return Job.Status.QUEUED if requeued else None
+    except IntegrityError:
+        # A job with the same dedupe key was queued meanwhile; it does the retry.
+        failed = claimed(job).update(
+            status=Job.Status.FAILED,
+            finished_at=now,
+            locked_at=None,
+            last_error=f"{error}\nSuperseded by a queued job with the same dedupe key.",
+            updated_at=now,
+        )
+        return Job.Status.FAILED if failed else None
+
+
+def requeue_stale_jobs():
+    """
+    Put jobs back whose worker died mid-run (no heartbeat for
+    JOBS_LOCK_TIMEOUT_SECONDS) so they are retried like a failure. Jobs that
+    finish between the read and the update are left alone.
+    """
+    cutoff = timezone.now() - timedelta(seconds=settings.JOBS_LOCK_TIMEOUT_SECONDS)
+    stale = Job.objects.filter(status=Job.Status.RUNNING, locked_at__lt=cutoff)
+    count = 0
+    for job in stale.only("pk", "attempts", "max_attempts", "dedupe_key", "locked_by"):
+        if fail_job(job, f"Worker {job.locked_by} stopped responding.") is not None:
+            count += 1
+    return count
+
+
+def prune_finished_jobs():
+    cutoff = timezone.now() - timedelta(hours=settings.JOBS_KEEP_SUCCEEDED_HOURS)
+    deleted, _ = Job.objects.filter(status=Job.Status.SUCCEEDED, finished_at__lt=cutoff).delete()
+    return deleted
+
+
+def queue_stats():
+    """Depth per status plus the lag of the oldest job that is ready to run."""
+    now = timezone.now()
+    stats = Job.objects.exclude(status=Job.Status.SUCCEEDED).aggregate(
+        queued=Count("pk", filter=Q(status=Job.Status.QUEUED)),
+        ready=Count("pk", filter=Q(status=Job.Status.QUEUED, run_at__lte=now)),
+        running=Count("pk", filter=Q(status=Job.Status.RUNNING)),
+        failed=Count("pk", filter=Q(status=Job.Status.FAILED)),
+        oldest_ready=Min("run_at", filter=Q(status=Job.Status.QUEUED, run_at__lte=now)),
+    )
+    oldest = stats.pop("oldest_ready")
+    stats["lag_seconds"] = (now - oldest).total_seconds() if oldest else 0.0
+    return stats
+
+
+def job_lag_seconds(job):
+    return (job.locked_at - job.run_at).total_seconds()
+
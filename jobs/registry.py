@@ -0,0 +1,43 @@
+from dataclasses import dataclass
+
+_tasks = {}
+
+
+@dataclass(frozen=True)
+class Task:
+    name: str
+    func: object
+    priority: int
+    max_attempts: int
+
+    def __call__(self, *args, **kwargs):
+        return self.func(*args, **kwargs)
+
+
+def task(name=None, priority=0, max_attempts=5):
+    """
+    Register a job function. Jobs call it with their payload as keyword
+    arguments, so payloads must be JSON-serializable.
+
+        @task(priority=10)
+        def rebuild_thing(thing_id): ...
+    """
+
+    def register(func):
+        registered = Task(
+            name=name or f"{func.__module__}.{func.__name__}",
+            func=func,
+            priority=priority,
+            max_attempts=max_attempts,
+        )
+        _tasks[registered.name] = registered
+        return registered
+
+    return register
+
+
+def get_task(name):
+    try:
+        return _tasks[name]
+    except KeyError:
+        raise LookupError(f"No job task named {name!r} is registered.") from None
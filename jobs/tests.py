@@ -0,0 +1,127 @@
+from datetime import timedelta
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from .models import Job
+from .queue import (
+    claim_job,
+    complete_job,
+    enqueue,
+    fail_job,
+    heartbeat,
+    requeue_stale_jobs,
+)
+from .registry import task
+
+
+@task(name="jobs.tests.noop", max_attempts=3)
+def noop():
+    pass
+
+
+@override_settings(JOBS_RETRY_BACKOFF_SECONDS=10, JOBS_RETRY_BACKOFF_MAX_SECONDS=60)
+class QueueTests(TestCase):
+    def test_dedupe_key_drops_jobs_while_one_is_queued(self):
+        enqueue(noop, dedupe_key="key")
+        enqueue(noop, dedupe_key="key")
+        self.assertEqual(Job.objects.count(), 1)
+
+        # Once claimed, the key is free for the next run.
+        claim_job("worker")
+        enqueue(noop, dedupe_key="key")
+        self.assertEqual(Job.objects.filter(status=Job.Status.QUEUED).count(), 1)
+        self.assertEqual(Job.objects.count(), 2)
+
+    def test_claim_takes_the_highest_priority_ready_job(self):
+        enqueue(noop, priority=0)
+        urgent = Job.objects.get()
+        enqueue(noop, priority=5, run_at=timezone.now() + timedelta(hours=1))
+        enqueue(noop, priority=1)
+        important = Job.objects.latest("pk")
+
+        self.assertEqual(claim_job("worker").pk, important.pk)
+        self.assertEqual(claim_job("worker").pk, urgent.pk)
+        self.assertIsNone(claim_job("worker"))
+
+    def test_failed_job_is_rescheduled_with_backoff(self):
+        enqueue(noop)
+        job = claim_job("worker")
+        before = timezone.now()
+
+        self.assertEqual(fail_job(job, "boom"), Job.Status.QUEUED)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.Status.QUEUED)
+        self.assertEqual(job.attempts, 1)
+        self.assertEqual(job.last_error, "boom")
+        self.assertIsNone(job.locked_at)
+        # 10s for the first retry, jittered down to half.
+        self.assertGreaterEqual(job.run_at, before + timedelta(seconds=5))
+        self.assertLessEqual(job.run_at, timezone.now() + timedelta(seconds=10))
+
+        Job.objects.filter(pk=job.pk).update(run_at=timezone.now())
+        job = claim_job("worker")
+        fail_job(job, "boom")
+        job.refresh_from_db()
+        self.assertGreaterEqual(job.run_at, timezone.now() + timedelta(seconds=9))
+
+    def test_job_fails_for_good_after_max_attempts(self):
+        enqueue(noop, max_attempts=1)
+        job = claim_job("worker")
+
+        self.assertEqual(fail_job(job, "boom"), Job.Status.FAILED)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.Status.FAILED)
+        self.assertIsNotNone(job.finished_at)
+        self.assertIsNone(claim_job("worker"))
+
+    def test_retry_defers_to_a_queued_job_with_the_same_dedupe_key(self):
+        enqueue(noop, dedupe_key="key")
+        job = claim_job("worker")
+        enqueue(noop, dedupe_key="key")
+
+        self.assertEqual(fail_job(job, "boom"), Job.Status.FAILED)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.Status.FAILED)
+        self.assertIn("Superseded", job.last_error)
+        self.assertEqual(Job.objects.filter(status=Job.Status.QUEUED).count(), 1)
+
+    @override_settings(JOBS_LOCK_TIMEOUT_SECONDS=60)
+    def test_stale_run_cannot_touch_the_next_claim(self):
+        enqueue(noop)
+        first = claim_job("first")
+        Job.objects.filter(pk=first.pk).update(locked_at=timezone.now() - timedelta(minutes=5))
+        self.assertEqual(requeue_stale_jobs(), 1)
+        Job.objects.filter(pk=first.pk).update(run_at=timezone.now())
+        second = claim_job("second")
+
+        # The first worker finishing late changes nothing.
+        self.assertFalse(heartbeat(first))
+        self.assertFalse(complete_job(first))
+        self.assertIsNone(fail_job(first, "late"))
+        second.refresh_from_db()
+        self.assertEqual(second.status, Job.Status.RUNNING)
+        self.assertEqual(second.locked_by, "second")
+
+        self.assertTrue(complete_job(second))
+        second.refresh_from_db()
+        self.assertEqual(second.status, Job.Status.SUCCEEDED)
+
+    @override_settings(JOBS_LOCK_TIMEOUT_SECONDS=60)
+    def test_requeue_skips_jobs_that_finished_or_heartbeat(self):
+        enqueue(noop)
+        enqueue(noop)
+        finished = claim_job("worker")
+        alive = claim_job("worker")
+        long_ago = timezone.now() - timedelta(minutes=5)
+        Job.objects.update(locked_at=long_ago)
+
+        complete_job(finished)
+        self.assertTrue(heartbeat(alive))
+
+        self.assertEqual(requeue_stale_jobs(), 0)
+        self.assertEqual(Job.objects.get(pk=finished.pk).status, Job.Status.SUCCEEDED)
+        self.assertEqual(Job.objects.get(pk=alive.pk).status, Job.Status.RUNNING)
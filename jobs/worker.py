@@ -0,0 +1,195 @@
+import os
+import socket
+import threading
+import time
+import traceback
+
+from django.conf import settings
+from django.db import DatabaseError, close_old_connections, connections
+
+from .models import Job
+from .queue import (
+    claim_job,
+    complete_job,
+    fail_job,
+    heartbeat,
+    job_lag_seconds,
+    prune_finished_jobs,
+    queue_stats,
+    requeue_stale_jobs,
+)
+from .registry import get_task
+
+
+OUTCOMES = {Job.Status.QUEUED: "retried", Job.Status.FAILED: "failed"}
+
+
+class WorkerStats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.started = time.monotonic()
+        self.succeeded = 0
+        self.retried = 0
+        self.failed = 0
+        self.lost = 0
+        self.lag_total = 0.0
+        self.lag_max = 0.0
+        self.run_seconds = 0.0
+
+    def record(self, outcome, lag, run_seconds):
+        with self.lock:
+            setattr(self, outcome, getattr(self, outcome) + 1)
+            self.lag_total += lag
+            self.lag_max = max(self.lag_max, lag)
+            self.run_seconds += run_seconds
+
+    def snapshot(self):
+        """Return the counters since the last snapshot and start a new window."""
+        with self.lock:
+            elapsed = time.monotonic() - self.started
+            done = self.succeeded + self.retried + self.failed + self.lost
+            snapshot = {
+                "succeeded": self.succeeded,
+                "retried": self.retried,
+                "failed": self.failed,
+                "lost": self.lost,
+                "jobs_per_second": done / elapsed if elapsed else 0.0,
+                "mean_lag_seconds": self.lag_total / done if done else 0.0,
+                "max_lag_seconds": self.lag_max,
+                "mean_run_seconds": self.run_seconds / done if done else 0.0,
+            }
+            self.reset()
+        return snapshot
+
+
+class Heartbeat(threading.Thread):
+    """
+    Refresh a running job's ``locked_at`` every third of
+    JOBS_LOCK_TIMEOUT_SECONDS, so only jobs whose worker died look stale.
+    """
+
+    def __init__(self, job):
+        super().__init__(daemon=True)
+        self.job = job
+        self.interval = settings.JOBS_LOCK_TIMEOUT_SECONDS / 3
+        self.done = threading.Event()
+
+    def run(self):
+        try:
+            while not self.done.wait(self.interval):
+                try:
+                    if not heartbeat(self.job):
+                        return
+                except DatabaseError:
+                    connections.close_all()
+        finally:
+            connections.close_all()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.done.set()
+        self.join()
+
+
+class Worker:
+    """
+    Run jobs on ``threads`` threads of this process until ``stop`` is set, or
+    until no job is ready when ``burst`` is on. Each thread claims one job at
+    a time with ``SELECT ... FOR UPDATE SKIP LOCKED``.
+    """
+
+    def __init__(self, threads, poll_interval, stats_interval, log, burst=False, housekeeping=True):
+        self.threads = threads
+        self.poll_interval = poll_interval
+        self.stats_interval = stats_interval
+        self.log = log
+        self.burst = burst
+        self.housekeeping = housekeeping
+        self.stop = threading.Event()
+        self.stats = WorkerStats()
+        self.name = f"{socket.gethostname()}:{os.getpid()}"
+
+    def run(self):
+        threads = [
+            threading.Thread(target=self.work, args=(f"{self.name}:{n}",), daemon=True)
+            for n in range(self.threads)
+        ]
+        for thread in threads:
+            thread.start()
+        last_report = time.monotonic()
+        while alive := [thread for thread in threads if thread.is_alive()]:
+            alive[0].join(timeout=1.0)
+            if time.monotonic() - last_report >= self.stats_interval:
+                self.periodic()
+                last_report = time.monotonic()
+        self.periodic()
+
+    def periodic(self):
+        try:
+            if self.housekeeping and not self.stop.is_set():
+                self.tidy()
+            self.report()
+        except DatabaseError as exc:
+            self.log(f"[{self.name}] database error: {exc}")
+        finally:
+            connections.close_all()
+
+    def work(self, worker_id):
+        try:
+            while not self.stop.is_set():
+                close_old_connections()
+                try:
+                    job = claim_job(worker_id)
+                    if job is not None:
+                        self.run_job(job)
+                except DatabaseError as exc:
+                    # Keep the thread alive; a job left running is requeued
+                    # once its lock goes stale.
+                    self.log(f"[{worker_id}] database error: {exc}")
+                    connections.close_all()
+                    self.stop.wait(self.poll_interval)
+                    continue
+                if job is None:
+                    if self.burst:
+                        return
+                    self.stop.wait(self.poll_interval)
+        finally:
+            connections.close_all()
+
+    def run_job(self, job):
+        started = time.monotonic()
+        try:
+            with Heartbeat(job):
+                get_task(job.task)(**job.payload)
+        except Exception:
+            status = fail_job(job, traceback.format_exc())
+            outcome = OUTCOMES.get(status, "lost")
+        else:
+            outcome = "succeeded" if complete_job(job) else "lost"
+        if outcome == "lost":
+            self.log(f"[{job.locked_by}] job {job.pk} was requeued as stale while it ran")
+        self.stats.record(outcome, job_lag_seconds(job), time.monotonic() - started)
+
+    def tidy(self):
+        requeued = requeue_stale_jobs()
+        pruned = prune_finished_jobs()
+        if requeued or pruned:
+            self.log(f"[{self.name}] requeued {requeued} stale jobs, pruned {pruned} finished jobs")
+
+    def report(self):
+        stats = self.stats.snapshot()
+        queue = queue_stats()
+        self.log(
+            f"[{self.name}] {stats['jobs_per_second']:.1f} jobs/s "
+            f"(ok {stats['succeeded']}, retried {stats['retried']}, failed {stats['failed']}, "
+            f"lost {stats['lost']}); "
+            f"lag mean {stats['mean_lag_seconds']:.2f}s max {stats['max_lag_seconds']:.2f}s; "
+            f"queue ready {queue['ready']}, scheduled {queue['queued'] - queue['ready']}, "
+            f"running {queue['running']}, oldest ready {queue['lag_seconds']:.1f}s"
+        )
@@ -1,7 +1,15 @@
-from django.contrib import admin
-
-from .forms import CategoryAdminForm, ProductAdminForm
+from django.contrib import admin, messages
+from django.core.exceptions import PermissionDenied
+from django.shortcuts import get_object_or_404, redirect
+from django.template.response import TemplateResponse
+from django.urls import path, reverse
+from django.utils.html import format_html
+
+from utils.admin_autocomplete import PrefixAutocompleteMixin
+from utils.admin_changelist import CategoryExistsFilter, LargeTableAdminMixin
+from .forms import CategoryAdminForm, ProductAdminForm, SpecMatrixForm
 from .models import (
+    PRODUCT_SEARCH_VECTOR,
     Category,
     Product,
     ProductFaqItem,
@@ -9,21 +17,25 @@ from .models import (
     ProductSpecItem,
     RootCategory,
 )
+from .specs import build_spec_table, save_spec_matrix
 
 
 @admin.register(RootCategory)
-class RootCategoryAdmin(admin.ModelAdmin):
-    list_display = ("name", "slug", "created_at", "updated_at")
+class RootCategoryAdmin(PrefixAutocompleteMixin, admin.ModelAdmin):
+    list_display = ("name", "slug", "product_count", "created_at", "updated_at")
     search_fields = ("name", "slug")
+    autocomplete_search_fields = ("^name", "^slug")
     prepopulated_fields = {"slug": ("name",)}
 
 
 @admin.register(Category)
-class CategoryAdmin(admin.ModelAdmin):
+class CategoryAdmin(PrefixAutocompleteMixin, admin.ModelAdmin):
     form = CategoryAdminForm
-    list_display = ("name", "slug", "root_category", "created_at", "updated_at")
+    list_display = ("name", "slug", "root_category", "product_count", "created_at", "updated_at")
     list_filter = ("root_category",)
     search_fields = ("name", "slug", "root_category__name")
+    autocomplete_search_fields = ("^name", "^slug")
+    autocomplete_fields = ("root_category",)
     prepopulated_fields = {"slug": ("name",)}
 
 
@@ -41,36 +53,78 @@ class ProductFaqItemInline(admin.TabularInline):
     ordering = ("sort_order", "id")
 
 
-class ProductSpecItemInline(admin.TabularInline):
-    model = ProductSpecItem
-    extra = 0
-    fields = ("variant_name", "label", "value", "sort_order")
-    ordering = ("sort_order", "id")
+class ProductCategoryFilter(CategoryExistsFilter):
+    lookup_ordering = ("-product_count", "name")
 
 
 @admin.register(Product)
-class ProductAdmin(admin.ModelAdmin):
+class ProductAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     form = ProductAdminForm
     list_display = (
         "title",
         "created_at",
         "updated_at",
     )
-    list_filter = ("categories", "created_at")
+    list_filter = (ProductCategoryFilter, "created_at")
     search_fields = (
         "title",
         "slug",
         "short_description",
-        "description",
+        "description_text",
     )
+    search_vector = PRODUCT_SEARCH_VECTOR
     prepopulated_fields = {"slug": ("title",)}
-    filter_horizontal = ("categories",)
+    autocomplete_fields = ("categories",)
+    readonly_fields = ("spec_matrix_link",)
     inlines = (
         ProductGalleryImageInline,
         ProductFaqItemInline,
-        ProductSpecItemInline,
     )
 
+    def get_urls(self):
+        return [
+            path(
+                "<path:object_id>/spec-matrix/",
+                self.admin_site.admin_view(self.spec_matrix_view),
+                name="product_product_spec_matrix",
+            ),
+        ] + super().get_urls()
+
+    @admin.display(description="Spec table")
+    def spec_matrix_link(self, obj):
+        if not obj.pk:
+            return "Save the product to edit its spec table."
+        url = reverse("admin:product_product_spec_matrix", args=[obj.pk])
+        return format_html('<a href="{}">Edit spec table</a>', url)
+
+    def spec_matrix_view(self, request, object_id):
+        product = get_object_or_404(Product, pk=object_id)
+        if not self.has_change_permission(request, product):
+            raise PermissionDenied
+
+        table = build_spec_table(product.spec_items.all())
+        form = SpecMatrixForm(request.POST or None, table=table)
+        if request.method == "POST" and form.is_valid():
+            changes = save_spec_matrix(
+                product, form.cleaned_data["columns"], form.cleaned_data["rows"]
+            )
+            self.message_user(
+                request,
+                f"Spec table saved: {changes.created} added, {changes.updated} changed, "
+                f"{changes.deleted} removed.",
+                messages.SUCCESS,
+            )
+            return redirect("admin:product_product_change", product.pk)
+
+        context = {
+            **self.admin_site.each_context(request),
+            "opts": self.opts,
+            "original": product,
+            "title": f"Spec table: {product}",
+            "form": form,
+        }
+        return TemplateResponse(request, "admin/product/product/spec_matrix.html", context)
+
 
 @admin.register(ProductGalleryImage)
 class ProductGalleryImageAdmin(admin.ModelAdmin):
@@ -82,7 +136,7 @@ class ProductGalleryImageAdmin(admin.ModelAdmin):
 @admin.register(ProductFaqItem)
 class ProductFaqItemAdmin(admin.ModelAdmin):
     list_display = ("product", "question", "sort_order")
-    search_fields = ("question", "answer", "product__title")
+    search_fields = ("question", "answer_text", "product__title")
     ordering = ("product", "sort_order", "id")
 
 
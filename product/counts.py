@@ -0,0 +1,135 @@
+from collections import Counter, defaultdict
+
+from django.db import transaction
+from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest
+
+from .models import Category, Product, RootCategory
+
+ProductCategory = Product.categories.through
+
+
+def category_product_count():
+    return Coalesce(
+        Subquery(
+            ProductCategory.objects.filter(category_id=OuterRef("pk"))
+            .values("category_id")
+            .annotate(count=Count("product_id"))
+            .values("count"),
+            output_field=IntegerField(),
+        ),
+        Value(0),
+    )
+
+
+def root_category_product_count():
+    return Coalesce(
+        Subquery(
+            ProductCategory.objects.filter(category__root_category_id=OuterRef("pk"))
+            .values("category__root_category_id")
+            .annotate(count=Count("product_id", distinct=True))
+            .values("count"),
+            output_field=IntegerField(),
+        ),
+        Value(0),
+    )
+
+
+def refresh_root_product_counts(root_ids):
+    """Recount roots from scratch; only ``reconcile_product_counts`` needs this."""
+    root_ids = {root_id for root_id in root_ids if root_id is not None}
+    if root_ids:
+        RootCategory.objects.filter(pk__in=root_ids).update(
+            product_count=root_category_product_count()
+        )
+
+
+def _adjust_counts(model, deltas):
+    # Clamped at zero: a count that drifted low (bulk or raw writes) must not
+    # fail the save that removes a link; reconcile_catalog repairs it.
+    by_delta = defaultdict(list)
+    for pk, delta in deltas.items():
+        if delta:
+            by_delta[delta].append(pk)
+    for delta, ids in by_delta.items():
+        model.objects.filter(pk__in=ids).update(
+            product_count=Greatest(F("product_count") + delta, 0)
+        )
+
+
+def product_root_links(product_ids, root_ids):
+    """``{(product id, root id): links}`` between these products and roots, as stored now."""
+    rows = (
+        ProductCategory.objects.filter(
+            product_id__in=product_ids, category__root_category_id__in=root_ids
+        )
+        .values_list("product_id", "category__root_category_id")
+        .annotate(links=Count("pk"))
+    )
+    return {(product_id, root_id): links for product_id, root_id, links in rows}
+
+
+def apply_root_changes(pairs, sign):
+    """
+    Adjust ``RootCategory.product_count`` once ``(product id, root id)``
+    links were added (``sign=1``) or removed (``sign=-1``), one pair per
+    link. A product in two categories of one root counts once, so a root
+    only moves for products whose link count there went from or to zero;
+    only the links of the products involved are read.
+    """
+    changed = Counter((product_id, root_id) for product_id, root_id in pairs if root_id is not None)
+    if not changed:
+        return
+    product_ids = {product_id for product_id, _ in changed}
+    with transaction.atomic():
+        # Writers of one product's links queue here, so each reads the links
+        # the other committed.
+        list(
+            Product.objects.select_for_update()
+            .filter(pk__in=product_ids)
+            .order_by("pk")
+            .values_list("pk", flat=True)
+        )
+        current = product_root_links(product_ids, {root_id for _, root_id in changed})
+        deltas = Counter()
+        for (product_id, root_id), links in changed.items():
+            now = current.get((product_id, root_id), 0)
+            before = now - sign * links
+            if (before == 0) != (now == 0):
+                deltas[root_id] += sign
+        _adjust_counts(RootCategory, deltas)
+
+
+def apply_link_changes(links, sign):
+    """
+    Adjust the product counts after ``(product id, category id)`` links were
+    added (``sign=1``) or removed (``sign=-1``).
+    """
+    if not links:
+        return
+    deltas = Counter()
+    for _, category_id in links:
+        deltas[category_id] += sign
+    _adjust_counts(Category, deltas)
+    roots = dict(Category.objects.filter(pk__in=deltas).values_list("pk", "root_category_id"))
+    apply_root_changes(
+        [(product_id, roots.get(category_id)) for product_id, category_id in links], sign
+    )
+
+
+def reconcile_product_counts(dry_run=False):
+    """Recount drifted categories and roots; returns ``(categories, roots)`` fixed."""
+    categories = Category.objects.alias(actual=category_product_count()).filter(
+        ~Q(product_count=F("actual"))
+    )
+    roots = RootCategory.objects.alias(actual=root_category_product_count()).filter(
+        ~Q(product_count=F("actual"))
+    )
+    category_ids = list(categories.values_list("pk", flat=True))
+    root_ids = list(roots.values_list("pk", flat=True))
+    if not dry_run:
+        Category.objects.filter(pk__in=category_ids).update(
+            product_count=category_product_count()
+        )
+        refresh_root_product_counts(root_ids)
+    return len(category_ids), len(root_ids)
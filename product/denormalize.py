@@ -0,0 +1,61 @@
+from django.contrib.postgres.aggregates import ArrayAgg
+from django.db.models import F, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from .counts import ProductCategory
+from .models import Product
+
+EMPTY_IDS = Value([], output_field=Product._meta.get_field("category_ids"))
+
+
+def _aggregated_ids(expression, **extra):
+    return Coalesce(
+        Subquery(
+            ProductCategory.objects.filter(product_id=OuterRef("pk"))
+            .values("product_id")
+            .annotate(ids=ArrayAgg(expression, ordering=expression, **extra))
+            .values("ids")
+        ),
+        EMPTY_IDS,
+    )
+
+
+def product_category_ids():
+    return _aggregated_ids("category_id")
+
+
+def product_root_category_ids():
+    return _aggregated_ids(
+        "category__root_category_id",
+        distinct=True,
+        filter=Q(category__root_category_id__isnull=False),
+    )
+
+
+def refresh_category_arrays(product_ids):
+    """Recompute ``category_ids`` and ``root_category_ids`` (sorted) for these products."""
+    product_ids = set(product_ids)
+    if product_ids:
+        Product.objects.filter(pk__in=product_ids).update(
+            category_ids=product_category_ids(),
+            root_category_ids=product_root_category_ids(),
+        )
+
+
+def linked_product_ids(**filters):
+    return set(ProductCategory.objects.filter(**filters).values_list("product_id", flat=True))
+
+
+def reconcile_category_arrays(dry_run=False):
+    """Recompute drifted product arrays; returns the number of products fixed."""
+    drifted = Product.objects.alias(
+        expected_category_ids=product_category_ids(),
+        expected_root_category_ids=product_root_category_ids(),
+    ).filter(
+        ~Q(category_ids=F("expected_category_ids"))
+        | ~Q(root_category_ids=F("expected_root_category_ids"))
+    )
+    product_ids = list(drifted.values_list("pk", flat=True))
+    if not dry_run:
+        refresh_category_arrays(product_ids)
+    return len(product_ids)
@@ -1,15 +1,63 @@
+from functools import reduce
+from operator import or_
+
 import django_filters
+from django.db.models import Q
+
+from .models import Category, Product, RootCategory
+
 
-from .models import Product
+def _ids_for_slugs(model, raw):
+    slugs = {slug.strip().lower() for slug in raw.split(",") if slug.strip()}
+    if not slugs:
+        return slugs, []
+    lookup = reduce(or_, (Q(slug__iexact=slug) for slug in slugs))
+    return slugs, list(model.objects.filter(lookup).values_list("pk", flat=True))
 
 
 class ProductFilter(django_filters.FilterSet):
-    category = django_filters.CharFilter(field_name="categories__slug", lookup_expr="iexact")
-    category_id = django_filters.NumberFilter(field_name="categories__id")
+    """
+    Category filters match the product's denormalized ``category_ids`` /
+    ``root_category_ids`` arrays, so they need no join and no DISTINCT.
+    """
+
+    category = django_filters.CharFilter(
+        method="filter_category",
+        help_text="Comma-separated category slugs.",
+    )
+    category_match = django_filters.ChoiceFilter(
+        choices=(("any", "any"), ("all", "all")),
+        method="filter_nothing",
+        help_text="Whether products need any (default) or all of the given categories.",
+    )
+    category_id = django_filters.NumberFilter(method="filter_category_id")
     root_category = django_filters.CharFilter(
-        field_name="categories__root_category__slug",
-        lookup_expr="iexact",
+        method="filter_root_category",
+        help_text="Comma-separated root category slugs; matches any of them.",
     )
+
     class Meta:
         model = Product
-        fields = ("category", "category_id", "root_category")
+        fields = ("category", "category_match", "category_id", "root_category")
+
+    def filter_nothing(self, queryset, name, value):
+        return queryset
+
+    def filter_category(self, queryset, name, value):
+        slugs, ids = _ids_for_slugs(Category, value)
+        if not slugs:
+            return queryset
+        if self.form.cleaned_data.get("category_match") == "all":
+            if len(ids) < len(slugs):
+                return queryset.none()
+            return queryset.filter(category_ids__contains=ids)
+        return queryset.filter(category_ids__overlap=ids) if ids else queryset.none()
+
+    def filter_category_id(self, queryset, name, value):
+        return queryset.filter(category_ids__contains=[int(value)])
+
+    def filter_root_category(self, queryset, name, value):
+        slugs, ids = _ids_for_slugs(RootCategory, value)
+        if not slugs:
+            return queryset
+        return queryset.filter(root_category_ids__overlap=ids) if ids else queryset.none()
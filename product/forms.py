@@ -2,6 +2,7 @@ from django import forms
 
 from utils.admin_quill import QuillWidget
 from .models import Category, Product
+from .specs import validate_spec_matrix
 
 
 class CategoryAdminForm(forms.ModelForm):
@@ -20,3 +21,83 @@ class ProductAdminForm(forms.ModelForm):
         widgets = {
             "description": QuillWidget(attrs={"class": "quill-editor"}),
         }
+
+
+class SpecMatrixForm(forms.Form):
+    """
+    Whole-grid editor for a product's spec cells. Fields are ``column-<j>``,
+    ``label-<i>`` and ``cell-<i>-<j>``; blank headers drop their column/row and
+    blank cells are removed.
+    """
+
+    extra_columns = 2
+    extra_rows = 3
+    max_columns = 100
+    max_rows = 500
+
+    def __init__(self, *args, table=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        table = table or {"columns": [], "rows": []}
+        self.column_count = len(table["columns"]) + self.extra_columns
+        self.row_count = len(table["rows"]) + self.extra_rows
+        if self.is_bound:
+            self.column_count = self._posted_count("column_count", self.max_columns)
+            self.row_count = self._posted_count("row_count", self.max_rows)
+
+        for j in range(self.column_count):
+            initial = table["columns"][j] if j < len(table["columns"]) else ""
+            self.fields[f"column-{j}"] = forms.CharField(
+                max_length=120, required=False, initial=initial
+            )
+        for i in range(self.row_count):
+            row = table["rows"][i] if i < len(table["rows"]) else {"label": "", "values": {}}
+            self.fields[f"label-{i}"] = forms.CharField(
+                max_length=200, required=False, initial=row["label"]
+            )
+            for j in range(self.column_count):
+                column = table["columns"][j] if j < len(table["columns"]) else None
+                self.fields[f"cell-{i}-{j}"] = forms.CharField(
+                    max_length=300, required=False, initial=row["values"].get(column, "")
+                )
+
+    def _posted_count(self, name, maximum):
+        try:
+            return max(0, min(int(self.data.get(name, 0)), maximum))
+        except (TypeError, ValueError):
+            return 0
+
+    def grid(self):
+        return [
+            (self[f"label-{i}"], [self[f"cell-{i}-{j}"] for j in range(self.column_count)])
+            for i in range(self.row_count)
+        ]
+
+    def column_fields(self):
+        return [self[f"column-{j}"] for j in range(self.column_count)]
+
+    def clean(self):
+        cleaned_data = super().clean()
+        columns = []
+        column_indexes = []
+        for j in range(self.column_count):
+            name = cleaned_data.get(f"column-{j}", "").strip()
+            if name:
+                columns.append(name)
+                column_indexes.append(j)
+
+        rows = []
+        for i in range(self.row_count):
+            label = cleaned_data.get(f"label-{i}", "").strip()
+            if not label:
+                continue
+            values = {}
+            for name, j in zip(columns, column_indexes):
+                value = cleaned_data.get(f"cell-{i}-{j}", "")
+                if value:
+                    values[name] = value
+            rows.append({"label": label, "values": values})
+
+        validate_spec_matrix(columns, rows)
+        cleaned_data["columns"] = columns
+        cleaned_data["rows"] = rows
+        return cleaned_data
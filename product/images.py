@@ -0,0 +1,42 @@
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+
+SAVE_OPTIONS = {
+    "JPEG": {"quality": 85, "optimize": True, "progressive": True},
+    "PNG": {"optimize": True},
+    "WEBP": {"quality": 85, "method": 6},
+}
+
+
+def optimize_image(field_file, max_dimension):
+    """
+    Apply the EXIF orientation, downscale to ``max_dimension`` and re-encode
+    without metadata, saving the result through the field's storage (the
+    field's name changes with content-addressed storage). Returns whether the
+    file was rewritten; the caller saves the instance.
+    """
+    from PIL import ExifTags, Image, ImageOps
+
+    with field_file.open("rb"):
+        image = Image.open(field_file)
+        image.load()
+    image_format = image.format
+    if image_format not in SAVE_OPTIONS:
+        return False
+
+    exif = image.getexif()
+    if max(image.size) <= max_dimension and not exif:
+        return False
+    rotated = exif.get(ExifTags.Base.Orientation, 1) != 1
+    oriented = ImageOps.exif_transpose(image) if rotated else image
+    oriented.thumbnail((max_dimension, max_dimension), Image.Resampling.LANCZOS)
+    if image_format == "JPEG" and oriented.mode not in ("RGB", "L"):
+        oriented = oriented.convert("RGB")
+
+    buffer = BytesIO()
+    oriented.save(buffer, format=image_format, **SAVE_OPTIONS[image_format])
+    name = field_file.name
+    field_file.storage.delete(name)
+    field_file.save(name.rsplit("/", 1)[-1], ContentFile(buffer.getvalue()), save=False)
+    return True
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-19 18:36
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('product', '0010_productspecitem'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='product',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.search.SearchVector('title', 'slug', 'short_description', 'description', config='simple'), name='product_search_vector_gin'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-19 18:37
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('product', '0011_product_search_vector_gin'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='category',
+            index=models.Index(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('name'), name='text_pattern_ops'), name='product_category_name_prefix'),
+        ),
+        migrations.AddIndex(
+            model_name='category',
+            index=models.Index(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('slug'), name='text_pattern_ops'), name='product_category_slug_prefix'),
+        ),
+        migrations.AddIndex(
+            model_name='rootcategory',
+            index=models.Index(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('name'), name='text_pattern_ops'), name='product_rootcat_name_prefix'),
+        ),
+        migrations.AddIndex(
+            model_name='rootcategory',
+            index=models.Index(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('slug'), name='text_pattern_ops'), name='product_rootcat_slug_prefix'),
+        ),
+    ]
@@ -0,0 +1,81 @@
+# Generated by Django 5.2.18 on 2026-10-19 18:39
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations, models
+
+from common.richtext import backfill_rendered_rich_text
+
+
+def render_existing_rich_text(apps, schema_editor):
+    # Readers switch to the rendered columns, so fill them for existing rows.
+    for model_name, field in (
+        ("Category", "description"),
+        ("Product", "description"),
+        ("ProductFaqItem", "answer"),
+    ):
+        backfill_rendered_rich_text(apps.get_model("product", model_name), [field])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('product', '0012_prefix_search_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='product',
+            name='product_search_vector_gin',
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='description_html',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='description_text',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='description_word_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='description_html',
+            field=models.TextField(blank=True, default='', editable=False, help_text='Sanitized, minified description HTML.'),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='description_text',
+            field=models.TextField(blank=True, default='', editable=False, help_text='Plain-text description.'),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='description_word_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='productfaqitem',
+            name='answer_html',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='productfaqitem',
+            name='answer_text',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='productfaqitem',
+            name='answer_word_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(render_existing_rich_text, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='product',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.search.SearchVector('title', 'slug', 'short_description', 'description_text', config='simple'), name='product_search_vector_gin'),
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 5.2.18 on 2026-10-19 18:52
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_product_counts(apps, schema_editor):
+    Category = apps.get_model("product", "Category")
+    RootCategory = apps.get_model("product", "RootCategory")
+    ProductCategory = apps.get_model("product", "Product").categories.through
+
+    def count(links, group_by, distinct=False):
+        return Coalesce(
+            Subquery(
+                links.values(group_by)
+                .annotate(count=Count("product_id", distinct=distinct))
+                .values("count"),
+                output_field=IntegerField(),
+            ),
+            Value(0),
+        )
+
+    Category.objects.update(
+        product_count=count(
+            ProductCategory.objects.filter(category_id=OuterRef("pk")), "category_id"
+        )
+    )
+    RootCategory.objects.update(
+        product_count=count(
+            ProductCategory.objects.filter(category__root_category_id=OuterRef("pk")),
+            "category__root_category_id",
+            distinct=True,
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('product', '0015_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='product_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Products in this category; kept by signals.'),
+        ),
+        migrations.AddField(
+            model_name='rootcategory',
+            name='product_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text="Distinct products in this root's categories; kept by signals."),
+        ),
+        migrations.RunPython(backfill_product_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,64 @@
+# Generated by Django 5.2.18 on 2026-10-19 18:53
+
+import django.contrib.postgres.fields
+import django.contrib.postgres.indexes
+from django.contrib.postgres.aggregates import ArrayAgg
+from django.db import migrations, models
+from django.db.models import OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_category_arrays(apps, schema_editor):
+    Product = apps.get_model("product", "Product")
+    ProductCategory = Product.categories.through
+    empty = Value([], output_field=Product._meta.get_field("category_ids"))
+
+    def aggregated(expression, **extra):
+        return Coalesce(
+            Subquery(
+                ProductCategory.objects.filter(product_id=OuterRef("pk"))
+                .values("product_id")
+                .annotate(ids=ArrayAgg(expression, ordering=expression, **extra))
+                .values("ids")
+            ),
+            empty,
+        )
+
+    Product.objects.update(
+        category_ids=aggregated("category_id"),
+        root_category_ids=aggregated(
+            "category__root_category_id",
+            distinct=True,
+            filter=Q(category__root_category_id__isnull=False),
+        ),
+    )
+
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('product', '0016_product_counts'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='category_ids',
+            field=django.contrib.postgres.fields.ArrayField(base_field=models.BigIntegerField(), blank=True, default=list, editable=False, size=None),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='root_category_ids',
+            field=django.contrib.postgres.fields.ArrayField(base_field=models.BigIntegerField(), blank=True, default=list, editable=False, size=None),
+        ),
+        migrations.RunPython(backfill_category_arrays, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='product',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['category_ids'], name='product_category_ids_gin'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['root_category_ids'], name='product_root_category_ids_gin'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-19 19:25
+
+import product.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('product', '0018_product_uploads'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='product',
+            name='slug',
+            field=models.SlugField(help_text='Used in product detail URL.', max_length=240, unique=True, validators=[product.models.validate_product_slug]),
+        ),
+    ]
@@ -1,27 +1,76 @@
+import uuid
+
+from django.conf import settings
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchVector
+from django.core.exceptions import ValidationError
 from django.db import models
+from django.db.models.functions import Upper
+
+from common.models import AuditableModel, RichTextModel
+
+PRODUCT_SEARCH_VECTOR = SearchVector(
+    "title",
+    "slug",
+    "short_description",
+    "description_text",
+    config="simple",
+)
 
-from common.models import AuditableModel
+# Fixed routes in product/urls.py that sit in front of "<slug:slug>/".
+RESERVED_PRODUCT_SLUGS = frozenset(
+    {"batch", "categories", "create", "root-categories", "typeahead"}
+)
+
+
+def validate_product_slug(value):
+    if value in RESERVED_PRODUCT_SLUGS:
+        raise ValidationError("%(value)s is reserved for an API route.", params={"value": value})
 
 
 class RootCategory(AuditableModel):
     name = models.CharField(max_length=120, unique=True)
     slug = models.SlugField(max_length=140, unique=True)
     image = models.ImageField(upload_to="products/root-categories/", null=True, blank=True)
+    product_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        help_text="Distinct products in this root's categories; kept by signals.",
+    )
 
     class Meta:
         ordering = ["name"]
         verbose_name_plural = "root categories"
+        indexes = [
+            models.Index(
+                OpClass(Upper("name"), name="text_pattern_ops"),
+                name="product_rootcat_name_prefix",
+            ),
+            models.Index(
+                OpClass(Upper("slug"), name="text_pattern_ops"),
+                name="product_rootcat_slug_prefix",
+            ),
+            GinIndex(
+                fields=["name"],
+                opclasses=["gin_trgm_ops"],
+                name="product_rootcat_name_trgm",
+            ),
+        ]
 
     def __str__(self) -> str:
         return self.name
 
 
-class Category(AuditableModel):
+class Category(RichTextModel, AuditableModel):
     name = models.CharField(max_length=120, unique=True)
     slug = models.SlugField(max_length=140, unique=True)
     image = models.ImageField(upload_to="products/categories/", null=True, blank=True)
     short_description = models.TextField(blank=True, default="")
     description = models.TextField(blank=True, default="")
+    description_html = models.TextField(blank=True, default="", editable=False)
+    description_text = models.TextField(blank=True, default="", editable=False)
+    description_word_count = models.PositiveIntegerField(default=0, editable=False)
     root_category = models.ForeignKey(
         RootCategory,
         on_delete=models.SET_NULL,
@@ -29,30 +78,83 @@ class Category(AuditableModel):
         blank=True,
         related_name="categories",
     )
+    product_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        help_text="Products in this category; kept by signals.",
+    )
+
+    rich_text_fields = ("description",)
 
     class Meta:
         ordering = ["name"]
         verbose_name_plural = "categories"
+        indexes = [
+            models.Index(
+                OpClass(Upper("name"), name="text_pattern_ops"),
+                name="product_category_name_prefix",
+            ),
+            models.Index(
+                OpClass(Upper("slug"), name="text_pattern_ops"),
+                name="product_category_slug_prefix",
+            ),
+            GinIndex(
+                fields=["name"],
+                opclasses=["gin_trgm_ops"],
+                name="product_category_name_trgm",
+            ),
+        ]
 
     def __str__(self) -> str:
         return self.name
 
 
-class Product(AuditableModel):
+class Product(RichTextModel, AuditableModel):
     title = models.CharField(max_length=220, help_text="Public product name.")
-    slug = models.SlugField(max_length=240, unique=True, help_text="Used in product detail URL.")
+    slug = models.SlugField(
+        max_length=240,
+        unique=True,
+        validators=[validate_product_slug],
+        help_text="Used in product detail URL.",
+    )
     categories = models.ManyToManyField(
         Category,
         related_name="products",
         blank=True,
         help_text="Product categories.",
     )
+    # Sorted copies of the category links for join-free filtering; kept by signals.
+    category_ids = ArrayField(
+        models.BigIntegerField(),
+        default=list,
+        blank=True,
+        editable=False,
+    )
+    root_category_ids = ArrayField(
+        models.BigIntegerField(),
+        default=list,
+        blank=True,
+        editable=False,
+    )
     short_description = models.TextField(blank=True, help_text="Short summary.")
     description = models.TextField(
         blank=True,
         default="",
         help_text="Quill rich text content.",
     )
+    description_html = models.TextField(
+        blank=True,
+        default="",
+        editable=False,
+        help_text="Sanitized, minified description HTML.",
+    )
+    description_text = models.TextField(
+        blank=True,
+        default="",
+        editable=False,
+        help_text="Plain-text description.",
+    )
+    description_word_count = models.PositiveIntegerField(default=0, editable=False)
     hero_image = models.ImageField(
         upload_to="products/hero/",
         null=True,
@@ -66,10 +168,22 @@ class Product(AuditableModel):
         help_text="Hero video (optional).",
     )
 
+    rich_text_fields = ("description",)
+
     class Meta:
         ordering = ["-created_at"]
         indexes = [
-            models.Index(fields=["slug"]),
+            # Newest-first list pages and the admin keyset pagination.
+            models.Index(fields=["-created_at", "-id"], name="product_created_at_id_idx"),
+            GinIndex(PRODUCT_SEARCH_VECTOR, name="product_search_vector_gin"),
+            # Typeahead: short prefixes use the B-tree, longer input the trigram index.
+            models.Index(
+                OpClass(Upper("title"), name="text_pattern_ops"),
+                name="product_title_prefix",
+            ),
+            GinIndex(fields=["title"], opclasses=["gin_trgm_ops"], name="product_title_trgm"),
+            GinIndex(fields=["category_ids"], name="product_category_ids_gin"),
+            GinIndex(fields=["root_category_ids"], name="product_root_category_ids_gin"),
         ]
 
     def __str__(self) -> str:
@@ -91,15 +205,12 @@ class ProductGalleryImage(AuditableModel):
 
     class Meta:
         ordering = ["sort_order", "id"]
-        indexes = [
-            models.Index(fields=["product"]),
-        ]
 
     def __str__(self) -> str:
         return f"{self.product.title} - {self.id}"
 
 
-class ProductFaqItem(AuditableModel):
+class ProductFaqItem(RichTextModel, AuditableModel):
     product = models.ForeignKey(
         Product,
         on_delete=models.CASCADE,
@@ -107,8 +218,13 @@ class ProductFaqItem(AuditableModel):
     )
     question = models.CharField(max_length=240, help_text="FAQ question.")
     answer = models.TextField(blank=True, help_text="FAQ answer text/HTML.")
+    answer_html = models.TextField(blank=True, default="", editable=False)
+    answer_text = models.TextField(blank=True, default="", editable=False)
+    answer_word_count = models.PositiveIntegerField(default=0, editable=False)
     sort_order = models.PositiveIntegerField(default=0, help_text="Controls ordering.")
 
+    rich_text_fields = ("answer",)
+
     class Meta:
         ordering = ["sort_order", "id"]
 
@@ -132,3 +248,44 @@ class ProductSpecItem(AuditableModel):
 
     def __str__(self) -> str:
         return f"{self.product.title} - {self.variant_name} - {self.label}"
+
+
+class ProductUpload(AuditableModel):
+    """A resumable chunked upload that becomes a product's hero video or a gallery image."""
+
+    class Target(models.TextChoices):
+        HERO_VIDEO = "hero_video", "Hero video"
+        GALLERY_IMAGE = "gallery_image", "Gallery image"
+
+    class Status(models.TextChoices):
+        UPLOADING = "uploading", "Uploading"
+        COMPLETE = "complete", "Complete"
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="product_uploads",
+    )
+    product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name="uploads")
+    target = models.CharField(max_length=20, choices=Target.choices)
+    filename = models.CharField(max_length=255)
+    size = models.PositiveBigIntegerField(help_text="Declared size in bytes.")
+    sha256 = models.CharField(max_length=64, help_text="Expected SHA-256, hex.")
+    received = models.PositiveBigIntegerField(default=0)
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.UPLOADING)
+    alt_text = models.CharField(max_length=200, blank=True)
+    sort_order = models.PositiveIntegerField(default=0)
+    gallery_image = models.ForeignKey(
+        ProductGalleryImage,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+
+    class Meta:
+        ordering = ["-created_at"]
+
+    def __str__(self) -> str:
+        return f"{self.filename} ({self.received}/{self.size})"
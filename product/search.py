@@ -0,0 +1,53 @@
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.db.models import Case, CharField, F, FloatField, IntegerField, Q, Value, When
+
+from .models import Category, Product, RootCategory
+
+TYPEAHEAD_LIMIT = 10
+MAX_QUERY_LENGTH = 64
+# Trigram matching needs at least one full trigram to be selective.
+MIN_TRIGRAM_LENGTH = 3
+
+
+def normalize_typeahead_query(raw):
+    return " ".join((raw or "").split())[:MAX_QUERY_LENGTH]
+
+
+def _suggestions(queryset, field, kind, query, limit):
+    prefix = Q(**{f"{field}__istartswith": query})
+    if len(query) >= MIN_TRIGRAM_LENGTH:
+        match = prefix | Q(**{f"{field}__trigram_word_similar": query})
+        similarity = TrigramWordSimilarity(query, field)
+    else:
+        match = prefix
+        similarity = Value(0.0, output_field=FloatField())
+    return (
+        queryset.filter(match)
+        .annotate(
+            kind=Value(kind, output_field=CharField()),
+            label=F(field),
+            is_prefix=Case(
+                When(prefix, then=Value(1)),
+                default=Value(0),
+                output_field=IntegerField(),
+            ),
+            similarity=similarity,
+        )
+        .values("kind", "label", "slug", "is_prefix", "similarity")
+        .order_by("-is_prefix", "-similarity", field)[:limit]
+    )
+
+
+def typeahead_suggestions(query, limit=TYPEAHEAD_LIMIT):
+    """
+    Up to ``limit`` products, categories and root categories whose name starts
+    with ``query`` or contains a word similar to it, prefix matches first. One
+    query: each branch is limited before the UNION ALL.
+    """
+    branches = [
+        _suggestions(Product.objects.all(), "title", "product", query, limit),
+        _suggestions(Category.objects.all(), "name", "category", query, limit),
+        _suggestions(RootCategory.objects.all(), "name", "root_category", query, limit),
+    ]
+    combined = branches[0].union(*branches[1:], all=True)
+    return list(combined.order_by("-is_prefix", "-similarity", "label")[:limit])
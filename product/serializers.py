@@ -1,13 +1,19 @@
+from django.conf import settings
 from rest_framework import serializers
 
+from common.serializers import SparseFieldsetMixin
+from jobs.queue import enqueue_on_commit
 from .models import (
     Category,
     Product,
     ProductFaqItem,
     ProductGalleryImage,
     ProductSpecItem,
+    ProductUpload,
     RootCategory,
 )
+from .specs import build_spec_table, save_spec_matrix, validate_spec_matrix
+from .tasks import optimize_product_images
 
 
 class CategorySerializer(serializers.ModelSerializer):
@@ -42,7 +48,7 @@ class CategoryListSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Category
-        fields = ("title", "image")
+        fields = ("title", "image", "product_count")
 
     def get_image(self, obj):
         if not obj.image:
@@ -59,10 +65,19 @@ class CategoryListSerializer(serializers.ModelSerializer):
 class CategoryDetailSerializer(serializers.ModelSerializer):
     title = serializers.CharField(source="name")
     image = serializers.SerializerMethodField()
+    description = serializers.CharField(source="description_html", read_only=True)
 
     class Meta:
         model = Category
-        fields = ("id", "title", "slug", "image", "short_description", "description")
+        fields = (
+            "id",
+            "title",
+            "slug",
+            "image",
+            "short_description",
+            "description",
+            "product_count",
+        )
 
     def get_image(self, obj):
         if not obj.image:
@@ -95,13 +110,18 @@ class RootCategorySerializer(serializers.ModelSerializer):
         return path
 
 
+class CategoryTreeItemSerializer(CategorySerializer):
+    class Meta(CategorySerializer.Meta):
+        fields = CategorySerializer.Meta.fields + ("product_count",)
+
+
 class RootCategoryListSerializer(serializers.ModelSerializer):
-    categories = CategorySerializer(many=True, read_only=True)
+    categories = CategoryTreeItemSerializer(many=True, read_only=True)
     image = serializers.SerializerMethodField()
 
     class Meta:
         model = RootCategory
-        fields = ("id", "name", "slug", "image", "categories")
+        fields = ("id", "name", "slug", "image", "product_count", "categories")
 
     def get_image(self, obj):
         if not obj.image:
@@ -141,6 +161,14 @@ class ProductGalleryImageCreateSerializer(serializers.ModelSerializer):
 
 
 class ProductFaqItemSerializer(serializers.ModelSerializer):
+    answer = serializers.CharField(source="answer_html", read_only=True)
+
+    class Meta:
+        model = ProductFaqItem
+        fields = ("question", "answer", "sort_order")
+
+
+class ProductFaqItemCreateSerializer(serializers.ModelSerializer):
     class Meta:
         model = ProductFaqItem
         fields = ("question", "answer", "sort_order")
@@ -152,7 +180,30 @@ class ProductSpecItemSerializer(serializers.ModelSerializer):
         fields = ("variant_name", "label", "value", "sort_order")
 
 
-class ProductListSerializer(serializers.ModelSerializer):
+class ProductSpecMatrixRowSerializer(serializers.Serializer):
+    label = serializers.CharField(max_length=200)
+    values = serializers.DictField(
+        child=serializers.CharField(max_length=300, allow_blank=True),
+    )
+
+
+class ProductSpecMatrixSerializer(serializers.Serializer):
+    columns = serializers.ListField(child=serializers.CharField(max_length=120))
+    rows = ProductSpecMatrixRowSerializer(many=True)
+
+    def validate(self, attrs):
+        validate_spec_matrix(attrs["columns"], attrs["rows"])
+        return attrs
+
+    def update(self, instance, validated_data):
+        save_spec_matrix(instance, validated_data["columns"], validated_data["rows"])
+        return instance
+
+    def to_representation(self, instance):
+        return build_spec_table(instance.spec_items.all())
+
+
+class ProductListSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     categories = CategorySerializer(many=True, read_only=True)
     hero_image = serializers.SerializerMethodField()
 
@@ -179,10 +230,46 @@ class ProductListSerializer(serializers.ModelSerializer):
         return path
 
 
-class ProductDetailSerializer(serializers.ModelSerializer):
+class ProductListNormalizedSerializer(ProductListSerializer):
+    categories = serializers.PrimaryKeyRelatedField(many=True, read_only=True)
+
+
+class IncludedCategorySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Category
+        fields = ("id", "name", "slug", "root_category")
+
+
+def build_included(products, context):
+    """
+    Collect the categories and root categories referenced by ``products``
+    (prefetched) into id-keyed maps, serializing each one once.
+    """
+    categories = {}
+    for product in products:
+        for category in product.categories.all():
+            categories.setdefault(category.pk, category)
+    root_categories = {
+        category.root_category_id: category.root_category
+        for category in categories.values()
+        if category.root_category_id
+    }
+    return {
+        "categories": _serialize_by_id(IncludedCategorySerializer, categories, context),
+        "root_categories": _serialize_by_id(RootCategorySerializer, root_categories, context),
+    }
+
+
+def _serialize_by_id(serializer_class, objects, context):
+    data = serializer_class(list(objects.values()), many=True, context=context).data
+    return {str(pk): item for pk, item in zip(objects, data)}
+
+
+class ProductDetailSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     categories = CategorySerializer(many=True, read_only=True)
     hero_image = serializers.SerializerMethodField()
     hero_video = serializers.SerializerMethodField()
+    description = serializers.CharField(source="description_html", read_only=True)
     gallery_images = ProductGalleryImageSerializer(many=True, read_only=True)
     faq_items = ProductFaqItemSerializer(many=True, read_only=True)
     spec_table = serializers.SerializerMethodField()
@@ -220,27 +307,7 @@ class ProductDetailSerializer(serializers.ModelSerializer):
         return path
 
     def get_spec_table(self, obj):
-        items = list(obj.spec_items.all())
-        if not items:
-            return {"columns": [], "rows": []}
-
-        columns = []
-        column_set = set()
-        rows = []
-        row_map = {}
-
-        for item in items:
-            if item.variant_name not in column_set:
-                column_set.add(item.variant_name)
-                columns.append(item.variant_name)
-            row = row_map.get(item.label)
-            if not row:
-                row = {"label": item.label, "values": {}}
-                row_map[item.label] = row
-                rows.append(row)
-            row["values"][item.variant_name] = item.value
-
-        return {"columns": columns, "rows": rows}
+        return build_spec_table(obj.spec_items.all())
 
 
 class ProductCreateSerializer(serializers.ModelSerializer):
@@ -250,7 +317,7 @@ class ProductCreateSerializer(serializers.ModelSerializer):
         required=False,
     )
     gallery_images = ProductGalleryImageCreateSerializer(many=True, required=False)
-    faq_items = ProductFaqItemSerializer(many=True, required=False)
+    faq_items = ProductFaqItemCreateSerializer(many=True, required=False)
     spec_items = ProductSpecItemSerializer(many=True, required=False)
 
     class Meta:
@@ -287,4 +354,68 @@ class ProductCreateSerializer(serializers.ModelSerializer):
         for spec_data in spec_items:
             ProductSpecItem.objects.create(product=product, **spec_data)
 
+        if product.hero_image or gallery_images:
+            enqueue_on_commit(
+                optimize_product_images,
+                {"product_id": product.pk},
+                dedupe_key=f"product-images:{product.pk}",
+            )
         return product
+
+
+class CategoryLandingSerializer(CategoryDetailSerializer):
+    root_category = RootCategorySerializer(read_only=True)
+
+    class Meta(CategoryDetailSerializer.Meta):
+        fields = CategoryDetailSerializer.Meta.fields + ("root_category",)
+
+
+class TypeaheadSuggestionSerializer(serializers.Serializer):
+    kind = serializers.ChoiceField(choices=("product", "category", "root_category"))
+    label = serializers.CharField()
+    slug = serializers.SlugField()
+
+
+class ProductUploadSerializer(serializers.ModelSerializer):
+    product = serializers.SlugRelatedField(slug_field="slug", read_only=True)
+
+    class Meta:
+        model = ProductUpload
+        fields = (
+            "id",
+            "product",
+            "target",
+            "filename",
+            "size",
+            "sha256",
+            "received",
+            "status",
+            "alt_text",
+            "sort_order",
+            "gallery_image",
+            "created_at",
+        )
+        read_only_fields = ("received", "status", "gallery_image")
+
+    def validate_filename(self, value):
+        # Only the extension survives into storage; keep the rest harmless.
+        return value.replace("/", "_").replace("\\", "_").strip()
+
+    def validate_sha256(self, value):
+        value = value.lower()
+        if len(value) != 64 or any(char not in "0123456789abcdef" for char in value):
+            raise serializers.ValidationError("Expected 64 hex characters.")
+        return value
+
+    def validate(self, attrs):
+        target = attrs["target"]
+        max_size = settings.PRODUCT_UPLOAD_MAX_SIZE[target]
+        if not 0 < attrs["size"] <= max_size:
+            raise serializers.ValidationError({"size": f"1 to {max_size} bytes for {target}."})
+        extension = attrs["filename"].rsplit(".", 1)[-1].lower() if "." in attrs["filename"] else ""
+        allowed = settings.PRODUCT_UPLOAD_EXTENSIONS[target]
+        if extension not in allowed:
+            raise serializers.ValidationError(
+                {"filename": f"Allowed extensions for {target}: {', '.join(allowed)}."}
+            )
+        return attrs
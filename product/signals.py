@@ -0,0 +1,166 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from common.cache import bump_namespace_on_commit
+from jobs.queue import enqueue_on_commit
+
+from .counts import ProductCategory, apply_link_changes, apply_root_changes
+from .denormalize import linked_product_ids, refresh_category_arrays
+from .models import (
+    Category,
+    Product,
+    ProductFaqItem,
+    ProductGalleryImage,
+    ProductSpecItem,
+    RootCategory,
+)
+from .tasks import refresh_product_category_arrays
+
+CACHE_NAMESPACE = "catalog"
+CATALOG_MODELS = (
+    RootCategory,
+    Category,
+    Product,
+    ProductGalleryImage,
+    ProductFaqItem,
+    ProductSpecItem,
+)
+
+
+def invalidate_catalog_cache(sender, **kwargs):
+    bump_namespace_on_commit(CACHE_NAMESPACE)
+
+
+for model in CATALOG_MODELS:
+    post_save.connect(
+        invalidate_catalog_cache, sender=model, dispatch_uid=f"catalog-save-{model.__name__}"
+    )
+    post_delete.connect(
+        invalidate_catalog_cache, sender=model, dispatch_uid=f"catalog-delete-{model.__name__}"
+    )
+
+
+@receiver(m2m_changed, sender=Product.categories.through)
+def invalidate_catalog_cache_on_categories_change(sender, action, **kwargs):
+    if action.startswith("post_"):
+        bump_namespace_on_commit(CACHE_NAMESPACE)
+
+
+def _links(instance, reverse, pk_set):
+    if reverse:
+        links = ProductCategory.objects.filter(category_id=instance.pk)
+        if pk_set is not None:
+            links = links.filter(product_id__in=pk_set)
+    else:
+        links = ProductCategory.objects.filter(product_id=instance.pk)
+        if pk_set is not None:
+            links = links.filter(category_id__in=pk_set)
+    return list(links.values_list("product_id", "category_id"))
+
+
+@receiver(m2m_changed, sender=ProductCategory)
+def maintain_denormalized_categories(sender, instance, action, reverse, pk_set, **kwargs):
+    # post_add gets only the links actually created; for removals the links
+    # that exist are read before they go.
+    if action == "pre_remove":
+        instance._unlinked = _links(instance, reverse, pk_set)
+    elif action == "pre_clear":
+        instance._unlinked = _links(instance, reverse, None)
+    elif action == "post_add":
+        if reverse:
+            links = [(product_id, instance.pk) for product_id in pk_set]
+        else:
+            links = [(instance.pk, category_id) for category_id in pk_set]
+        apply_link_changes(links, 1)
+        refresh_category_arrays(product_id for product_id, _ in links)
+    elif action in ("post_remove", "post_clear"):
+        links = instance.__dict__.pop("_unlinked", [])
+        apply_link_changes(links, -1)
+        refresh_category_arrays(product_id for product_id, _ in links)
+
+
+@receiver(pre_save, sender=Product)
+def stash_product_category_arrays(sender, instance, raw, **kwargs):
+    # Full saves must not write back arrays that changed since the row was read.
+    if raw or instance.pk is None:
+        return
+    current = Product.objects.filter(pk=instance.pk).values("category_ids", "root_category_ids")
+    current = current.first()
+    if current:
+        instance.category_ids = current["category_ids"]
+        instance.root_category_ids = current["root_category_ids"]
+
+
+@receiver(pre_delete, sender=Product)
+def stash_deleted_product_categories(sender, instance, **kwargs):
+    instance._unlinked = _links(instance, False, None)
+
+
+@receiver(post_delete, sender=Product)
+def release_deleted_product_counts(sender, instance, **kwargs):
+    apply_link_changes(instance.__dict__.pop("_unlinked", []), -1)
+
+
+def enqueue_category_arrays_refresh(product_ids):
+    if product_ids:
+        enqueue_on_commit(refresh_product_category_arrays, {"product_ids": sorted(product_ids)})
+
+
+@receiver(pre_save, sender=Category)
+def stash_category_counts(sender, instance, raw, **kwargs):
+    # Full saves (e.g. from the admin) must not write back a stale count.
+    if raw or instance.pk is None:
+        return
+    current = Category.objects.filter(pk=instance.pk).values("root_category_id", "product_count")
+    current = current.first()
+    if current:
+        instance._previous_root_id = current["root_category_id"]
+        instance.product_count = current["product_count"]
+
+
+@receiver(post_save, sender=Category)
+def refresh_moved_category(sender, instance, raw, created, **kwargs):
+    previous_root_id = instance.__dict__.pop("_previous_root_id", None)
+    if not raw and not created and previous_root_id != instance.root_category_id:
+        product_ids = linked_product_ids(category_id=instance.pk)
+        apply_root_changes([(product_id, previous_root_id) for product_id in product_ids], -1)
+        apply_root_changes(
+            [(product_id, instance.root_category_id) for product_id in product_ids], 1
+        )
+        # A move touches every product of the category; rebuild their arrays
+        # in the background.
+        enqueue_on_commit(
+            refresh_product_category_arrays,
+            {"category_id": instance.pk},
+            dedupe_key=f"category-arrays:{instance.pk}",
+        )
+
+
+@receiver(pre_delete, sender=Category)
+def stash_deleted_category_products(sender, instance, **kwargs):
+    instance._linked_product_ids = linked_product_ids(category_id=instance.pk)
+
+
+@receiver(post_delete, sender=Category)
+def refresh_deleted_category(sender, instance, **kwargs):
+    product_ids = instance.__dict__.pop("_linked_product_ids", ())
+    apply_root_changes([(product_id, instance.root_category_id) for product_id in product_ids], -1)
+    enqueue_category_arrays_refresh(product_ids)
+
+
+@receiver(pre_save, sender=RootCategory)
+def stash_root_category_count(sender, instance, raw, **kwargs):
+    if raw or instance.pk is None:
+        return
+    current = RootCategory.objects.filter(pk=instance.pk).values_list("product_count", flat=True)
+    instance.product_count = current.first() or 0
+
+
+@receiver(pre_delete, sender=RootCategory)
+def stash_deleted_root_products(sender, instance, **kwargs):
+    instance._linked_product_ids = linked_product_ids(category__root_category_id=instance.pk)
+
+
+@receiver(post_delete, sender=RootCategory)
+def refresh_deleted_root(sender, instance, **kwargs):
+    enqueue_category_arrays_refresh(instance.__dict__.pop("_linked_product_ids", ()))
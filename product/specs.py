@@ -0,0 +1,116 @@
+from dataclasses import dataclass
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils import timezone
+
+from changefeed.changes import record_changes
+from changefeed.models import ChangeLogEntry
+from common.cache import bump_namespace_on_commit
+
+from .models import Product, ProductSpecItem
+from .signals import CACHE_NAMESPACE
+
+
+@dataclass(frozen=True)
+class SpecMatrixChanges:
+    created: int
+    updated: int
+    deleted: int
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.created or self.updated or self.deleted)
+
+
+def build_spec_table(items):
+    columns = []
+    column_set = set()
+    rows = []
+    row_map = {}
+
+    for item in items:
+        if item.variant_name not in column_set:
+            column_set.add(item.variant_name)
+            columns.append(item.variant_name)
+        row = row_map.get(item.label)
+        if not row:
+            row = {"label": item.label, "values": {}}
+            row_map[item.label] = row
+            rows.append(row)
+        row["values"][item.variant_name] = item.value
+
+    return {"columns": columns, "rows": rows}
+
+
+def validate_spec_matrix(columns, rows):
+    errors = []
+    if len(set(columns)) != len(columns):
+        errors.append("Column names must be unique.")
+    labels = [row["label"] for row in rows]
+    if len(set(labels)) != len(labels):
+        errors.append("Row labels must be unique.")
+    known = set(columns)
+    for row in rows:
+        unknown = set(row["values"]) - known
+        if unknown:
+            errors.append(f"Row '{row['label']}' has values for unknown columns: {sorted(unknown)}.")
+    if errors:
+        raise ValidationError(errors)
+
+
+@transaction.atomic
+def save_spec_matrix(product, columns, rows):
+    """
+    Replace the product's spec cells with the given grid, writing only the
+    difference: one bulk insert, one bulk update and one delete at most.
+
+    A cell exists when its column is present in the row's ``values``.
+    """
+    desired = {}
+    for row_index, row in enumerate(rows):
+        for column_index, column in enumerate(columns):
+            if column in row["values"]:
+                sort_order = row_index * len(columns) + column_index
+                desired[(column, row["label"])] = (row["values"][column] or "", sort_order)
+
+    now = timezone.now()
+    to_update = []
+    to_delete = []
+    for item in ProductSpecItem.objects.select_for_update().filter(product=product):
+        target = desired.pop((item.variant_name, item.label), None)
+        if target is None:
+            to_delete.append(item.pk)
+            continue
+        value, sort_order = target
+        if item.value != value or item.sort_order != sort_order:
+            item.value = value
+            item.sort_order = sort_order
+            item.updated_at = now
+            to_update.append(item)
+
+    to_create = [
+        ProductSpecItem(
+            product=product,
+            variant_name=variant_name,
+            label=label,
+            value=value,
+            sort_order=sort_order,
+        )
+        for (variant_name, label), (value, sort_order) in desired.items()
+    ]
+
+    if to_delete:
+        ProductSpecItem.objects.filter(pk__in=to_delete).delete()
+    if to_create:
+        ProductSpecItem.objects.bulk_create(to_create)
+    if to_update:
+        ProductSpecItem.objects.bulk_update(to_update, ["value", "sort_order", "updated_at"])
+
+    changes = SpecMatrixChanges(len(to_create), len(to_update), len(to_delete))
+    if changes.changed:
+        Product.objects.filter(pk=product.pk).update(updated_at=now)
+        # Bulk writes and update() send no model signals.
+        bump_namespace_on_commit(CACHE_NAMESPACE)
+        record_changes(ChangeLogEntry.Kind.PRODUCT, [product.pk])
+    return changes
@@ -0,0 +1,60 @@
+from datetime import timedelta
+
+from django.conf import settings
+
+from common.cache import bump_namespace
+from jobs.queue import enqueue
+from jobs.registry import task
+
+from .denormalize import linked_product_ids, refresh_category_arrays
+from .images import optimize_image
+from .models import Product, ProductGalleryImage, ProductUpload
+from .uploads import purge_expired_uploads
+
+
+@task(priority=-10, max_attempts=3)
+def optimize_product_images(product_id):
+    """Downscale and strip the hero and gallery images of a newly created product."""
+    max_dimension = settings.PRODUCT_IMAGE_MAX_DIMENSION
+    product = Product.objects.filter(pk=product_id).first()
+    if product is None:
+        return
+    # Saved through the models so the catalog cache and the media reference
+    # counts follow the new files.
+    if product.hero_image and optimize_image(product.hero_image, max_dimension):
+        product.save(update_fields=["hero_image", "updated_at"])
+    for gallery_image in ProductGalleryImage.objects.filter(product_id=product_id):
+        if optimize_image(gallery_image.image, max_dimension):
+            gallery_image.save(update_fields=["image", "updated_at"])
+
+
+@task(priority=10)
+def refresh_product_category_arrays(category_id=None, product_ids=()):
+    """
+    Rebuild ``category_ids``/``root_category_ids`` for the products of a moved
+    category, or for the given products after a category was deleted.
+    """
+    product_ids = set(product_ids)
+    if category_id is not None:
+        product_ids |= linked_product_ids(category_id=category_id)
+    if product_ids:
+        refresh_category_arrays(product_ids)
+        bump_namespace("catalog")
+
+
+@task()
+def purge_expired_product_uploads():
+    purge_expired_uploads()
+    # Come back when the oldest remaining unfinished upload expires.
+    oldest = (
+        ProductUpload.objects.filter(status=ProductUpload.Status.UPLOADING)
+        .order_by("updated_at")
+        .values_list("updated_at", flat=True)
+        .first()
+    )
+    if oldest is not None:
+        enqueue(
+            purge_expired_product_uploads,
+            run_at=oldest + timedelta(hours=settings.PRODUCT_UPLOAD_EXPIRY_HOURS),
+            dedupe_key="purge-expired-product-uploads",
+        )
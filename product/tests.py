@@ -1,3 +1,221 @@
-from django.test import TestCase
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+from io import BytesIO
 
-# Create your tests here.
+from django.core.files.base import ContentFile
+from django.core.exceptions import ValidationError
+from django.core.files.storage import default_storage
+from django.db import connection
+from django.db.models.fields.files import FieldFile
+from django.urls import URLPattern, reverse
+from django.utils import timezone
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from PIL import ExifTags, Image
+
+from common.richtext import backfill_rendered_rich_text
+
+from .images import optimize_image
+from .models import (
+    RESERVED_PRODUCT_SLUGS,
+    Category,
+    Product,
+    ProductUpload,
+    RootCategory,
+    validate_product_slug,
+)
+from .serializers import ProductCreateSerializer
+from .uploads import purge_expired_uploads, upload_path
+from .urls import urlpatterns
+
+
+def image_bytes(size, image_format="JPEG", orientation=None):
+    buffer = BytesIO()
+    exif = Image.Exif()
+    if orientation is not None:
+        exif[ExifTags.Base.Orientation] = orientation
+    Image.new("RGB", size, "red").save(buffer, format=image_format, exif=exif)
+    return buffer.getvalue()
+
+
+class OptimizeImageTests(SimpleTestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def field_file(self, content, filename="hero.jpg"):
+        name = default_storage.save(filename, ContentFile(content))
+        return FieldFile(Product(), Product._meta.get_field("hero_image"), name)
+
+    def test_large_image_is_downscaled(self):
+        field_file = self.field_file(image_bytes((3000, 1500)))
+
+        self.assertTrue(optimize_image(field_file, 1200))
+
+        with default_storage.open(field_file.name) as stored, Image.open(stored) as image:
+            self.assertEqual(image.size, (1200, 600))
+
+    def test_orientation_is_applied_and_metadata_stripped(self):
+        field_file = self.field_file(image_bytes((400, 200), orientation=6))
+
+        self.assertTrue(optimize_image(field_file, 1200))
+
+        with default_storage.open(field_file.name) as stored, Image.open(stored) as image:
+            self.assertEqual(image.size, (200, 400))
+            self.assertFalse(image.getexif())
+
+    def test_small_image_without_metadata_is_left_alone(self):
+        field_file = self.field_file(image_bytes((400, 200)))
+        name = field_file.name
+
+        self.assertFalse(optimize_image(field_file, 1200))
+        self.assertEqual(field_file.name, name)
+
+    def test_unsupported_formats_are_left_alone(self):
+        buffer = BytesIO()
+        Image.new("RGB", (3000, 3000)).save(buffer, format="GIF")
+        field_file = self.field_file(buffer.getvalue(), "hero.gif")
+
+        self.assertFalse(optimize_image(field_file, 1200))
+
+
+class ReservedSlugTests(SimpleTestCase):
+    def test_fixed_routes_before_the_detail_route_are_reserved(self):
+        routes = set()
+        for pattern in urlpatterns:
+            if isinstance(pattern, URLPattern) and pattern.name == "product-detail":
+                break
+            route = str(pattern.pattern).rstrip("/")
+            if route and "/" not in route and "<" not in route:
+                routes.add(route)
+
+        self.assertEqual(routes, RESERVED_PRODUCT_SLUGS)
+
+    def test_reserved_slugs_are_rejected(self):
+        slug_field = Product._meta.get_field("slug")
+
+        with self.assertRaises(ValidationError):
+            slug_field.run_validators("typeahead")
+        slug_field.run_validators("typeahead-2")
+        # Model serializers and admin forms pick up the field's validators.
+        self.assertIn(
+            validate_product_slug, ProductCreateSerializer().fields["slug"].validators
+        )
+
+
+class ProductUploadTests(TestCase):
+    def setUp(self):
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        settings_override = override_settings(PRODUCT_UPLOAD_TEMP_DIR=temp_dir)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        user = get_user_model().objects.create_user("uploader", password="secret")
+        self.client.force_login(user)
+        product = Product.objects.create(title="Lamp", slug="lamp")
+        self.upload = ProductUpload.objects.create(
+            user=user,
+            product=product,
+            target=ProductUpload.Target.GALLERY_IMAGE,
+            filename="lamp.jpg",
+            size=10,
+            sha256="0" * 64,
+        )
+        self.url = reverse("product:product-upload", args=[self.upload.pk])
+
+    def put_chunk(self, body, content_range):
+        return self.client.put(
+            self.url,
+            body,
+            content_type="application/octet-stream",
+            HTTP_CONTENT_RANGE=content_range,
+        )
+
+    def test_chunks_are_appended(self):
+        self.assertEqual(self.put_chunk(b"01234", "bytes 0-4/10").status_code, 200)
+        response = self.put_chunk(b"56789", "bytes 5-9/10")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["received"], 10)
+        with open(upload_path(self.upload), "rb") as stored:
+            self.assertEqual(stored.read(), b"0123456789")
+
+    def test_empty_body_is_rejected(self):
+        # Without a Content-Length DRF has no request.stream at all.
+        response = self.put_chunk(b"", "bytes 0-4/10")
+
+        self.assertEqual(response.status_code, 400)
+        self.upload.refresh_from_db()
+        self.assertEqual(self.upload.received, 0)
+
+    def test_purge_keeps_uploads_whose_file_is_missing(self):
+        self.put_chunk(b"01234", "bytes 0-4/10")
+        ProductUpload.objects.update(updated_at=timezone.now() - timedelta(days=2))
+        os.remove(upload_path(self.upload))
+
+        with self.assertLogs("product.uploads", "WARNING"):
+            self.assertEqual(purge_expired_uploads(), 0)
+        self.assertTrue(ProductUpload.objects.exists())
+
+    def test_purge_removes_expired_uploads_and_their_files(self):
+        self.put_chunk(b"01234", "bytes 0-4/10")
+        ProductUpload.objects.update(updated_at=timezone.now() - timedelta(days=2))
+
+        self.assertEqual(purge_expired_uploads(), 1)
+        self.assertFalse(ProductUpload.objects.exists())
+        self.assertFalse(os.path.exists(upload_path(self.upload)))
+
+
+class ProductCountTests(TestCase):
+    def test_counts_follow_links_and_never_go_below_zero(self):
+        root = RootCategory.objects.create(name="Lighting", slug="lighting")
+        category = Category.objects.create(name="Lamps", slug="lamps", root_category=root)
+        product = Product.objects.create(title="Lamp", slug="lamp")
+
+        product.categories.add(category)
+        category.refresh_from_db()
+        root.refresh_from_db()
+        self.assertEqual((category.product_count, root.product_count), (1, 1))
+
+        # Drifted low, e.g. by a raw write; removing the link must still save.
+        Category.objects.update(product_count=0)
+        RootCategory.objects.update(product_count=0)
+        product.categories.remove(category)
+        category.refresh_from_db()
+        root.refresh_from_db()
+        self.assertEqual((category.product_count, root.product_count), (0, 0))
+
+
+class RichTextTests(TestCase):
+    def setUp(self):
+        root = RootCategory.objects.create(name="Lighting", slug="lighting")
+        self.category = Category.objects.create(
+            name="Lamps", slug="lamps", root_category=root, description="<p>Warm  light</p>"
+        )
+
+    def test_backfill_renders_existing_rows(self):
+        Category.objects.update(description_html="", description_text="", description_word_count=0)
+
+        backfill_rendered_rich_text(Category, ["description"])
+
+        category = Category.objects.get()
+        self.assertEqual(category.description_html, "<p>Warm light</p>")
+        self.assertEqual(category.description_text, "Warm light")
+        self.assertEqual(category.description_word_count, 2)
+
+    def test_saving_other_fields_does_not_render_or_load_rich_text(self):
+        category = Category.objects.only("pk", "name").get()
+        category.name = "Lights"
+
+        with CaptureQueriesContext(connection) as queries:
+            category.save(update_fields=["name"])
+
+        self.assertFalse(any("description" in query["sql"] for query in queries))
+        self.assertEqual(Category.objects.get().description_text, "Warm light")
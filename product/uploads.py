@@ -0,0 +1,163 @@
+import hashlib
+import logging
+import os
+import re
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files import File
+from django.db import transaction
+from django.utils import timezone
+
+from .models import ProductGalleryImage, ProductUpload
+
+CONTENT_RANGE_RE = re.compile(r"^bytes (?P<start>\d+)-(?P<end>\d+)/(?P<total>\d+)$")
+READ_SIZE = 64 * 1024
+
+logger = logging.getLogger(__name__)
+
+
+class UploadError(Exception):
+    def __init__(self, message, status_code=400):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def upload_path(upload):
+    return os.path.join(settings.PRODUCT_UPLOAD_TEMP_DIR, f"{upload.pk}.part")
+
+
+def parse_content_range(header, size):
+    """Return ``(start, end)`` (end exclusive) from ``Content-Range: bytes a-b/total``."""
+    match = CONTENT_RANGE_RE.match(header or "")
+    if match is None:
+        raise UploadError("Content-Range must look like 'bytes <start>-<end>/<total>'.")
+    start, end, total = int(match["start"]), int(match["end"]) + 1, int(match["total"])
+    if total != size or not start < end <= size:
+        raise UploadError(f"Content-Range does not fit the declared size of {size} bytes.")
+    if end - start > settings.PRODUCT_UPLOAD_MAX_CHUNK_SIZE:
+        raise UploadError(
+            f"Chunks may be at most {settings.PRODUCT_UPLOAD_MAX_CHUNK_SIZE} bytes.", 413
+        )
+    return start, end
+
+
+def write_chunk(upload, stream, start, end):
+    """
+    Copy ``end - start`` bytes from ``stream`` to the upload's file at
+    ``start`` without holding the chunk in memory, then advance
+    ``received``. Chunks must arrive in order; a client that lost track
+    resumes from the ``received`` offset reported by the status endpoint.
+    """
+    if upload.status != ProductUpload.Status.UPLOADING:
+        raise UploadError("This upload is already complete.", 409)
+    if start != upload.received:
+        raise UploadError(f"Expected a chunk starting at byte {upload.received}.", 409)
+
+    path = upload_path(upload)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    expected = end - start
+    written = 0
+    with open(path, "r+b" if os.path.exists(path) else "wb") as target:
+        target.seek(start)
+        # Drop whatever a broken earlier attempt left past the offset.
+        target.truncate()
+        while written < expected:
+            data = stream.read(min(READ_SIZE, expected - written))
+            if not data:
+                break
+            target.write(data)
+            written += len(data)
+        if written == expected and stream.read(1):
+            written += 1
+    if written != expected:
+        raise UploadError(f"Content-Range announced {expected} bytes, received {written}.")
+
+    # Compare-and-set so concurrent requests for the same range cannot both advance.
+    advanced = ProductUpload.objects.filter(pk=upload.pk, received=start).update(
+        received=end, updated_at=timezone.now()
+    )
+    if not advanced:
+        raise UploadError("Another request wrote this chunk.", 409)
+    upload.received = end
+
+
+def file_sha256(path):
+    with open(path, "rb") as source:
+        return hashlib.file_digest(source, "sha256").hexdigest()
+
+
+def verify_image(path):
+    from PIL import Image, UnidentifiedImageError
+
+    try:
+        with Image.open(path) as image:
+            image.verify()
+    except (UnidentifiedImageError, OSError, SyntaxError):
+        raise UploadError("The uploaded file is not a valid image.")
+
+
+def complete_upload(upload):
+    """Verify the checksum and attach the file to the product; returns the upload."""
+    if upload.status == ProductUpload.Status.COMPLETE:
+        return upload
+    if upload.received != upload.size:
+        raise UploadError(f"Only {upload.received} of {upload.size} bytes were received.", 409)
+    path = upload_path(upload)
+    if file_sha256(path) != upload.sha256:
+        ProductUpload.objects.filter(pk=upload.pk, received=upload.size).update(
+            received=0, updated_at=timezone.now()
+        )
+        raise UploadError("Checksum mismatch: send the file again from byte 0.", 422)
+    if upload.target == ProductUpload.Target.GALLERY_IMAGE:
+        verify_image(path)
+
+    with transaction.atomic():
+        upload = ProductUpload.objects.select_for_update().select_related("product").get(
+            pk=upload.pk
+        )
+        if upload.status == ProductUpload.Status.COMPLETE:
+            return upload
+        with open(path, "rb") as source:
+            content = File(source, name=upload.filename)
+            if upload.target == ProductUpload.Target.HERO_VIDEO:
+                upload.product.hero_video.save(upload.filename, content, save=False)
+                upload.product.save(update_fields=["hero_video", "updated_at"])
+            else:
+                gallery_image = ProductGalleryImage(
+                    product=upload.product,
+                    alt_text=upload.alt_text,
+                    sort_order=upload.sort_order,
+                )
+                gallery_image.image.save(upload.filename, content, save=False)
+                gallery_image.save()
+                upload.gallery_image = gallery_image
+        upload.status = ProductUpload.Status.COMPLETE
+        upload.save(update_fields=["status", "gallery_image", "updated_at"])
+    os.remove(path)
+    return upload
+
+
+def purge_expired_uploads():
+    """
+    Delete unfinished uploads untouched for PRODUCT_UPLOAD_EXPIRY_HOURS and
+    their files. An upload that received bytes but whose file is missing
+    here is kept (and logged) so a run that can see PRODUCT_UPLOAD_TEMP_DIR
+    removes it later.
+    """
+    cutoff = timezone.now() - timedelta(hours=settings.PRODUCT_UPLOAD_EXPIRY_HOURS)
+    expired = ProductUpload.objects.filter(
+        status=ProductUpload.Status.UPLOADING, updated_at__lt=cutoff
+    )
+    count = 0
+    for upload in expired.only("pk", "received"):
+        path = upload_path(upload)
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            if upload.received:
+                logger.warning("Expired upload %s has no file at %s; keeping it.", upload.pk, path)
+                continue
+        upload.delete()
+        count += 1
+    return count
@@ -2,10 +2,17 @@ from django.urls import path
 
 from .views import (
     CategoryDetailAPIView,
+    CategoryLandingAPIView,
     CategoryListAPIView,
+    ProductBatchDetailAPIView,
     ProductCreateAPIView,
     ProductDetailAPIView,
     ProductListAPIView,
+    ProductSpecMatrixAPIView,
+    ProductTypeaheadAPIView,
+    ProductUploadAPIView,
+    ProductUploadCompleteAPIView,
+    ProductUploadCreateAPIView,
     RootCategoryListAPIView,
 )
 
@@ -15,7 +22,26 @@ urlpatterns = [
     path("root-categories/", RootCategoryListAPIView.as_view(), name="root-category-list"),
     path("categories/", CategoryListAPIView.as_view(), name="category-list"),
     path("categories/<slug:slug>/", CategoryDetailAPIView.as_view(), name="category-detail"),
+    path(
+        "categories/<slug:slug>/landing/",
+        CategoryLandingAPIView.as_view(),
+        name="category-landing",
+    ),
     path("create/", ProductCreateAPIView.as_view(), name="product-create"),
+    path("typeahead/", ProductTypeaheadAPIView.as_view(), name="product-typeahead"),
+    path("batch/", ProductBatchDetailAPIView.as_view(), name="product-batch-detail"),
+    path("uploads/<uuid:pk>/", ProductUploadAPIView.as_view(), name="product-upload"),
+    path(
+        "uploads/<uuid:pk>/complete/",
+        ProductUploadCompleteAPIView.as_view(),
+        name="product-upload-complete",
+    ),
     path("", ProductListAPIView.as_view(), name="product-list"),
     path("<slug:slug>/", ProductDetailAPIView.as_view(), name="product-detail"),
+    path("<slug:slug>/specs/", ProductSpecMatrixAPIView.as_view(), name="product-spec-matrix"),
+    path(
+        "<slug:slug>/uploads/",
+        ProductUploadCreateAPIView.as_view(),
+        name="product-upload-create",
+    ),
 ]
@@ -1,20 +1,41 @@
+from datetime import timedelta
+from urllib.parse import quote
+
+from django.conf import settings
+from django.db.models import Prefetch
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters, generics, permissions, status
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import CursorPagination, PageNumberPagination
 from rest_framework.authentication import SessionAuthentication
-from rest_framework.parsers import FormParser, JSONParser, MultiPartParser
+from rest_framework.parsers import FormParser, MultiPartParser
 from rest_framework.response import Response
 
+from common.cache import CachedAPIViewMixin, get_or_compute, namespace_version
+from common.parsers import MessagePackParser, ORJSONParser
+from jobs.queue import enqueue_on_commit
 from .filters import ProductFilter
-from .models import Category, Product, RootCategory
+from .models import Category, Product, ProductUpload, RootCategory
 from .serializers import (
     CategoryDetailSerializer,
+    CategoryLandingSerializer,
     CategoryListSerializer,
     ProductCreateSerializer,
     ProductDetailSerializer,
+    ProductListNormalizedSerializer,
     ProductListSerializer,
+    ProductSpecMatrixSerializer,
+    ProductUploadSerializer,
     RootCategoryListSerializer,
+    TypeaheadSuggestionSerializer,
+    build_included,
 )
+from .search import normalize_typeahead_query, typeahead_suggestions
+from .signals import CACHE_NAMESPACE
+from .tasks import purge_expired_product_uploads
+from .uploads import UploadError, complete_upload, parse_content_range, write_chunk
 
 
 class ProductListPagination(PageNumberPagination):
@@ -29,42 +50,188 @@ class CategoryListPagination(PageNumberPagination):
     max_page_size = 60
 
 
-class ProductListAPIView(generics.ListAPIView):
+class CategoryLandingPagination(CursorPagination):
+    page_size = 12
+    page_size_query_param = "page_size"
+    max_page_size = 60
+    ordering = ("-created_at", "-id")
+
+
+class ProductFieldsetMixin:
+    """
+    ``?fields=a,b`` support for product views: trims the serializer and loads
+    only the columns and relations the requested fields read.
+    """
+
+    fields_param = "fields"
+    # Serializer fields that read other columns than their own name.
+    field_columns = {
+        "description": ("description_html",),
+        "categories": (),
+        "gallery_images": (),
+        "faq_items": (),
+        "spec_table": (),
+    }
+    field_prefetches = {
+        "categories": Prefetch(
+            "categories",
+            queryset=Category.objects.select_related("root_category"),
+        ),
+        "gallery_images": "gallery_images",
+        "faq_items": "faq_items",
+        "spec_table": "spec_items",
+    }
+
+    def get_requested_fields(self):
+        if not hasattr(self, "_requested_fields"):
+            self._requested_fields = self._parse_requested_fields()
+        return self._requested_fields
+
+    def _parse_requested_fields(self):
+        raw = self.request.query_params.get(self.fields_param)
+        if not raw:
+            return None
+        requested = [name.strip() for name in raw.split(",") if name.strip()]
+        unknown = set(requested) - set(self.get_serializer_class().Meta.fields)
+        if unknown:
+            message = f"Unknown fields: {', '.join(sorted(unknown))}."
+            raise ValidationError({self.fields_param: [message]})
+        return requested
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context["fields"] = self.get_requested_fields()
+        return context
+
+    def apply_fieldset(self, queryset, extra_columns=()):
+        fields = self.get_requested_fields() or self.get_serializer_class().Meta.fields
+        columns = set(extra_columns)
+        for name in fields:
+            columns.update(self.field_columns.get(name, (name,)))
+        prefetches = [
+            self.field_prefetches[name] for name in fields if name in self.field_prefetches
+        ]
+        return queryset.only(*columns).prefetch_related(*prefetches)
+
+
+class ProductListAPIView(
+    CachedAPIViewMixin, ProductFieldsetMixin, generics.ListAPIView
+):
     permission_classes = [permissions.AllowAny]
+    cache_namespace = "catalog"
     serializer_class = ProductListSerializer
     pagination_class = ProductListPagination
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_class = ProductFilter
-    search_fields = ("title", "short_description", "description")
+    search_fields = ("title", "short_description", "description_text")
     ordering_fields = ("created_at", "title")
     ordering = ("-created_at",)
 
     def get_queryset(self):
-        return (
-            Product.objects.all()
-            .order_by("-created_at")
-            .distinct()
-        )
+        return self.apply_fieldset(Product.objects.order_by("-created_at"))
 
+    def is_normalized(self):
+        return self.request.query_params.get("normalized", "").lower() in ("1", "true")
 
-class ProductDetailAPIView(generics.RetrieveAPIView):
+    def get_serializer_class(self):
+        if self.is_normalized():
+            return ProductListNormalizedSerializer
+        return super().get_serializer_class()
+
+    def list(self, request, *args, **kwargs):
+        if not self.is_normalized():
+            return super().list(request, *args, **kwargs)
+
+        page = self.paginate_queryset(self.filter_queryset(self.get_queryset()))
+        serializer = self.get_serializer(page, many=True)
+        response = self.get_paginated_response(serializer.data)
+        fields = self.get_requested_fields()
+        if fields is None or "categories" in fields:
+            response.data["included"] = build_included(page, self.get_serializer_context())
+        return response
+
+
+class ProductDetailAPIView(
+    CachedAPIViewMixin, ProductFieldsetMixin, generics.RetrieveAPIView
+):
     queryset = Product.objects.all()
     permission_classes = [permissions.AllowAny]
+    cache_namespace = "catalog"
     serializer_class = ProductDetailSerializer
     lookup_field = "slug"
 
     def get_queryset(self):
-        return (
-            Product.objects.all()
-            .distinct()
-        )
+        return self.apply_fieldset(Product.objects.all())
+
+
+class ProductBatchDetailAPIView(ProductFieldsetMixin, generics.GenericAPIView):
+    permission_classes = [permissions.AllowAny]
+    serializer_class = ProductDetailSerializer
+    max_batch_size = 50
+
+    def get_queryset(self):
+        return self.apply_fieldset(Product.objects.all(), extra_columns=("slug",))
+
+    def get(self, request, *args, **kwargs):
+        raw = request.query_params.get("slugs", "")
+        slugs = list(dict.fromkeys(slug.strip() for slug in raw.split(",") if slug.strip()))
+        if not slugs:
+            raise ValidationError({"slugs": ["Provide a comma-separated list of slugs."]})
+        if len(slugs) > self.max_batch_size:
+            raise ValidationError(
+                {"slugs": [f"At most {self.max_batch_size} slugs per request."]}
+            )
+
+        products = {
+            product.slug: product
+            for product in self.get_queryset().filter(slug__in=slugs)
+        }
+        found = [products[slug] for slug in slugs if slug in products]
+        serializer = self.get_serializer(found, many=True)
+        payloads = {product.slug: data for product, data in zip(found, serializer.data)}
+        results = [
+            {"slug": slug, "found": slug in payloads, "product": payloads.get(slug)}
+            for slug in slugs
+        ]
+        return Response({"results": results})
+
+
+class ProductTypeaheadAPIView(generics.GenericAPIView):
+    """
+    Search-box suggestions for ``?q=``: at most ten products and categories.
+    Results for prefixes up to TYPEAHEAD_CACHE_PREFIX_LENGTH characters are
+    cached per prefix.
+    """
+
+    authentication_classes = []
+    permission_classes = [permissions.AllowAny]
+    serializer_class = TypeaheadSuggestionSerializer
+
+    def get(self, request, *args, **kwargs):
+        query = normalize_typeahead_query(request.query_params.get("q"))
+        if not query:
+            return Response({"query": query, "results": []})
+
+        def compute():
+            return self.get_serializer(typeahead_suggestions(query), many=True).data
+
+        if len(query) <= settings.TYPEAHEAD_CACHE_PREFIX_LENGTH:
+            results = get_or_compute(
+                f"typeahead:{quote(query.lower())}",
+                compute,
+                settings.TYPEAHEAD_CACHE_TIMEOUT,
+                version=namespace_version(CACHE_NAMESPACE),
+            )
+        else:
+            results = compute()
+        return Response({"query": query, "results": results})
 
 
 class ProductCreateAPIView(generics.CreateAPIView):
     authentication_classes = [SessionAuthentication]
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = ProductCreateSerializer
-    parser_classes = [JSONParser, FormParser, MultiPartParser]
+    parser_classes = [ORJSONParser, MessagePackParser, FormParser, MultiPartParser]
 
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
@@ -74,8 +241,78 @@ class ProductCreateAPIView(generics.CreateAPIView):
         return Response(output.data, status=status.HTTP_201_CREATED)
 
 
-class CategoryListAPIView(generics.ListAPIView):
+class ProductSpecMatrixAPIView(generics.RetrieveUpdateAPIView):
+    authentication_classes = [SessionAuthentication]
+    permission_classes = [permissions.IsAuthenticated]
+    serializer_class = ProductSpecMatrixSerializer
+    lookup_field = "slug"
+    http_method_names = ["get", "put", "head", "options"]
+
+    def get_queryset(self):
+        return Product.objects.only("id", "slug")
+
+
+class ProductUploadCreateAPIView(generics.CreateAPIView):
+    """Start a resumable upload of a hero video or gallery image for a product."""
+
+    authentication_classes = [SessionAuthentication]
+    permission_classes = [permissions.IsAuthenticated]
+    serializer_class = ProductUploadSerializer
+
+    def perform_create(self, serializer):
+        product = get_object_or_404(Product.objects.only("id"), slug=self.kwargs["slug"])
+        serializer.save(user=self.request.user, product=product)
+        enqueue_on_commit(
+            purge_expired_product_uploads,
+            run_at=timezone.now() + timedelta(hours=settings.PRODUCT_UPLOAD_EXPIRY_HOURS),
+            dedupe_key="purge-expired-product-uploads",
+        )
+
+
+class ProductUploadMixin:
+    authentication_classes = [SessionAuthentication]
+    permission_classes = [permissions.IsAuthenticated]
+    serializer_class = ProductUploadSerializer
+
+    def get_queryset(self):
+        return ProductUpload.objects.filter(user=self.request.user).select_related("product")
+
+    def handle_exception(self, exc):
+        if isinstance(exc, UploadError):
+            return Response({"detail": str(exc)}, status=exc.status_code)
+        return super().handle_exception(exc)
+
+
+class ProductUploadAPIView(ProductUploadMixin, generics.RetrieveAPIView):
+    """
+    GET reports the upload and its ``received`` offset to resume from. PUT
+    appends one chunk: the raw bytes as the body with ``Content-Range: bytes
+    <start>-<end>/<size>``, streamed to disk as they arrive.
+    """
+
+    # The body is read as a stream, never parsed.
+    parser_classes = []
+
+    def put(self, request, *args, **kwargs):
+        upload = self.get_object()
+        start, end = parse_content_range(request.headers.get("Content-Range"), upload.size)
+        # The Django request, not DRF's request.stream, which is None without a
+        # Content-Length (an empty or chunked body).
+        write_chunk(upload, request._request, start, end)
+        return Response(self.get_serializer(upload).data)
+
+
+class ProductUploadCompleteAPIView(ProductUploadMixin, generics.GenericAPIView):
+    """Verify the SHA-256 of a fully received upload and attach it to the product."""
+
+    def post(self, request, *args, **kwargs):
+        upload = complete_upload(self.get_object())
+        return Response(self.get_serializer(upload).data)
+
+
+class CategoryListAPIView(CachedAPIViewMixin, generics.ListAPIView):
     permission_classes = [permissions.AllowAny]
+    cache_namespace = "catalog"
     serializer_class = CategoryListSerializer
     pagination_class = CategoryListPagination
 
@@ -83,8 +320,9 @@ class CategoryListAPIView(generics.ListAPIView):
         return Category.objects.select_related("root_category").order_by("name")
 
 
-class CategoryDetailAPIView(generics.RetrieveAPIView):
+class CategoryDetailAPIView(CachedAPIViewMixin, generics.RetrieveAPIView):
     permission_classes = [permissions.AllowAny]
+    cache_namespace = "catalog"
     serializer_class = CategoryDetailSerializer
     lookup_field = "slug"
 
@@ -92,8 +330,48 @@ class CategoryDetailAPIView(generics.RetrieveAPIView):
         return Category.objects.select_related("root_category")
 
 
-class RootCategoryListAPIView(generics.ListAPIView):
+class CategoryLandingAPIView(CachedAPIViewMixin, generics.RetrieveAPIView):
+    """
+    A category with the first page of its products and a cursor for the next,
+    in three queries: the category, the product page and its categories.
+    """
+
+    permission_classes = [permissions.AllowAny]
+    cache_namespace = "catalog"
+    serializer_class = CategoryLandingSerializer
+    pagination_class = CategoryLandingPagination
+    lookup_field = "slug"
+
+    def get_queryset(self):
+        return Category.objects.select_related("root_category")
+
+    def get_product_queryset(self, category):
+        # A single category: the through-table join yields each product once.
+        return (
+            Product.objects.filter(categories=category)
+            .only("id", "title", "slug", "short_description", "hero_image", "created_at")
+            .prefetch_related(ProductFieldsetMixin.field_prefetches["categories"])
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        category = self.get_object()
+        page = self.paginate_queryset(self.get_product_queryset(category))
+        products = ProductListSerializer(page, many=True, context=self.get_serializer_context())
+        return Response(
+            {
+                "category": self.get_serializer(category).data,
+                "products": {
+                    "next": self.paginator.get_next_link(),
+                    "previous": self.paginator.get_previous_link(),
+                    "results": products.data,
+                },
+            }
+        )
+
+
+class RootCategoryListAPIView(CachedAPIViewMixin, generics.ListAPIView):
     permission_classes = [permissions.AllowAny]
+    cache_namespace = "catalog"
     serializer_class = RootCategoryListSerializer
 
     def get_queryset(self):
@@ -1,9 +1,10 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
 
+from utils.admin_autocomplete import PrefixAutocompleteMixin
 from .models import CustomUser
 
 
 @admin.register(CustomUser)
-class CustomUserAdmin(UserAdmin):
-    pass
+class CustomUserAdmin(PrefixAutocompleteMixin, UserAdmin):
+    autocomplete_search_fields = ("^username", "^email")
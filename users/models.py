@@ -1,9 +1,23 @@
 from django.contrib.auth.models import AbstractUser
+from django.contrib.postgres.indexes import OpClass
 from django.db import models
+from django.db.models.functions import Upper
 
 
 class CustomUser(AbstractUser):
     email = models.EmailField("email address", unique=True)
 
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            models.Index(
+                OpClass(Upper("username"), name="text_pattern_ops"),
+                name="users_username_prefix",
+            ),
+            models.Index(
+                OpClass(Upper("email"), name="text_pattern_ops"),
+                name="users_email_prefix",
+            ),
+        ]
+
     def __str__(self) -> str:
         return self.username
@@ -0,0 +1,18 @@
+def is_autocomplete_request(request):
+    match = getattr(request, "resolver_match", None)
+    return match is not None and match.url_name == "autocomplete"
+
+
+class PrefixAutocompleteMixin:
+    """
+    Use ``autocomplete_search_fields`` (``^``-prefixed, so they hit the
+    ``UPPER(...) text_pattern_ops`` indexes) for admin autocomplete lookups,
+    while the changelist keeps the regular ``search_fields``.
+    """
+
+    autocomplete_search_fields = ()
+
+    def get_search_fields(self, request):
+        if self.autocomplete_search_fields and is_autocomplete_request(request):
+            return self.autocomplete_search_fields
+        return super().get_search_fields(request)
@@ -0,0 +1,201 @@
+import re
+
+from django.contrib import admin
+from django.contrib.admin.options import IncorrectLookupParameters
+from django.contrib.admin.views.main import ChangeList
+from django.contrib.postgres.search import SearchQuery
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Exists, OuterRef, Q
+from django.utils.functional import cached_property
+
+CURSOR_VAR = "after"
+
+
+def estimate_row_count(model, using="default"):
+    """Return the planner's row estimate for ``model``'s table, or None."""
+    connection = connections[using]
+    if connection.vendor != "postgresql":
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+            [connection.ops.quote_name(model._meta.db_table)],
+        )
+        row = cursor.fetchone()
+    if not row or row[0] < 0:
+        return None
+    return row[0]
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator that never runs an unbounded COUNT(*).
+
+    Unfiltered querysets use the ``pg_class`` estimate; filtered ones are
+    counted up to ``exact_count_limit`` rows.
+    """
+
+    exact_count_limit = 10_000
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.count_is_exact = True
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not queryset.query.where:
+            estimate = estimate_row_count(queryset.model, queryset.db)
+            if estimate is not None and estimate > self.exact_count_limit:
+                self.count_is_exact = False
+                return estimate
+        limit = self.exact_count_limit
+        count = queryset.order_by().values("pk")[: limit + 1].count()
+        if count > limit:
+            self.count_is_exact = False
+            return limit
+        return count
+
+
+class KeysetChangeList(ChangeList):
+    """
+    Change list that pages forward with ``?after=<cursor>`` instead of OFFSET
+    while the admin's ``keyset_ordering`` is active.
+    """
+
+    def __init__(self, request, *args, **kwargs):
+        self.cursor = request.GET.get(CURSOR_VAR) or None
+        self.keyset_active = False
+        self.next_url = None
+        self.first_url = None
+        super().__init__(request, *args, **kwargs)
+        self.params.pop(CURSOR_VAR, None)
+        self.filter_params.pop(CURSOR_VAR, None)
+
+    def get_filters_params(self, params=None):
+        lookup_params = super().get_filters_params(params)
+        lookup_params.pop(CURSOR_VAR, None)
+        return lookup_params
+
+    def get_ordering(self, request, queryset):
+        ordering = super().get_ordering(request, queryset)
+        self.keyset_active = tuple(ordering) == tuple(self.model_admin.keyset_ordering)
+        return ordering
+
+    def get_results(self, request):
+        if not self.keyset_active or self.show_all:
+            return super().get_results(request)
+
+        if self.cursor:
+            self.queryset = self.queryset.filter(self._cursor_q(self.cursor))
+        self.page_num = 1
+        super().get_results(request)
+
+        self.result_list = list(self.result_list)
+        if self.multi_page and len(self.result_list) == self.list_per_page:
+            cursor = self._encode_cursor(self.result_list[-1])
+            self.next_url = self.get_query_string({CURSOR_VAR: cursor})
+        self.first_url = self.get_query_string(remove=[CURSOR_VAR])
+
+    def _keyset_fields(self):
+        for part in self.model_admin.keyset_ordering:
+            name = part.lstrip("-")
+            field = self.lookup_opts.pk if name == "pk" else self.lookup_opts.get_field(name)
+            yield name, field, part.startswith("-")
+
+    def _encode_cursor(self, obj):
+        return ",".join(field.value_to_string(obj) for _, field, _ in self._keyset_fields())
+
+    def _cursor_q(self, cursor):
+        fields = list(self._keyset_fields())
+        raw_values = cursor.rsplit(",", len(fields) - 1)
+        if len(raw_values) != len(fields):
+            raise IncorrectLookupParameters("Invalid cursor.")
+        try:
+            values = [field.to_python(raw) for (_, field, _), raw in zip(fields, raw_values)]
+        except ValidationError as exc:
+            raise IncorrectLookupParameters(exc)
+
+        condition = Q()
+        equal = {}
+        for (name, _, descending), value in zip(fields, values):
+            lookup = "lt" if descending else "gt"
+            condition |= Q(**equal, **{f"{name}__{lookup}": value})
+            equal[name] = value
+        return condition
+
+
+class CategoryExistsFilter(admin.SimpleListFilter):
+    """
+    Category filter that uses EXISTS on the M2M through table, so filtering
+    never joins (and duplicates) the changelist rows.
+
+    Only the first ``lookup_limit`` categories by ``lookup_ordering`` are
+    listed (plus the selected one); any other id still works in the URL.
+    """
+
+    title = "category"
+    parameter_name = "category"
+    relation_name = "categories"
+    lookup_ordering = ("name",)
+    lookup_limit = 50
+
+    def lookups(self, request, model_admin):
+        related_model = model_admin.model._meta.get_field(self.relation_name).related_model
+        categories = related_model.objects.order_by(*self.lookup_ordering)
+        choices = list(categories.values_list("pk", "name")[: self.lookup_limit])
+        value = self.value()
+        if value and value.isdigit() and int(value) not in {pk for pk, _ in choices}:
+            choices += related_model.objects.filter(pk=value).values_list("pk", "name")
+        return choices
+
+    def queryset(self, request, queryset):
+        value = self.value()
+        if not value:
+            return queryset
+        if not value.isdigit():
+            raise IncorrectLookupParameters("Invalid category.")
+        field = queryset.model._meta.get_field(self.relation_name)
+        through = field.remote_field.through
+        source = field.m2m_field_name()
+        target = field.m2m_reverse_field_name()
+        return queryset.filter(
+            Exists(
+                through.objects.filter(**{f"{source}_id": OuterRef("pk"), f"{target}_id": value})
+            )
+        )
+
+
+class LargeTableAdminMixin:
+    """
+    ModelAdmin settings for tables too large for the stock changelist:
+    estimated counts, keyset navigation and indexed full-text search.
+
+    ``search_vector`` must match an expression index on the model, and the
+    model needs an ``admin/<app>/<model>/pagination.html`` template that
+    renders ``cl.next_url``.
+    """
+
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    keyset_ordering = ("-created_at", "-pk")
+    search_vector = None
+    search_config = "simple"
+
+    def get_changelist(self, request, **kwargs):
+        return KeysetChangeList
+
+    def get_search_results(self, request, queryset, search_term):
+        if self.search_vector is None:
+            return super().get_search_results(request, queryset, search_term)
+        terms = re.findall(r"\w+", search_term)
+        if not terms:
+            return queryset, False
+        query = SearchQuery(
+            " & ".join(f"{term}:*" for term in terms),
+            config=self.search_config,
+            search_type="raw",
+        )
+        return queryset.alias(search=self.search_vector).filter(search=query), False